@@ -0,0 +1,98 @@
+"""Benchmark of bulk shipment ingestion against per-row creation.
+
+Synthetic rows with coordinates (so no geocoder is called) are loaded into
+the configured database twice: one at a time through
+`add_package_with_shipment`, as `POST /packages/add` does, and in one batch
+through `add_packages_with_shipments`, as `POST /packages/bulk` does. The
+benchmark sender, its shipments, packages and queued emails are removed at
+the end.
+
+Usage (from the shipment-api directory, with the DB_* variables set):
+    python -m benchmarks.bulk_ingestion --rows 10000 --single 500
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from src.container import Container
+from src.core.domain.shipment import PackageIn, ShipmentIn
+from src.db import database, email_outbox_table, init_db, shipment_table, user_table
+
+RECIPIENT = "bulk-benchmark@example.com"
+
+
+def make_row(index: int) -> dict:
+    """Build one bulk ingestion row with coordinates."""
+    coords = (52.0 + (index % 1000) / 1000, 21.0 + (index % 997) / 1000)
+    return {
+        "shipment": {
+            "recipient_email": RECIPIENT,
+            "origin": {"city": "Warszawa", "street_number": str(index)},
+            "destination": {"city": "Kraków", "street_number": str(index)},
+            "origin_coords": coords,
+            "destination_coords": coords,
+        },
+        "package": {
+            "weight": 1.0,
+            "length": 10,
+            "width": 10,
+            "height": 10,
+            "fragile": False,
+        },
+    }
+
+
+async def run(rows: int, single: int) -> None:
+    await init_db()
+    await database.connect()
+    service = Container().package_service()
+    sender_id = await database.execute(
+        user_table.insert()
+        .values(email=f"{uuid4()}@example.com", password="x", role="client")
+        .returning(user_table.c.id)
+    )
+    try:
+        started = time.perf_counter()
+        for index in range(single):
+            item = make_row(index)
+            await service.add_package_with_shipment(
+                PackageIn(**item["package"]), ShipmentIn(**item["shipment"]), sender_id
+            )
+        elapsed = time.perf_counter() - started
+        print(f"   per row: {single / elapsed:10.1f} shipments/s ({single} rows)")
+
+        payload = [make_row(index) for index in range(rows)]
+        started = time.perf_counter()
+        results = await service.add_packages_with_shipments(payload, sender_id)
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for result in results if result.error)
+        print(
+            f"      bulk: {rows / elapsed:10.1f} shipments/s "
+            f"({rows} rows, {failed} failed)"
+        )
+    finally:
+        await database.execute(
+            delete(shipment_table).where(shipment_table.c.sender_id == sender_id)
+        )
+        await database.execute(
+            delete(email_outbox_table).where(email_outbox_table.c.to_email == RECIPIENT)
+        )
+        await database.execute(delete(user_table).where(user_table.c.id == sender_id))
+        await database.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.single))
+
+
+if __name__ == "__main__":
+    main()
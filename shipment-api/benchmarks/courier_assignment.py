@@ -0,0 +1,85 @@
+"""Benchmark of the courier assignment engine.
+
+Random pickups and courier depots across Poland, with room for every
+shipment, are assigned greedily only and with local search improvement.
+The benchmark reports the total depot-to-pickup distance, the number of
+improving moves and the assignment time for each size, and the number of
+statements and bind parameters used to write the assignments.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.courier_assignment --shipments 10000 --couriers 500
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import numpy
+from sqlalchemy.dialects import postgresql
+
+import src.infrastructure.repositories.shipmentdb as shipmentdb
+from src.infrastructure.routing.assignment import UNASSIGNED, assign
+
+POLAND = ([49.0, 14.1], [54.8, 24.1])
+
+
+class StatementCounter:
+    """A database stand-in counting the statements it is given."""
+
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def fetch_all(self, query) -> list:
+        self.statements.append(query.compile(dialect=postgresql.asyncpg.dialect()))
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shipments", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--couriers", type=int, default=500)
+    parser.add_argument("--budget", type=float, default=10.0, help="search seconds")
+    args = parser.parse_args()
+
+    rng = numpy.random.default_rng(0)
+    depots = rng.uniform(*POLAND, size=(args.couriers, 2))
+    for count in args.shipments:
+        shipments = rng.uniform(*POLAND, size=(count, 2))
+        capacities = numpy.full(args.couriers, -(-count // args.couriers) + 1)
+        started = time.perf_counter()
+        greedy = assign(shipments, depots, capacities, time_budget=0.0)
+        greedy_time = time.perf_counter() - started
+        started = time.perf_counter()
+        result = assign(shipments, depots, capacities, time_budget=args.budget)
+        elapsed = time.perf_counter() - started
+        saved = 1 - result.total_distance / greedy.total_distance
+        print(
+            f"{count:>6} x {args.couriers} couriers: greedy "
+            f"{greedy.total_distance:10.1f} km {greedy_time * 1000:7.1f} ms | "
+            f"local search {result.total_distance:10.1f} km "
+            f"{elapsed * 1000:7.1f} ms, {result.moves} moves ({saved:5.1%} "
+            f"shorter, {'converged' if result.converged else 'budget spent'})"
+        )
+
+        courier_ids = [uuid4() for _ in range(args.couriers)]
+        counter = StatementCounter()
+        shipmentdb.database = counter
+        asyncio.run(
+            shipmentdb.ShipmentRepository().assign_shipments(
+                [
+                    (shipment_id, courier_ids[courier])
+                    for shipment_id, courier in enumerate(result.couriers)
+                    if courier != UNASSIGNED
+                ]
+            )
+        )
+        print(
+            f"{'':>6}   written by {len(counter.statements)} statement(s) with "
+            f"{sum(len(statement.params) for statement in counter.statements)} "
+            "bind parameters"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Micro-benchmark of building shipment and package DTOs from records.
+
+Compares full pydantic validation of every record (the previous
+`from_record`) with the trusted construction path used for rows read by
+the repositories, over synthetic records shaped like query results.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.dto_construction --records 100000
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.core.domain.shipment import ShipmentStatus
+from src.infrastructure.dto.shipmentDTO import PackageDTO, ShipmentDTO
+
+
+def make_records(count: int) -> tuple[list[dict], list[dict]]:
+    """Generate shipment and package records."""
+    now = datetime.now(timezone.utc)
+    statuses = list(ShipmentStatus)
+    shipments = [
+        {
+            "id": index,
+            "sender_id": uuid4(),
+            "recipient_id": None,
+            "courier_id": uuid4(),
+            "sender_fullname": "Jan Kowalski",
+            "recipient_fullname": "Anna Nowak",
+            "recipient_email": "client@example.com",
+            "status": statuses[index % len(statuses)],
+            "origin": "Warszawa, Marszałkowska 1",
+            "destination": "Kraków, Floriańska 2",
+            "origin_latitude": 52.2297,
+            "origin_longitude": 21.0122,
+            "destination_latitude": 50.0647,
+            "destination_longitude": 19.945,
+            "created_at": now,
+            "last_updated": now,
+        }
+        for index in range(count)
+    ]
+    packages = [
+        {
+            "id": index,
+            "weight": 1.5,
+            "length": 10.0,
+            "width": 20.0,
+            "height": 30.0,
+            "fragile": False,
+            "created_at": now,
+            "last_updated": now,
+            "pickup_scheduled_date": None,
+            "pickup_actual_date": None,
+            "delivery_scheduled_date": now,
+            "delivery_actual_date": None,
+            "cancelled_at": None,
+            "note": None,
+        }
+        for index in range(count)
+    ]
+    return shipments, packages
+
+
+def validated_shipment(record) -> ShipmentDTO:
+    """The previous from_record: copy, pop and validate every field."""
+    record_dict = dict(record)
+    return ShipmentDTO(
+        id=record_dict.pop("id"),
+        courier_id=record_dict.pop("courier_id", None),
+        recipient_id=record_dict.pop("recipient_id", None),
+        sender_fullname=record_dict.pop("sender_fullname", None),
+        recipient_fullname=record_dict.pop("recipient_fullname", None),
+        recipient_email=record_dict.pop("recipient_email", None),
+        sender_id=record_dict.pop("sender_id", None),
+        status=record_dict.pop("status"),
+        origin=record_dict.pop("origin"),
+        destination=record_dict.pop("destination"),
+        origin_coords=(
+            record_dict.pop("origin_latitude"),
+            record_dict.pop("origin_longitude"),
+        ),
+        destination_coords=(
+            record_dict.pop("destination_latitude"),
+            record_dict.pop("destination_longitude"),
+        ),
+        origin_distance=record_dict.pop("origin_distance", None),
+        destination_distance=record_dict.pop("destination_distance", None),
+        created_at=record_dict.pop("created_at"),
+        last_updated=record_dict.pop("last_updated"),
+    )
+
+
+def validated_package(record) -> PackageDTO:
+    """The previous from_record: validate every field."""
+    return PackageDTO(**dict(record))
+
+
+def measure(name: str, build, records: list[dict]) -> float:
+    started = time.perf_counter()
+    for record in records:
+        build(record)
+    elapsed = time.perf_counter() - started
+    print(f"{name:>20}: {elapsed * 1000:8.1f} ms {len(records) / elapsed:12.0f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    shipments, packages = make_records(args.records)
+    before = measure("shipment validated", validated_shipment, shipments)
+    after = measure("shipment trusted", ShipmentDTO.from_record, shipments)
+    print(f"{'speedup':>20}: {before / after:8.2f}x")
+    before = measure("package validated", validated_package, packages)
+    after = measure("package trusted", PackageDTO.from_record, packages)
+    print(f"{'speedup':>20}: {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
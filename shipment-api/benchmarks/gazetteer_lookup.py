@@ -0,0 +1,94 @@
+"""Benchmark of the offline gazetteer geocoder.
+
+A synthetic gazetteer of buildings on streets of a few cities is written to a
+CSV file, compiled to its index and memory-mapped. The benchmark reports the
+compile and open times and the latency of building, street and miss lookups
+made with the queries `geopy.location_query` builds.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.gazetteer_lookup --streets 2000 --numbers 100
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.infrastructure.external.geolocation.gazetteer import (
+    Gazetteer,
+    GazetteerGeocoder,
+)
+
+CITIES = ["Warszawa", "Kraków", "Łódź", "Wrocław", "Poznań"]
+
+
+def write_source(path: Path, streets: int, numbers: int) -> int:
+    """Write a synthetic gazetteer CSV and return its row count."""
+    rows = 0
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            ["city", "street", "street_number", "postcode", "latitude", "longitude"]
+        )
+        for street in range(streets):
+            city = CITIES[street % len(CITIES)]
+            postcode = f"{street % 100:02d}-{street % 1000:03d}"
+            writer.writerow([city, f"Ulica {street}", "", postcode, 52.0, 21.0])
+            for number in range(1, numbers + 1):
+                writer.writerow(
+                    [city, f"Ulica {street}", number, postcode, 52.0, 21.0]
+                )
+            rows += numbers + 1
+    return rows
+
+
+def measure(geocoder: GazetteerGeocoder, queries: list[str]) -> float:
+    """Return the mean lookup latency in microseconds."""
+    started = time.perf_counter()
+    for query in queries:
+        geocoder.lookup(query)
+    return (time.perf_counter() - started) / len(queries) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streets", type=int, default=2000)
+    parser.add_argument("--numbers", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "gazetteer.csv"
+        rows = write_source(source, args.streets, args.numbers)
+
+        started = time.perf_counter()
+        Gazetteer.load(source)
+        compiled = time.perf_counter() - started
+        started = time.perf_counter()
+        geocoder = GazetteerGeocoder(Gazetteer.load(source))
+        opened = time.perf_counter() - started
+        size = (Path(directory) / "gazetteer.csv.idx").stat().st_size
+        print(f"   entries: {rows} ({size / 2**20:.1f} MiB index)")
+        print(f"   compile: {compiled * 1000:10.1f} ms")
+        print(f"      open: {opened * 1000:10.3f} ms")
+
+        def query(street: int, number: int) -> str:
+            city = CITIES[street % len(CITIES)]
+            postcode = f"{street % 100:02d}-{street % 1000:03d}"
+            return f"Ulica {street}, {number}, {city}, {postcode}"
+
+        streets = [random.randrange(args.streets) for _ in range(args.lookups)]
+        buildings = [query(s, random.randint(1, args.numbers)) for s in streets]
+        street_level = [query(s, args.numbers + 1) for s in streets]
+        misses = [query(args.streets + s, 1) for s in streets]
+        print(f"  building: {measure(geocoder, buildings):10.1f} us/lookup")
+        print(f"    street: {measure(geocoder, street_level):10.1f} us/lookup")
+        print(f"      miss: {measure(geocoder, misses):10.1f} us/lookup")
+        print(f"     stats: {geocoder.stats()}")
+
+
+if __name__ == "__main__":
+    main()
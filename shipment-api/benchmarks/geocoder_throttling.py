@@ -0,0 +1,104 @@
+"""Benchmark of geocoder throttling priorities and circuit breaking.
+
+The geocoder is a stub on the geocoder thread pool. Two scenarios are run.
+
+- Queueing: a bulk batch of lookups fills the rate limiter queue, then one
+  interactive lookup arrives. Its wait is measured with priorities and with
+  the interactive lookup queued as bulk work, i.e. first come, first served.
+- Outage: the stub hangs for the provider timeout and then fails. The time of
+  sequential interactive lookups is measured with the circuit breaker and
+  with a breaker which never opens, as before.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.geocoder_throttling --rate 20 --bulk 40
+"""
+
+import argparse
+import asyncio
+import time
+
+from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+
+from benchmarks.geocoding_calls import StubGeocoder
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.breaker import CircuitBreaker
+from src.infrastructure.external.geolocation.ratelimit import (
+    Priority,
+    RateLimiter,
+    prioritized,
+)
+
+
+class DownGeocoder:
+    """A geocoder hanging for the provider timeout and then failing."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.calls = 0
+
+    def geocode(self, query: str) -> None:
+        self.calls += 1
+        time.sleep(self.timeout)
+        raise GeocoderTimedOut("Service timed out")
+
+
+async def queueing(rate: float, bulk: int, interactive: Priority) -> float:
+    """Return the wait of an interactive lookup behind a bulk batch."""
+    geopy.geolocator = StubGeocoder(0.0)
+    geocoder = geopy.NominatimGeocoder(RateLimiter(rate), CircuitBreaker(5, 30))
+
+    async def lookup(index: int) -> None:
+        with prioritized(Priority.BULK):
+            await geocoder.geocode(f"Ulica {index}")
+
+    batch = [asyncio.ensure_future(lookup(index)) for index in range(bulk)]
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    with prioritized(interactive):
+        await geocoder.geocode("Trębacka, 10, Warszawa, 00-074")
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*batch)
+    return elapsed
+
+
+async def outage(lookups: int, timeout: float, threshold: int) -> tuple[float, int]:
+    """Return the time and upstream calls of lookups during an outage."""
+    stub = DownGeocoder(timeout)
+    geopy.geolocator = stub
+    geocoder = geopy.NominatimGeocoder(
+        RateLimiter(1e6, 1000), CircuitBreaker(threshold, 30)
+    )
+    started = time.perf_counter()
+    for index in range(lookups):
+        try:
+            await geocoder.geocode(f"Ulica {index}")
+        except (GeocoderTimedOut, GeocoderUnavailable):
+            pass
+    return time.perf_counter() - started, stub.calls
+
+
+async def run(rate: float, bulk: int, lookups: int, timeout: float) -> None:
+    for name, priority in (("fifo", Priority.BULK), ("priority", Priority.INTERACTIVE)):
+        wait = await queueing(rate, bulk, priority)
+        print(f"{name:>10}: interactive wait {wait * 1000:8.1f} ms behind {bulk}")
+    for name, threshold in (("no breaker", lookups + 1), ("breaker", 5)):
+        elapsed, calls = await outage(lookups, timeout, threshold)
+        print(
+            f"{name:>10}: {lookups} lookups {elapsed * 1000:8.1f} ms, "
+            f"{calls} upstream calls"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=20.0, help="lookups/s")
+    parser.add_argument("--bulk", type=int, default=40)
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=0.2, help="seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rate, args.bulk, args.lookups, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
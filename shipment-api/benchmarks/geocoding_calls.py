@@ -0,0 +1,147 @@
+"""Benchmark of external geocoder calls per shipment mutation.
+
+Shipments are created and updated through ShipmentService against an
+in-memory repository, with the geocoder replaced by a stub that counts
+calls and sleeps a fixed latency. The geocode cache is cleared before every
+mutation, so the counts are those of a cold cache. The previous update,
+which resolved both addresses and their coordinates sequentially on every
+call, is measured alongside.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.geocoding_calls --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from src.core.domain.location import Location
+from src.core.domain.shipment import ShipmentIn, ShipmentStatus
+from src.infrastructure.cache.tracking import TrackingCache
+from src.infrastructure.cache.workload import WorkloadCounters
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import GeocodeCache
+from src.infrastructure.external.geolocation.ratelimit import RateLimiter
+from src.infrastructure.services.shipment import ShipmentService
+
+WARSZAWA = Location()
+KRAKOW = Location(street="Floriańska", street_number="2", city="Kraków")
+GDANSK = Location(street="Długa", street_number="1", city="Gdańsk")
+
+
+class GeocodedLocation(SimpleNamespace):
+    """A geopy Location stand-in."""
+
+    def __str__(self) -> str:
+        return self.address
+
+
+class StubGeocoder:
+    """A geocoder counting calls and answering after a fixed latency."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    def geocode(self, query: str) -> GeocodedLocation:
+        self.calls += 1
+        time.sleep(self.latency)
+        return GeocodedLocation(
+            address=f"{query} (normalized)", latitude=52.0, longitude=21.0
+        )
+
+
+class MemoryRepository:
+    """An in-memory stand-in for the shipment repository writes."""
+
+    def __init__(self) -> None:
+        self.row: dict = {}
+
+    async def add_shipment(self, data, origin, destination, oc, dc, user_id, **kw):
+        return self._store(origin, destination, oc, dc, **kw)
+
+    async def update_shipment(self, _, __, data, origin, destination, oc, dc, **kw):
+        return self._store(origin, destination, oc, dc, **kw)
+
+    async def get_shipment_by_id(self, shipment_id):
+        return self.row
+
+    def _store(self, origin, destination, oc, dc, origin_query=None, **kw):
+        now = datetime.now(timezone.utc)
+        self.row = {
+            "id": 1,
+            "status": ShipmentStatus.PENDING,
+            "origin": origin,
+            "destination": destination,
+            "origin_query": origin_query,
+            "destination_query": kw.get("destination_query"),
+            "origin_latitude": oc[0],
+            "origin_longitude": oc[1],
+            "destination_latitude": dc[0],
+            "destination_longitude": dc[1],
+            "created_at": now,
+            "last_updated": now,
+        }
+        return self.row
+
+
+async def previous_update(shipment: ShipmentIn) -> None:
+    """The previous update_shipment geocoding steps."""
+    origin = await geopy.get_address_from_location(shipment.origin)
+    destination = await geopy.get_address_from_location(shipment.destination)
+    await geopy.get_coords(origin)
+    await geopy.get_coords(destination)
+
+
+async def run(latency: float) -> None:
+    stub = StubGeocoder(latency)
+    geopy.geolocator = stub
+    geopy.remote = geopy.NominatimGeocoder(RateLimiter(1e6, 1000), geopy.breaker)
+    geopy.cache = GeocodeCache(1000, 3600, 3600, persistent=False)
+    service = ShipmentService(
+        MemoryRepository(), None, TrackingCache(100, 60), WorkloadCounters()
+    )
+    created = ShipmentIn(origin=WARSZAWA, destination=KRAKOW)
+    located = ShipmentIn(
+        origin=WARSZAWA,
+        destination=KRAKOW,
+        origin_coords=(52.0, 21.0),
+        destination_coords=(50.0, 19.9),
+    )
+    moved = ShipmentIn(origin=WARSZAWA, destination=GDANSK)
+    cases = [
+        ("create", lambda: service.add_shipment(created, None)),
+        ("create with coordinates", lambda: service.add_shipment(located, None)),
+        (
+            "create, same both ends",
+            lambda: service.add_shipment(
+                ShipmentIn(origin=GDANSK, destination=GDANSK), None
+            ),
+        ),
+        ("prepare", lambda: service.add_shipment(created, None)),
+        ("update, unchanged", lambda: service.update_shipment(1, created)),
+        ("update, one end changed", lambda: service.update_shipment(1, moved)),
+        ("previous update, any", lambda: previous_update(created)),
+    ]
+    for name, mutation in cases:
+        geopy.cache.clear()
+        stub.calls = 0
+        started = time.perf_counter()
+        await mutation()
+        elapsed = time.perf_counter() - started
+        if name != "prepare":
+            print(f"{name:>26}: {stub.calls} calls {elapsed * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark of concurrent duplicate geocode lookups.
+
+Many concurrent lookups of a few distinct addresses are made with a cold
+cache, as when a batch of shipments to one city is created. The geocoder is a
+stub which counts calls and sleeps a fixed latency on the geocoder thread
+pool. The lookups are made through `geopy.geocode`, which coalesces them, and
+through the uncoalesced cache-then-geocoder path, as before.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.geocoding_coalescing --lookups 500 --distinct 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.geocoding_calls import StubGeocoder
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import GeocodeCache
+from src.infrastructure.external.geolocation.ratelimit import RateLimiter
+
+
+async def run(lookups: int, distinct: int, latency: float) -> None:
+    stub = StubGeocoder(latency)
+    geopy.geolocator = stub
+    geopy.gazetteer = None
+    geopy.remote = geopy.NominatimGeocoder(RateLimiter(1e6, 1000), geopy.breaker)
+    queries = [f"Ulica {index % distinct}, 1, Warszawa" for index in range(lookups)]
+    cases = [("uncoalesced", geopy._lookup), ("coalesced", geopy.geocode)]
+    for name, lookup in cases:
+        geopy.cache = GeocodeCache(1000, 3600, 3600, persistent=False)
+        stub.calls = 0
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup(query) for query in queries))
+        elapsed = time.perf_counter() - started
+        print(f"{name:>12}: {stub.calls:5} calls {elapsed * 1000:10.1f} ms")
+    print(f"  counters: {geopy.in_flight.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.lookups, args.distinct, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark of event loop responsiveness while geocodes are in flight.
+
+A local stub geocoder answers every Nominatim query after a fixed delay. The
+benchmark measures latency of an unrelated endpoint in three scenarios:
+idle, geocoding with the synchronous client called on the event loop
+(the previous behaviour) and geocoding through the executor-backed client.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.geocoding_event_loop --delay 0.2 --geocodes 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_stub_geocoder(delay: float) -> ThreadingHTTPServer:
+    """Start a Nominatim-compatible stub answering after `delay` seconds."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            time.sleep(delay)
+            body = json.dumps(
+                [{"lat": "52.2297", "lon": "21.0122", "display_name": "Warszawa"}]
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(
+    mode: str, geocodes: int, pings: int, interval: float = 0.01
+) -> list[float]:
+    """Measure /ping latencies (ms) while `geocodes` lookups are running."""
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from src.infrastructure.external.geolocation import geopy
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"pong": True}
+
+    @app.get("/geocode")
+    async def geocode(query: str) -> dict:
+        if mode == "blocking":
+            location = geopy.geolocator.geocode(query)
+            return {"coords": (location.latitude, location.longitude)}
+        return {"coords": await geopy.get_coords(query)}
+
+    async def lookup(index: int) -> None:
+        await asyncio.sleep(index * interval * pings / max(geocodes, 1))
+        await client.get("/geocode", params={"query": f"Warszawa {index}"})
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        in_flight = []
+        if mode != "idle":
+            in_flight = [asyncio.create_task(lookup(i)) for i in range(geocodes)]
+        # Latency is measured from the scheduled send time, so time spent
+        # waiting for a blocked event loop is not hidden (coordinated omission).
+        latencies = []
+        started = time.perf_counter()
+        for index in range(pings):
+            scheduled = started + index * interval
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+        await asyncio.gather(*in_flight)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--geocodes", type=int, default=20)
+    parser.add_argument("--pings", type=int, default=100)
+    args = parser.parse_args()
+
+    server = start_stub_geocoder(args.delay)
+    os.environ["GEOCODER_DOMAIN"] = f"127.0.0.1:{server.server_port}"
+    os.environ["GEOCODER_SCHEME"] = "http"
+    os.environ["GEOCODE_CACHE_PERSISTENT"] = "false"
+    os.environ["GEOCODER_RATE"] = "1000"
+    os.environ["GEOCODER_BURST"] = "1000"
+
+    print(f"stub delay={args.delay}s geocodes={args.geocodes} pings={args.pings}")
+    for mode in ("idle", "blocking", "executor"):
+        latencies = asyncio.run(measure(mode, args.geocodes, args.pings))
+        print(
+            f"{mode:>9}: p50={statistics.median(latencies):8.2f} ms "
+            f"p99={percentile(latencies, 99):8.2f} ms "
+            f"max={max(latencies):8.2f} ms"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark of list endpoint response serialization.
+
+A minimal FastAPI app returns the same 50k shipment DTOs twice: as a plain
+list validated against `response_model` and encoded by FastAPI (the
+previous behaviour of the list endpoints), and through `json_response`,
+which renders the DTOs with orjson. Requests go through the in-process
+test client, so the numbers cover serialization and not the network.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.list_serialization --rows 50000 --repeat 3
+"""
+
+import argparse
+import time
+from typing import Iterable
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.dto_construction import make_records
+from src.api.responses import json_response
+from src.infrastructure.dto.shipmentDTO import ShipmentDTO
+
+
+def build_app(shipments: list[ShipmentDTO]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=Iterable[ShipmentDTO])
+    async def default() -> Iterable[ShipmentDTO]:
+        return shipments
+
+    @app.get("/orjson", response_model=Iterable[ShipmentDTO])
+    async def fast() -> Iterable[ShipmentDTO]:
+        return json_response(shipments)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records, _ = make_records(args.rows)
+    shipments = [ShipmentDTO.from_record(record) for record in records]
+    client = TestClient(build_app(shipments))
+    bodies = {}
+    for path in ("/default", "/orjson"):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            body = client.get(path).content
+        elapsed = (time.perf_counter() - started) / args.repeat
+        bodies[path] = body
+        rate = len(body) / elapsed / 2**20
+        print(
+            f"{path:>10}: {elapsed * 1000:8.1f} ms {rate:8.1f} MiB/s "
+            f"({len(body)} bytes)"
+        )
+    same = client.get("/default").json() == client.get("/orjson").json()
+    print(f"same JSON: {same}")
+
+
+if __name__ == "__main__":
+    main()
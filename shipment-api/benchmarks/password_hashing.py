@@ -0,0 +1,78 @@
+"""Load test of login password verification throughput.
+
+A burst of concurrent logins verifies one bcrypt hash each. The benchmark
+reports logins per second with verification called on the event loop
+(the previous behaviour) and through the hashing pool sized to 1, 2, ...
+up to the number of cores, together with the latency of an unrelated
+coroutine ticking during the burst.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.password_hashing --logins 64 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def ticker(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Return the worst event loop delay (ms) observed until `stop` is set."""
+    worst = 0.0
+    while not stop.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - scheduled)
+    return worst * 1000
+
+
+async def burst(logins: int, hashed: str, workers: int | None) -> tuple[float, float]:
+    """Run `logins` concurrent verifications, returning (logins/s, max delay)."""
+    from src.core.security import password_hashing
+
+    if workers:
+        password_hashing.executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def login() -> None:
+        if workers:
+            await password_hashing.verify_password_async("Password123", hashed)
+        else:
+            password_hashing.verify_password("Password123", hashed)
+            await asyncio.sleep(0)
+
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    delay = await tick
+    if workers:
+        password_hashing.executor.shutdown()
+    return logins / elapsed, delay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+    from src.core.security import password_hashing
+
+    hashed = password_hashing.hash_password("Password123")
+    print(f"logins={args.logins} rounds={args.rounds} cores={os.cpu_count()}")
+    workers = [0]
+    while workers[-1] < args.max_workers:
+        workers.append(min(args.max_workers, max(1, workers[-1] * 2)))
+    for count in workers:
+        rate, delay = asyncio.run(burst(args.logins, hashed, count))
+        label = "event loop" if not count else f"pool x{count}"
+        print(f"{label:>11}: {rate:8.1f} logins/s  max loop delay={delay:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of the courier route planner.
+
+Random courier workloads around Warsaw, with every other shipment being a
+pickup (a pickup and a delivery stop) and the rest deliveries, are planned
+with nearest neighbour only and with 2-opt improvement. The benchmark
+reports route length and planning time for each size.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.route_planner --stops 50 200 1000 --budget 2.0
+"""
+
+import argparse
+import time
+
+import numpy
+
+from src.infrastructure.routing.planner import NO_PREDECESSOR, plan
+
+COURIER_COORDS = (52.2297, 21.0122)
+
+
+def make_stops(count: int, seed: int = 0) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Generate `count` stops with pickup-before-delivery pairs."""
+    rng = numpy.random.default_rng(seed)
+    predecessors = []
+    while len(predecessors) < count:
+        if len(predecessors) % 3 == 0 and len(predecessors) + 2 <= count:
+            predecessors += [NO_PREDECESSOR, len(predecessors)]
+        else:
+            predecessors.append(NO_PREDECESSOR)
+    stops = rng.uniform([52.0, 20.8], [52.4, 21.3], size=(count, 2))
+    return stops, numpy.array(predecessors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stops", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--budget", type=float, default=2.0, help="2-opt seconds")
+    args = parser.parse_args()
+
+    for count in args.stops:
+        stops, predecessors = make_stops(count)
+        started = time.perf_counter()
+        greedy = plan(COURIER_COORDS, stops, predecessors, time_budget=0.0)
+        greedy_time = time.perf_counter() - started
+        started = time.perf_counter()
+        route = plan(COURIER_COORDS, stops, predecessors, time_budget=args.budget)
+        elapsed = time.perf_counter() - started
+        saved = 1 - route.total_distance / greedy.total_distance
+        print(
+            f"{count:>5} stops: nearest neighbour {greedy.total_distance:8.1f} km "
+            f"{greedy_time * 1000:7.1f} ms | 2-opt {route.total_distance:8.1f} km "
+            f"{elapsed * 1000:7.1f} ms ({saved:5.1%} shorter, "
+            f"{'converged' if route.converged else 'budget spent'})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark of shipment reads before and after archiving terminal shipments.
+
+The schema from `src.db` is created in a scratch PostgreSQL schema of the
+configured database and seeded as in `benchmarks.shipment_indexes`, with
+creation times spread over the benchmark period. The listing and tracking
+queries are run with EXPLAIN ANALYZE, terminal shipments older than the
+archival age are then moved to `shipments_archive` in batches by the
+repository statement, and the queries are run again against the live table
+alone and together with the archive. The scratch schema is dropped at the
+end.
+
+Usage (from the shipment-api directory, with the DB_* variables set):
+    python -m benchmarks.shipment_archive --shipments 10000000 --plans
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from benchmarks.shipment_indexes import (
+    SEED_CLIENTS,
+    SEED_SHIPMENTS,
+    SEED_USERS,
+    explain,
+    sample,
+    to_sql,
+)
+from src.db import (
+    TERMINAL_SHIPMENT_STATUSES,
+    db_uri,
+    metadata,
+    shipment_archive_table,
+)
+from src.infrastructure.repositories.pagination import paginate
+from src.infrastructure.repositories.shipmentdb import ShipmentRepository
+from src.partitions import add_months, create_partitions
+
+SCHEMA = "archive_benchmark"
+PAGE_SIZE = 50
+
+# Shipments are updated for the last time within two days of their creation.
+SPREAD_CREATION = """
+UPDATE shipments
+SET created_at = spread.created_at,
+    last_updated = spread.created_at + random() * interval '2 days'
+FROM (
+    SELECT id, now() - random() * CAST(:period AS interval) AS created_at
+    FROM shipments
+) AS spread
+WHERE shipments.id = spread.id
+"""
+
+
+def build_queries(params: dict[str, Any], include_archived: bool) -> dict[str, str]:
+    """Build the repository queries to be explained."""
+    repository = ShipmentRepository()
+    shipments = repository._shipments(include_archived)
+    return {
+        "all shipments page": to_sql(
+            paginate(
+                repository._joined_shipments_query(shipments),
+                shipments.c.id,
+                after=params["shipment_id"] // 2,
+                limit=PAGE_SIZE,
+            )
+        ),
+        "client listing page": to_sql(
+            paginate(
+                repository._filtered_shipments_query(
+                    None,
+                    params["sender_id"],
+                    params["recipient_email"],
+                    None,
+                    shipments,
+                ),
+                shipments.c.id,
+                limit=PAGE_SIZE,
+            )
+        ),
+        "check_status": to_sql(
+            repository._joined_shipments_query(shipments).where(
+                (shipments.c.id == params["shipment_id"])
+                & (shipments.c.recipient_email == params["recipient_email"])
+            )
+        ),
+    }
+
+
+async def archive(conn: AsyncConnection, before: datetime, batch_size: int) -> int:
+    """Archive terminal shipments in batches, as the archival job does."""
+    query = ShipmentRepository()._archive_query(
+        TERMINAL_SHIPMENT_STATUSES, before, batch_size
+    )
+    archived = 0
+    while True:
+        result = await conn.execute(query)
+        moved = len(result.all())
+        archived += moved
+        if moved < batch_size:
+            return archived
+
+
+async def run(
+    users: int,
+    shipments: int,
+    months: int,
+    archive_after: int,
+    batch_size: int,
+    repeats: int,
+    plans: bool,
+) -> None:
+    now = datetime.now(timezone.utc)
+    engine = create_async_engine(db_uri)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        await conn.exec_driver_sql(f"SET search_path TO {SCHEMA}")
+        try:
+            await conn.run_sync(metadata.create_all)
+            await conn.run_sync(
+                create_partitions,
+                add_months(now.date(), -months),
+                months + 1,
+                [shipment_archive_table],
+            )
+
+            print(f"seeding {users} users and {shipments} shipments...")
+            await conn.execute(text(SEED_USERS), {"users": users})
+            await conn.execute(text(SEED_CLIENTS))
+            await conn.execute(
+                text(SEED_SHIPMENTS), {"users": users, "shipments": shipments}
+            )
+            await conn.execute(
+                text(SPREAD_CREATION), {"period": timedelta(days=30 * months)}
+            )
+            await conn.exec_driver_sql("VACUUM ANALYZE shipments, users, clients")
+            params = await sample(conn)
+
+            results: dict[str, dict[str, list[float]]] = {}
+            phases = (("before", False), ("live", False), ("with archive", True))
+            for phase, include_archived in phases:
+                if phase == "live":
+                    started = time.perf_counter()
+                    archived = await archive(
+                        conn, now - timedelta(days=archive_after), batch_size
+                    )
+                    elapsed = time.perf_counter() - started
+                    print(
+                        f"archived {archived} shipments in {elapsed:.1f} s "
+                        f"({archived / elapsed:.0f}/s)"
+                    )
+                    await conn.exec_driver_sql(
+                        "VACUUM ANALYZE shipments, packages, shipments_archive"
+                    )
+                queries = build_queries(params, include_archived)
+                for name, sql in queries.items():
+                    timings, plan = await explain(conn, sql, repeats)
+                    results.setdefault(name, {})[phase] = timings
+                    if plans:
+                        print(f"\n--- {name} ({phase}) ---\n{plan}")
+
+            print(f"\n{'query':<24}" + "".join(f"{p + ' ms':>18}" for p, _ in phases))
+            for name, timings in results.items():
+                print(
+                    f"{name:<24}"
+                    + "".join(
+                        f"{statistics.median(timings[phase]):>18.2f}"
+                        for phase, _ in phases
+                    )
+                )
+        finally:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--shipments", type=int, default=10_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--archive-after", type=int, default=90, help="days")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="print query plans")
+    args = parser.parse_args()
+    asyncio.run(
+        run(
+            args.users,
+            args.shipments,
+            args.months,
+            args.archive_after,
+            args.batch_size,
+            args.repeats,
+            args.plans,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
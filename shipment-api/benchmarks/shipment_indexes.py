@@ -0,0 +1,229 @@
+"""Benchmark of shipment queries with and without the declared indexes.
+
+The schema from `src.db` is created in a scratch PostgreSQL schema of the
+configured database and seeded with synthetic users and shipments. The
+repository queries behind courier routes, role-filtered listings, status
+filters and tracking are then run with EXPLAIN ANALYZE, first without the
+secondary indexes and then after `create_indexes`. The scratch schema is
+dropped at the end.
+
+Usage (from the shipment-api directory, with the DB_* variables set):
+    python -m benchmarks.shipment_indexes --shipments 1000000 --plans
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+from typing import Any
+
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.core.domain.shipment import ShipmentStatus
+from src.db import db_uri, metadata, shipment_table
+from src.indexes import create_indexes, drop_indexes
+from src.infrastructure.repositories.pagination import paginate
+from src.infrastructure.repositories.shipmentdb import ShipmentRepository
+from src.infrastructure.services.shipment import DELIVERY_STATUSES, PICKUP_STATUSES
+
+SCHEMA = "index_benchmark"
+PAGE_SIZE = 50
+
+SEED_USERS = """
+INSERT INTO users (email, password, role)
+SELECT 'user' || g || '@example.com', 'x',
+       (CASE WHEN g % 20 = 0 THEN 'COURIER' ELSE 'CLIENT' END)::user_roles
+FROM generate_series(1, :users) AS g
+"""
+
+SEED_CLIENTS = """
+INSERT INTO clients (id, first_name, last_name)
+SELECT id, 'Jan', 'Kowalski' FROM users WHERE role = 'CLIENT'
+"""
+
+# Most shipments of a mature system are delivered; the rest are spread
+# uniformly over all statuses.
+SEED_SHIPMENTS = """
+WITH clients AS (
+    SELECT array_agg(id) AS ids FROM users WHERE role = 'CLIENT'
+), couriers AS (
+    SELECT array_agg(id) AS ids FROM users WHERE role = 'COURIER'
+), statuses AS (
+    SELECT enum_range(NULL::shipment_status) AS ids
+)
+INSERT INTO shipments (
+    sender_id, courier_id, status, recipient_email, origin, destination,
+    origin_latitude, origin_longitude, destination_latitude, destination_longitude
+)
+SELECT
+    clients.ids[1 + floor(random() * cardinality(clients.ids))::int],
+    couriers.ids[1 + floor(random() * cardinality(couriers.ids))::int],
+    CASE WHEN random() < 0.8 THEN 'DELIVERED'::shipment_status
+         ELSE statuses.ids[1 + floor(random() * cardinality(statuses.ids))::int]
+    END,
+    'user' || (1 + floor(random() * :users)::int) || '@example.com',
+    'origin ' || g,
+    'destination ' || g,
+    49 + random() * 5, 14 + random() * 10,
+    49 + random() * 5, 14 + random() * 10
+FROM generate_series(1, :shipments) AS g, clients, couriers, statuses
+"""
+
+
+def to_sql(query: Select) -> str:
+    """Render a query with inlined parameters."""
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+async def sample(conn: AsyncConnection) -> dict[str, Any]:
+    """Pick the parties and the shipment used by the benchmarked queries."""
+    courier = await conn.execute(
+        text(
+            "SELECT courier_id FROM shipments GROUP BY courier_id "
+            "ORDER BY count(*) DESC LIMIT 1"
+        )
+    )
+    shipment = await conn.execute(
+        text(
+            "SELECT id, sender_id, recipient_email FROM shipments "
+            "ORDER BY id DESC LIMIT 1"
+        )
+    )
+    shipment_id, sender_id, recipient_email = shipment.one()
+    return {
+        "courier_id": courier.scalar_one(),
+        "sender_id": sender_id,
+        "recipient_email": recipient_email,
+        "shipment_id": shipment_id,
+    }
+
+
+def build_queries(params: dict[str, Any]) -> dict[str, str]:
+    """Build the repository queries to be explained."""
+    repository = ShipmentRepository()
+    key = shipment_table.c.id
+    return {
+        "courier active (sort_by_distance)": to_sql(
+            repository._filtered_shipments_query(
+                params["courier_id"], None, None, PICKUP_STATUSES + DELIVERY_STATUSES
+            )
+        ),
+        "courier listing page": to_sql(
+            paginate(
+                repository._filtered_shipments_query(
+                    params["courier_id"], None, None, None
+                ),
+                key,
+                limit=PAGE_SIZE,
+            )
+        ),
+        "client listing page": to_sql(
+            paginate(
+                repository._filtered_shipments_query(
+                    None, params["sender_id"], params["recipient_email"], None
+                ),
+                key,
+                limit=PAGE_SIZE,
+            )
+        ),
+        "status filter page": to_sql(
+            paginate(
+                repository._filtered_shipments_query(
+                    None, None, None, [ShipmentStatus.LOST]
+                ),
+                key,
+                after=params["shipment_id"] // 2,
+                limit=PAGE_SIZE,
+            )
+        ),
+        "check_status": to_sql(
+            repository._joined_shipments_query().where(
+                (shipment_table.c.id == params["shipment_id"])
+                & (shipment_table.c.recipient_email == params["recipient_email"])
+            )
+        ),
+    }
+
+
+async def explain(
+    conn: AsyncConnection, sql: str, repeats: int
+) -> tuple[list[float], str]:
+    """Run EXPLAIN ANALYZE `repeats` times, returning timings (ms) and the plan."""
+    timings = []
+    for _ in range(repeats):
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"
+        )
+        document = result.scalar_one()
+        if isinstance(document, str):
+            document = json.loads(document)
+        timings.append(
+            document[0]["Planning Time"] + document[0]["Execution Time"]
+        )
+    plan_result = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+    plan = "\n".join(row[0] for row in plan_result)
+    return timings, plan
+
+
+async def run(users: int, shipments: int, repeats: int, plans: bool) -> None:
+    engine = create_async_engine(db_uri)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        await conn.exec_driver_sql(f"SET search_path TO {SCHEMA}")
+        try:
+            await conn.run_sync(metadata.create_all)
+            await conn.run_sync(drop_indexes)
+
+            print(f"seeding {users} users and {shipments} shipments...")
+            await conn.execute(text(SEED_USERS), {"users": users})
+            await conn.execute(text(SEED_CLIENTS))
+            await conn.execute(
+                text(SEED_SHIPMENTS), {"users": users, "shipments": shipments}
+            )
+            await conn.exec_driver_sql("ANALYZE shipments, users, clients")
+            queries = build_queries(await sample(conn))
+
+            results: dict[str, dict[str, list[float]]] = {}
+            for phase in ("before", "after"):
+                if phase == "after":
+                    await conn.run_sync(create_indexes)
+                    await conn.exec_driver_sql("ANALYZE shipments, users, clients")
+                for name, sql in queries.items():
+                    timings, plan = await explain(conn, sql, repeats)
+                    results.setdefault(name, {})[phase] = timings
+                    if plans:
+                        print(f"\n--- {name} ({phase}) ---\n{plan}")
+
+            print(f"\n{'query':<36}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+            for name, timings in results.items():
+                before = statistics.median(timings["before"])
+                after = statistics.median(timings["after"])
+                print(
+                    f"{name:<36}{before:>12.2f}{after:>12.2f}"
+                    f"{before / after if after else float('inf'):>9.1f}x"
+                )
+        finally:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--shipments", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="print query plans")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.shipments, args.repeats, args.plans))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark of shipment timeline reads from the partitioned event log.
+
+The schema from `src.db` is created in a scratch PostgreSQL schema of the
+configured database, with monthly `shipment_events` partitions covering the
+benchmark period. Synthetic shipments, created uniformly over the period,
+get their events 12 hours apart. The timeline query of
+`ShipmentRepository.get_events` is then run with EXPLAIN ANALYZE for random
+shipments, bounded by the shipment lifetime as the service does, and without
+the bounds, which cannot prune partitions. The scratch schema is dropped at
+the end.
+
+Usage (from the shipment-api directory, with the DB_* variables set):
+    python -m benchmarks.shipment_timeline --events 100000000 --per-shipment 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.shipment_indexes import explain, to_sql
+from src.db import db_uri, metadata, shipment_event_table
+from src.infrastructure.repositories.shipmentdb import ShipmentRepository
+from src.partitions import add_months, create_partitions
+
+SCHEMA = "timeline_benchmark"
+EVENT_SPACING = timedelta(hours=12)
+CHUNK = 1_000_000
+
+SEED_EVENTS = """
+WITH statuses AS (SELECT enum_range(NULL::shipment_status) AS ids)
+INSERT INTO shipment_events (
+    id, shipment_id, status, latitude, longitude, created_at
+)
+SELECT
+    (s - 1) * :per_shipment + e + 1,
+    s,
+    statuses.ids[1 + e % cardinality(statuses.ids)],
+    49 + random() * 5, 14 + random() * 10,
+    CAST(:start AS timestamptz)
+        + (s - 1) * CAST(:step AS interval)
+        + e * CAST(:spacing AS interval)
+FROM generate_series(CAST(:first AS int), :last) AS s,
+     generate_series(0, :per_shipment - 1) AS e,
+     statuses
+"""
+
+
+async def run(events: int, per_shipment: int, months: int, samples: int) -> None:
+    shipments = events // per_shipment
+    first_month = add_months(datetime.now(timezone.utc).date(), -months)
+    start = datetime(first_month.year, first_month.month, 1, tzinfo=timezone.utc)
+    period = datetime.combine(
+        add_months(first_month, months), datetime.min.time(), timezone.utc
+    ) - start - per_shipment * EVENT_SPACING
+    step = period / shipments
+
+    engine = create_async_engine(db_uri)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        await conn.exec_driver_sql(f"SET search_path TO {SCHEMA}")
+        try:
+            await conn.run_sync(metadata.create_all)
+            await conn.run_sync(
+                create_partitions, first_month, months, [shipment_event_table]
+            )
+
+            print(f"seeding {shipments} shipments with {events} events...")
+            started = time.perf_counter()
+            for first in range(1, shipments + 1, CHUNK):
+                await conn.execute(
+                    text(SEED_EVENTS),
+                    {
+                        "start": start,
+                        "step": step,
+                        "spacing": EVENT_SPACING,
+                        "per_shipment": per_shipment,
+                        "first": first,
+                        "last": min(first + CHUNK - 1, shipments),
+                    },
+                )
+            await conn.exec_driver_sql("ANALYZE shipment_events")
+            print(f"seeded in {time.perf_counter() - started:.0f} s")
+
+            repository = ShipmentRepository()
+            bounds = {"bounded": [], "unbounded": []}
+            for shipment_id in random.sample(range(1, shipments + 1), samples):
+                created_at = start + (shipment_id - 1) * step
+                last_updated = created_at + (per_shipment - 1) * EVENT_SPACING
+                queries = {
+                    "bounded": repository._events_query(
+                        shipment_id, created_at, last_updated
+                    ),
+                    "unbounded": repository._events_query(
+                        shipment_id, start, start + period + months * EVENT_SPACING
+                    ),
+                }
+                for name, query in queries.items():
+                    timings, _ = await explain(conn, to_sql(query), 1)
+                    bounds[name].append(timings[0])
+
+            print(f"\n{'timeline query':<16}{'p50 ms':>10}{'p99 ms':>10}")
+            for name, timings in bounds.items():
+                timings.sort()
+                p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+                print(f"{name:<16}{statistics.median(timings):>10.3f}{p99:>10.3f}")
+        finally:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000_000)
+    parser.add_argument("--per-shipment", type=int, default=5)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.per_shipment, args.months, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Micro-benchmark of ShipmentService.sort_by_distance.
+
+Compares the previous per-shipment loop (which re-sorted the result list after
+every shipment) with the vectorized implementation on synthetic shipments of
+a single courier. Geocoding of the courier location is stubbed out.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.sort_by_distance --shipments 10000 --limit 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.core.domain.location import Location
+from src.core.domain.shipment import ShipmentStatus
+from src.infrastructure.cache.tracking import TrackingCache
+from src.infrastructure.cache.workload import WorkloadCounters
+from src.infrastructure.dto.shipmentDTO import ShipmentWithDistanceDTO
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import GeocodeResult
+from src.infrastructure.services.shipment import ShipmentService
+
+COURIER_COORDS = (52.2297, 21.0122)
+STATUSES = [
+    ShipmentStatus.READY_FOR_PICKUP,
+    ShipmentStatus.RETURNED_TO_SENDER,
+    ShipmentStatus.OUT_FOR_DELIVERY,
+    ShipmentStatus.FAILED_ATTEMPT,
+]
+
+
+def make_records(count: int, courier_id) -> list[dict]:
+    """Generate shipment records spread over Poland."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": index,
+            "sender_id": None,
+            "recipient_id": None,
+            "courier_id": courier_id,
+            "sender_fullname": None,
+            "recipient_fullname": None,
+            "recipient_email": None,
+            "status": random.choice(STATUSES),
+            "origin": "origin",
+            "destination": "destination",
+            "origin_latitude": random.uniform(49.0, 54.8),
+            "origin_longitude": random.uniform(14.1, 24.1),
+            "destination_latitude": random.uniform(49.0, 54.8),
+            "destination_longitude": random.uniform(14.1, 24.1),
+            "created_at": now,
+            "last_updated": now,
+        }
+        for index in range(count)
+    ]
+
+
+async def legacy_sort_by_distance(records: list[dict], courier_id) -> list:
+    """The implementation replaced by the vectorized pipeline."""
+    shipments = [
+        ShipmentWithDistanceDTO.from_record(record)
+        for record in records
+        if record["courier_id"] == courier_id
+    ]
+    sorted_shipments = []
+    for shipment in shipments:
+        if shipment.status in ["ready_for_pickup", "returned_to_sender"]:
+            shipment.origin_distance = await geopy.get_distance(
+                COURIER_COORDS, shipment.origin_coords
+            )
+            sorted_shipments.append(shipment)
+        elif shipment.status in ["out_for_delivery", "failed_attempt"]:
+            shipment.destination_distance = await geopy.get_distance(
+                COURIER_COORDS, shipment.destination_coords
+            )
+            sorted_shipments.append(shipment)
+        sorted_shipments = sorted(
+            sorted_shipments,
+            key=lambda x: (
+                x.origin_distance
+                if x.status in ["ready_for_pickup", "returned_to_sender"]
+                else x.destination_distance
+            ),
+        )
+    return sorted_shipments
+
+
+class FakeRepository:
+    """A repository returning pre-generated records."""
+
+    def __init__(self, records: list[dict]) -> None:
+        self._records = records
+
+    async def get_filtered_shipments(self, **filters) -> list[dict]:
+        return self._records
+
+
+async def stub_geocode(query: str) -> GeocodeResult:
+    return GeocodeResult("Warszawa", *COURIER_COORDS)
+
+
+async def timed(coroutine) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = await coroutine
+    return (time.perf_counter() - start) * 1000, result
+
+
+async def run(count: int, limit: int, legacy: bool) -> None:
+    geopy.geocode = stub_geocode
+    courier_id = uuid4()
+    records = make_records(count, courier_id)
+    service = ShipmentService(
+        FakeRepository(records),
+        email_service=None,
+        tracking_cache=TrackingCache(1, 1),
+        workload=WorkloadCounters(),
+    )
+    location = Location()
+
+    elapsed, result = await timed(service.sort_by_distance(courier_id, location))
+    print(f"vectorized, all     : {elapsed:10.1f} ms ({len(result)} shipments)")
+    elapsed, result = await timed(service.sort_by_distance(courier_id, location, limit))
+    print(f"vectorized, top {limit:<4}: {elapsed:10.1f} ms ({len(result)} shipments)")
+    if legacy:
+        elapsed, result = await timed(legacy_sort_by_distance(records, courier_id))
+        print(f"legacy loop         : {elapsed:10.1f} ms ({len(result)} shipments)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shipments", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.shipments, args.limit, not args.skip_legacy))
+
+
+if __name__ == "__main__":
+    main()
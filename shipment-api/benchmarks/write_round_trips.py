@@ -0,0 +1,177 @@
+"""Benchmark of database statements issued by write endpoints.
+
+Every repository write of a mutating endpoint runs against a recording
+stand-in for the database, which counts statements and waits a simulated
+network round trip for each of them. Statement counts do not depend on
+the data, so no PostgreSQL instance is needed.
+
+Usage (from the shipment-api directory):
+    python -m benchmarks.write_round_trips --rtt 0.5 --repeat 200
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+
+class RecordingDatabase:
+    """A database stand-in counting statements and simulating latency."""
+
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.row: dict = {}
+        self.statements = 0
+
+    async def _round_trip(self):
+        self.statements += 1
+        await asyncio.sleep(self.rtt)
+
+    async def execute(self, query, values=None):
+        await self._round_trip()
+        return self.row.get("id")
+
+    async def fetch_one(self, query, values=None):
+        await self._round_trip()
+        return self.row
+
+    async def fetch_all(self, query, values=None):
+        await self._round_trip()
+        return [self.row]
+
+
+def build_cases() -> list:
+    """Build (endpoint, repository module, row, call) benchmark cases."""
+    from src.core.domain.location import Location
+    from src.core.domain.shipment import Package, PackageIn, ShipmentIn
+    from src.core.domain.user import ClientIn, StaffIn, UserIn
+    from src.infrastructure.repositories import (
+        clientdb,
+        packagedb,
+        shipmentdb,
+        staffdb,
+        userdb,
+    )
+
+    now = datetime.now(timezone.utc)
+    user_id = uuid4()
+    user = {"id": user_id, "email": "a@b.pl", "password": "Hashed-1", "role": "client"}
+    person = {
+        "id": user_id,
+        "first_name": "Jan",
+        "last_name": "Kowalski",
+        "phone_number": "+48123456789",
+        "address": "Warszawa",
+        "email": "a@b.pl",
+        "role": "client",
+    }
+    package = {"id": 1, "weight": 1.0, "length": 1.0, "width": 1.0, "height": 1.0}
+    shipment_in = ShipmentIn(origin=Location(), destination=Location())
+    package_in = PackageIn(weight=1, length=1, width=1, height=1, fragile=False)
+    package_update = Package(
+        **package_in.model_dump(),
+        id=1,
+        created_at=now,
+        last_updated=now,
+        pickup_scheduled_date=None,
+        pickup_actual_date=None,
+        delivery_scheduled_date=None,
+        delivery_actual_date=None,
+        cancelled_at=None,
+    )
+    client_in = ClientIn(
+        first_name="Jan", last_name="Kowalski", phone_number="+48123456789"
+    )
+    staff_in = StaffIn(
+        first_name="Jan", last_name="Kowalski", phone_number="+48123456789"
+    )
+    users = userdb.UserRepository()
+    clients = clientdb.ClientRepository()
+    staff = staffdb.StaffRepository()
+    packages = packagedb.PackageRepository()
+    shipments = shipmentdb.ShipmentRepository()
+    user_in = UserIn(email="a@b.pl", password="Password1", role="client")
+    coords = (52.2297, 21.0122)
+
+    return [
+        ("POST /users/register", userdb, user, lambda: users.register_user(user_in)),
+        (
+            "POST /clients (client row)",
+            clientdb,
+            person,
+            lambda: clients.register_client(client_in, user_id),
+        ),
+        (
+            "PUT /clients/{id}",
+            clientdb,
+            person,
+            lambda: clients.update_client(user_id, client_in),
+        ),
+        ("DELETE /clients/{id}", clientdb, person, lambda: clients.delete_client(user_id)),
+        (
+            "POST /staff (staff row)",
+            staffdb,
+            person,
+            lambda: staff.register_staff(staff_in, user_id),
+        ),
+        (
+            "PUT /staff/{id}",
+            staffdb,
+            person,
+            lambda: staff.update_staff(user_id, staff_in),
+        ),
+        ("DELETE /staff/{id}", staffdb, person, lambda: staff.delete_staff(user_id)),
+        (
+            "POST /shipments (shipment row)",
+            shipmentdb,
+            {"id": 1},
+            lambda: shipments.add_shipment(
+                shipment_in, "a", "b", coords, coords, user_id
+            ),
+        ),
+        (
+            "POST /packages (package row)",
+            packagedb,
+            package,
+            lambda: packages.add_package(package_in, 1),
+        ),
+        (
+            "PUT /packages/{id}",
+            packagedb,
+            package,
+            lambda: packages.update_package(1, package_update),
+        ),
+        ("DELETE /packages/{id}", packagedb, package, lambda: packages.delete_package(1)),
+    ]
+
+
+async def run(rtt: float, repeat: int) -> None:
+    database = RecordingDatabase(rtt)
+    for endpoint, module, row, call in build_cases():
+        module.database, original = database, module.database
+        database.row = row
+        database.statements = 0
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await call()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+        module.database = original
+        print(
+            f"{endpoint:>32}: {database.statements / repeat:4.1f} statements "
+            f"{elapsed:7.3f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt", type=float, default=0.5, help="round trip in ms")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"rtt={args.rtt} ms repeat={args.repeat}")
+    asyncio.run(run(args.rtt / 1000, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
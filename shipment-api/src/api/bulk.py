@@ -0,0 +1,86 @@
+"""A module containing parsing of bulk ingestion request bodies."""
+
+import codecs
+import csv
+from typing import AsyncIterator
+
+from src.core.domain.location import Location
+from src.core.domain.shipment import PackageIn
+
+CSV_MEDIA_TYPE = "text/csv"
+
+
+async def iterate_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Parse a streamed UTF-8 CSV body with a header row into dicts.
+
+    Rows are parsed as the chunks arrive, so the body is never held in
+    memory as a whole. Quoted fields must not contain line breaks.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body chunks.
+
+    Yields:
+        dict: The columns of each row keyed by the header.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header = None
+    pending = ""
+    finished = False
+    while not finished:
+        try:
+            chunk = await anext(chunks)
+            pending += decoder.decode(chunk)
+        except StopAsyncIteration:
+            pending += decoder.decode(b"", final=True) + "\n"
+            finished = True
+        *lines, pending = pending.split("\n")
+        for row in csv.reader(lines):
+            if not any(row):
+                continue
+            if header is None:
+                header = [column.strip() for column in row]
+            else:
+                yield dict(zip(header, row))
+
+
+def csv_row_to_item(row: dict) -> dict:
+    """Convert a flat CSV row to a nested ShipmentBulkItem payload.
+
+    Location columns are prefixed with `origin_` or `destination_`,
+    coordinates are given as `<prefix>_latitude` and `<prefix>_longitude`
+    and package columns are not prefixed. Empty columns are omitted.
+
+    Args:
+        row (dict): The CSV columns.
+
+    Returns:
+        dict: The ShipmentBulkItem payload.
+    """
+    values = {
+        key: value.strip() for key, value in row.items() if value and value.strip()
+    }
+
+    def location(prefix: str) -> dict:
+        return {
+            field: values[f"{prefix}_{field}"]
+            for field in Location.model_fields
+            if f"{prefix}_{field}" in values
+        }
+
+    def coords(prefix: str) -> tuple | None:
+        latitude = values.get(f"{prefix}_latitude")
+        longitude = values.get(f"{prefix}_longitude")
+        return (latitude, longitude) if latitude and longitude else None
+
+    return {
+        "shipment": {
+            "recipient_email": values.get("recipient_email", ""),
+            "origin": location("origin"),
+            "destination": location("destination"),
+            "origin_coords": coords("origin"),
+            "destination_coords": coords("destination"),
+        },
+        "package": {
+            field: values[field] for field in PackageIn.model_fields if field in values
+        },
+    }
@@ -0,0 +1,73 @@
+"""A module containing custom API responses."""
+
+from typing import Any, AsyncIterator, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_BATCH_SIZE = 100
+
+
+def ndjson_response(items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Stream models as newline-delimited JSON.
+
+    Rows are serialized as they are read, in small batches, so memory usage
+    does not depend on the number of rows and the first bytes are sent
+    immediately.
+
+    Args:
+        items (AsyncIterator[BaseModel]): The models to stream.
+
+    Returns:
+        StreamingResponse: The NDJSON response.
+    """
+
+    async def lines() -> AsyncIterator[str]:
+        batch = []
+        async for item in items:
+            batch.append(item.model_dump_json())
+            if len(batch) == NDJSON_BATCH_SIZE:
+                yield "\n".join(batch) + "\n"
+                batch = []
+        if batch:
+            yield "\n".join(batch) + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _model_fields(value: Any) -> dict:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ModelJSONResponse(JSONResponse):
+    """A JSON response rendered with orjson.
+
+    UUIDs, datetimes, enums and tuples are serialized natively and models
+    are serialized from their field values, so DTOs without custom
+    serializers or aliases produce the same JSON as FastAPI does. Returning
+    it from an endpoint also skips the validation of the result against
+    `response_model`, which stays declared for the OpenAPI schema only.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_model_fields,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def json_response(items: Iterable[BaseModel]) -> ModelJSONResponse:
+    """Serialize DTOs already built by a service as a JSON array.
+
+    Args:
+        items (Iterable[BaseModel]): The DTOs to return.
+
+    Returns:
+        ModelJSONResponse: The JSON response.
+    """
+    return ModelJSONResponse(list(items))
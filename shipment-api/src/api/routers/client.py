@@ -1,8 +1,9 @@
-from typing import Iterable
+from typing import Annotated, Iterable
 from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from src.api.responses import json_response, ndjson_response
 from src.container import Container
 from src.core.domain.user import ClientIn, User, UserIn, UserRole
 from src.core.security import auth
@@ -83,7 +84,12 @@ async def delete_client(
 @router.get("/", response_model=Iterable[ClientDTO])
 @inject
 async def get_all_clients(
+    after: UUID | None = None,
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    stream: bool = False,
     current_user: User = Depends(auth.get_current_user),
     service: IClientService = Depends(Provide[Container.client_service]),
 ) -> Iterable[ClientDTO]:
-    return await service.get_all_clients()
+    if stream:
+        return ndjson_response(service.iterate_clients(after_id=after, limit=limit))
+    return json_response(await service.get_all_clients(after_id=after, limit=limit))
@@ -0,0 +1,152 @@
+"""Router for runtime metrics endpoints."""
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, status
+from src.container import Container
+from src.core.domain.user import User, UserRole
+from src.core.security import auth
+from src.infrastructure.cache.tracking import TrackingCache
+from src.infrastructure.cache.user import UserCache
+from src.infrastructure.cache.workload import WorkloadCounters
+from src.infrastructure.external.email import outbox
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.jobs import archive, stats, workload
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get("/geocoding", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+async def get_geocoding_metrics(
+    current_user: User = Depends(auth.get_current_user),
+) -> dict:
+    """An endpoint for getting geocode cache counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+
+    Returns:
+        dict: Hit, miss and negative hit counters of the geocode cache,
+            coalesced lookup, rate limiter queue and circuit breaker counters
+            and gazetteer counters, if configured.
+    """
+    metrics = {
+        "cache": geopy.cache.stats(),
+        "single_flight": geopy.in_flight.stats(),
+        "rate_limiter": geopy.limiter.stats(),
+        "circuit_breaker": geopy.breaker.stats(),
+    }
+    if geopy.gazetteer:
+        metrics["gazetteer"] = geopy.gazetteer.stats()
+    return metrics
+
+
+@router.get("/tracking", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+@inject
+async def get_tracking_metrics(
+    current_user: User = Depends(auth.get_current_user),
+    tracking_cache: TrackingCache = Depends(Provide[Container.tracking_cache]),
+) -> dict:
+    """An endpoint for getting tracking cache counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+        tracking_cache (TrackingCache): The injected tracking cache.
+
+    Returns:
+        dict: Size, hit and invalidation counters of the tracking cache.
+    """
+    return {"cache": tracking_cache.stats()}
+
+
+@router.get("/auth", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+@inject
+async def get_auth_metrics(
+    current_user: User = Depends(auth.get_current_user),
+    user_cache: UserCache = Depends(Provide[Container.user_cache]),
+) -> dict:
+    """An endpoint for getting authenticated user cache counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+        user_cache (UserCache): The injected user cache.
+
+    Returns:
+        dict: Size, hit ratio and invalidation counters of the user cache.
+    """
+    return {"cache": user_cache.stats()}
+
+
+@router.get("/email", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+async def get_email_metrics(
+    current_user: User = Depends(auth.get_current_user),
+) -> dict:
+    """An endpoint for getting email outbox delivery counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+
+    Returns:
+        dict: Sent and failed delivery counters of the outbox worker.
+    """
+    return {"outbox": outbox.worker.stats()}
+
+
+@router.get("/archive", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+async def get_archive_metrics(
+    current_user: User = Depends(auth.get_current_user),
+) -> dict:
+    """An endpoint for getting shipment archival counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+
+    Returns:
+        dict: Archived shipment and run counters of the archival worker.
+    """
+    return {"worker": archive.worker.stats()}
+
+
+@router.get("/stats", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+async def get_stats_metrics(
+    current_user: User = Depends(auth.get_current_user),
+) -> dict:
+    """An endpoint for getting shipment statistics refresh counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+
+    Returns:
+        dict: Refresh counters of the statistics refresh worker.
+    """
+    return {"worker": stats.worker.stats()}
+
+
+@router.get("/workload", status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.ADMIN])
+@inject
+async def get_workload_metrics(
+    current_user: User = Depends(auth.get_current_user),
+    workload_counters: WorkloadCounters = Depends(
+        Provide[Container.workload_counters]
+    ),
+) -> dict:
+    """An endpoint for getting courier workload counters.
+
+    Args:
+        current_user (User): The currently injected authenticated user.
+        workload_counters (WorkloadCounters): The injected workload counters.
+
+    Returns:
+        dict: Totals, change and drift counters of the workload counters and
+            counters of the reconciliation worker.
+    """
+    return {"counters": workload_counters.stats(), "worker": workload.worker.stats()}
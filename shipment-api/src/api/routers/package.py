@@ -1,15 +1,18 @@
 """Router for package endpoints."""
 
-from typing import Iterable
+from typing import Annotated, Iterable
 from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from src.api.bulk import CSV_MEDIA_TYPE, csv_row_to_item, iterate_csv
+from src.api.responses import json_response, ndjson_response
+from src.config import config
 from src.container import Container
 from src.core.domain.shipment import Package, PackageIn, ShipmentIn
 from src.core.domain.user import User, UserRole
 from src.core.security import auth
-from src.infrastructure.dto.shipmentDTO import PackageDTO
+from src.infrastructure.dto.shipmentDTO import BulkItemResultDTO, PackageDTO
 from src.infrastructure.services.ipackage import IPackageService
 
 router = APIRouter(
@@ -37,6 +40,46 @@ async def create_package_with_shipment(
         raise HTTPException(status_code=400, detail=str(error))
 
 
+@router.post(
+    "/bulk", response_model=list[BulkItemResultDTO], status_code=status.HTTP_200_OK
+)
+@inject
+async def create_packages_with_shipments(
+    request: Request,
+    current_user: User = Depends(auth.get_current_user),
+    service: IPackageService = Depends(Provide[Container.package_service]),
+) -> list[BulkItemResultDTO]:
+    """Bulk endpoint creating packages with shipments.
+
+    Accepts a JSON array of `{"shipment": ShipmentIn, "package": PackageIn}`
+    objects or a streamed `text/csv` body with one flat row per package.
+    Rows are validated and loaded independently; the response holds the
+    shipment id or the error of every row, in the input order.
+    """
+    if request.headers.get("content-type", "").startswith(CSV_MEDIA_TYPE):
+        rows = []
+        async for row in iterate_csv(request.stream()):
+            rows.append(csv_row_to_item(row))
+            if len(rows) > config.BULK_MAX_ROWS:
+                break
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            rows = None
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Expected a JSON array or a text/csv body.",
+            )
+    if len(rows) > config.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {config.BULK_MAX_ROWS} rows per request.",
+        )
+    return await service.add_packages_with_shipments(rows, current_user.id)
+
+
 @router.get("/{package_id}", response_model=PackageDTO)
 @inject
 async def get_package(
@@ -88,7 +131,12 @@ async def delete_package(
 @router.get("/", response_model=Iterable[PackageDTO])
 @inject
 async def get_all_packages(
+    after: Annotated[int | None, Query(ge=0)] = None,
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    stream: bool = False,
     current_user: User = Depends(auth.get_current_user),
     service: IPackageService = Depends(Provide[Container.package_service]),
 ) -> Iterable[PackageDTO]:
-    return await service.get_all_packages()
+    if stream:
+        return ndjson_response(service.iterate_packages(after_id=after, limit=limit))
+    return json_response(await service.get_all_packages(after_id=after, limit=limit))
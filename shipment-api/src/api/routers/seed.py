@@ -1,11 +1,12 @@
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException, status
 from src.container import Container
+from src.core.domain.shipment import CourierDepot
 from src.core.domain.user import User, UserRole
 from src.core.security import auth
 from src.infrastructure.services.ishipment import IShipmentService
 from src.infrastructure.services.iuser import IUserService
-from src.seed.seed_data import SHIPMENTS, USERS
+from src.seed.seed_data import SEED_DEPOT_COORDS, SHIPMENTS, USERS
 
 router = APIRouter(tags=["seed"])
 
@@ -26,8 +27,16 @@ async def seed_data(
         courier = await user_service.get_user_by_email("courier")
         for shipment in SHIPMENTS:
             await shipment_service.add_shipment(shipment, sender.id)
-        for shipment in await shipment_service.get_all_shipments():
-            await shipment_service.assign_shipment_to_courier(shipment.id, courier.id)
+        await shipment_service.assign_automatically(
+            [
+                CourierDepot(
+                    courier_id=courier.id,
+                    coords=SEED_DEPOT_COORDS,
+                    capacity=len(SHIPMENTS),
+                )
+            ],
+            len(SHIPMENTS),
+        )
         return {"message:": "Data seeded."}
     except Exception as e:
         raise HTTPException(
@@ -1,18 +1,28 @@
-from typing import Iterable
+from datetime import date
+from typing import Annotated, Iterable, Literal
 from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from src.api.responses import ModelJSONResponse, json_response, ndjson_response
+from src.config import config
 from src.container import Container
 from src.core.domain.location import Location
 from src.core.domain.shipment import (
+    CourierDepot,
     ShipmentIn,
     ShipmentStatus,
 )
 from src.core.domain.user import User, UserRole
 from src.core.security import auth
+from src.infrastructure.cache.tracking import etag_matches
 from src.infrastructure.dto.shipmentDTO import (
+    AssignmentDTO,
+    CourierWorkloadDTO,
+    RouteDTO,
     ShipmentDTO,
+    ShipmentEventDTO,
+    ShipmentStatsDTO,
     ShipmentWithDistanceDTO,
 )
 from src.infrastructure.services.ishipment import IShipmentService
@@ -57,6 +67,37 @@ async def assign_shipment_to_courier(
     )
 
 
+@router.post(
+    "/assign/auto", response_model=AssignmentDTO, status_code=status.HTTP_200_OK
+)
+@auth.role_required([UserRole.MANAGER, UserRole.ADMIN])
+@inject
+async def assign_automatically(
+    couriers: list[CourierDepot],
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> AssignmentDTO:
+    """An endpoint assigning the oldest unassigned shipments to couriers.
+
+    Each shipment goes to a courier with capacity left, minimizing the total
+    distance from the courier depots to the pickups. Ids which are not
+    couriers are skipped.
+
+    Args:
+        couriers (list[CourierDepot]): The couriers, their depots and
+            optionally capacities, `ASSIGNMENT_COURIER_CAPACITY` by default.
+        limit (int | None): The maximum number of shipments, by default
+            `ASSIGNMENT_BATCH_SIZE`.
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        AssignmentDTO: The assigned and left out shipments.
+    """
+    return await service.assign_automatically(couriers, limit)
+
+
 @router.put(
     "/update_status", response_model=ShipmentDTO, status_code=status.HTTP_200_OK
 )
@@ -65,15 +106,22 @@ async def assign_shipment_to_courier(
 async def update_status(
     shipment_id: int,
     new_status: ShipmentStatus,
+    latitude: Annotated[float | None, Query(ge=-90, le=90)] = None,
+    longitude: Annotated[float | None, Query(ge=-180, le=180)] = None,
     current_user: User = Depends(auth.get_current_user),
     service: IShipmentService = Depends(Provide[Container.shipment_service]),
 ) -> ShipmentDTO:
     """The abstract changing shipment status by provided id in the data storage.
 
+    The change is recorded in the shipment timeline with the current user
+    and, if both are given, the coordinates where it happened.
+
     Args:
         courier_id (int): The id of the courier.
         shipment_id (int): The id of the shipment.
         new_status (ShipmentStatus): The new status.
+        latitude (float | None): The latitude of the change.
+        longitude (float | None): The longitude of the change.
 
     Returns:
         Any | None: The shipment details if exists.
@@ -86,7 +134,10 @@ async def update_status(
                 detail="Shipment not found or not assigned to this courier",
             )
 
-    if shipment := await service.update_status(shipment_id, new_status):
+    coords = (latitude, longitude) if None not in (latitude, longitude) else None
+    if shipment := await service.update_status(
+        shipment_id, new_status, current_user.id, coords
+    ):
         return shipment
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -94,25 +145,137 @@ async def update_status(
     )
 
 
+@router.get(
+    "/timeline/{shipment_id}",
+    response_model=list[ShipmentEventDTO],
+    status_code=status.HTTP_200_OK,
+)
+@auth.role_required([UserRole.COURIER, UserRole.MANAGER, UserRole.ADMIN])
+@inject
+async def get_timeline(
+    shipment_id: int,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> list[ShipmentEventDTO]:
+    """An endpoint for getting the status history of a shipment.
+
+    Args:
+        shipment_id (int): The id of the shipment.
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        list[ShipmentEventDTO]: Status changes in chronological order.
+    """
+    if current_user.role == "courier":
+        shipment = await service.get_shipment_by_id(shipment_id, include_archived=True)
+        if not shipment or shipment.courier_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Shipment not found or not assigned to this courier",
+            )
+
+    events = await service.get_timeline(shipment_id)
+    if events is not None:
+        return json_response(events)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Shipment not found",
+    )
+
+
+@router.get("/stats", response_model=ShipmentStatsDTO, status_code=status.HTTP_200_OK)
+@auth.role_required([UserRole.MANAGER, UserRole.ADMIN])
+@inject
+async def get_stats(
+    since: date | None = None,
+    until: date | None = None,
+    live: bool = False,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> ShipmentStatsDTO:
+    """An endpoint for getting shipment statistics for the dashboard.
+
+    Shipments are counted by status, by courier and per UTC day of creation,
+    with the average pickup-to-delivery time, in the database. Unless `live`
+    is set, the statistics may be up to `SHIPMENT_STATS_REFRESH_INTERVAL`
+    old, see `as_of`.
+
+    Args:
+        since (date | None): The first day of creation, unbounded if None.
+        until (date | None): The last day of creation, unbounded if None.
+        live (bool): Compute the statistics from the shipments.
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        ShipmentStatsDTO: The statistics by status, courier and day.
+    """
+    return ModelJSONResponse(await service.get_stats(since, until, live))
+
+
+@router.get(
+    "/workload",
+    response_model=list[CourierWorkloadDTO],
+    status_code=status.HTTP_200_OK,
+)
+@auth.role_required([UserRole.MANAGER, UserRole.ADMIN])
+@inject
+async def get_workload(
+    courier_id: UUID | None = None,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> Iterable[CourierWorkloadDTO]:
+    """An endpoint for getting the active shipment counts of couriers.
+
+    The counts are kept by each process and reconciled with the database
+    every `WORKLOAD_RECONCILE_INTERVAL`, so writes made through other
+    processes may be missing until then.
+
+    Args:
+        courier_id (UUID | None): The id of the courier, all if None.
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        Iterable[CourierWorkloadDTO]: The workloads, busiest first.
+    """
+    return json_response(service.get_workload(courier_id))
+
+
 @router.get("/check_status", response_model=ShipmentDTO, status_code=status.HTTP_200_OK)
 @inject
 async def check_status(
     shipment_id: int,
     recipient_email: str,
+    include_archived: bool = False,
+    if_none_match: Annotated[str | None, Header()] = None,
     service: IShipmentService = Depends(Provide[Container.shipment_service]),
-) -> ShipmentDTO:
+) -> Response:
     """An endpoint getting shipment by provided id and Recipient email.
 
+    Responses carry an ETag; a request whose `If-None-Match` matches it gets
+    304 Not Modified.
+
     Args:
         shipment_id (int): The id of the shipment.
         recipient_email (int): The recipient_email of the shipment.
+        include_archived (bool): Search archived shipments too.
+        if_none_match (str | None): The ETag of the client copy.
         service (IShipmentService): The injected service dependency.
 
     Returns:
-       ShipmentDTO: The shipment details if exists.
+       Response: The shipment details if exists.
     """
-    if shipment := await service.check_status(shipment_id, recipient_email):
-        return shipment
+    if entry := await service.get_tracking(
+        shipment_id, recipient_email, include_archived
+    ):
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, entry.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            content=entry.body, media_type="application/json", headers=headers
+        )
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Shipment not found or wrong recipient email",
@@ -124,36 +287,51 @@ async def check_status(
 )
 @inject
 async def get_all_shipments(
+    shipment_status: Annotated[ShipmentStatus | None, Query(alias="status")] = None,
+    after: Annotated[int | None, Query(ge=0)] = None,
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    stream: bool = False,
+    include_archived: bool = False,
     current_user: User = Depends(auth.get_current_user),
     service: IShipmentService = Depends(Provide[Container.shipment_service]),
 ) -> Iterable[ShipmentDTO]:
-    """An endpoint for getting all shipments.
+    """An endpoint for getting all shipments visible to the current user.
+
+    Shipments are ordered by id. To get the next page pass the id of the last
+    returned shipment as `after`.
 
     Args:
+        shipment_status (ShipmentStatus | None): The status to filter by.
+        after (int | None): The id of the last shipment of the previous page.
+        limit (int | None): The maximum number of shipments.
+        stream (bool): Stream the page as newline-delimited JSON, all matching
+            shipments if `after` and `limit` are not given.
+        include_archived (bool): List archived shipments too.
         current_user (User): The currently injected authenticated user.
         service (IShipmentService): The injected service dependency.
 
     Returns:
         Iterable[ShipmentDTO]: Shipments collection.
     """
-    if shipments := await service.get_all_shipments():
-        if current_user.role == "admin" or current_user.role == "manager":
-            return shipments
-        if current_user.role == "courier":
-            return [
-                shipment
-                for shipment in shipments
-                if shipment.courier_id == current_user.id
-            ]
-        if current_user.role == "client":
-            return [
-                shipment
-                for shipment in shipments
-                if shipment.sender_id == current_user.id
-                or shipment.recipient_email == current_user.email
-            ]
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, detail="No shipments found."
+    filters = {
+        "statuses": [shipment_status] if shipment_status else None,
+        "include_archived": include_archived,
+    }
+    if current_user.role == UserRole.COURIER:
+        filters["courier_id"] = current_user.id
+    elif current_user.role == UserRole.CLIENT:
+        filters["sender_id"] = current_user.id
+        filters["recipient_email"] = current_user.email
+    elif current_user.role not in (UserRole.ADMIN, UserRole.MANAGER):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No shipments found."
+        )
+    if stream:
+        return ndjson_response(
+            service.iterate_shipments(**filters, after_id=after, limit=limit)
+        )
+    return json_response(
+        await service.get_all_shipments(**filters, after_id=after, limit=limit)
     )
 
 
@@ -215,6 +393,7 @@ async def delete_shipment(
 @inject
 async def sort_by_distance(
     location: Location,
+    limit: Annotated[int | None, Query(gt=0)] = None,
     current_user: User = Depends(auth.get_current_user),
     service: IShipmentService = Depends(Provide[Container.shipment_service]),
 ) -> Iterable[ShipmentWithDistanceDTO] | None:
@@ -222,6 +401,7 @@ async def sort_by_distance(
 
     Args:
         location (Location): Location of courier
+        limit (int | None): Return only the nearest `limit` shipments.
         current_user (User): The currently injected authenticated user.
         service (IShipmentService): The injected service dependency.
 
@@ -229,13 +409,88 @@ async def sort_by_distance(
         Iterable[ShipmentDTO]: Shipments with distance sorted collection.
     """
     try:
-        shipments = await service.sort_by_distance(current_user.id, location)
+        shipments = await service.sort_by_distance(current_user.id, location, limit)
     except ValueError as error:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
         )
     if shipments:
-        return shipments
+        return json_response(shipments)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="No shipments found with this courier.",
+    )
+
+
+@router.get(
+    "/nearby",
+    response_model=Iterable[ShipmentWithDistanceDTO],
+    status_code=status.HTTP_200_OK,
+)
+@auth.role_required([UserRole.ADMIN, UserRole.MANAGER])
+@inject
+async def get_nearby_shipments(
+    latitude: Annotated[float, Query(ge=-90, le=90)],
+    longitude: Annotated[float, Query(ge=-180, le=180)],
+    radius: Annotated[float, Query(gt=0, le=config.NEARBY_MAX_RADIUS)],
+    end: Literal["origin", "destination"] = "origin",
+    shipment_status: Annotated[ShipmentStatus | None, Query(alias="status")] = None,
+    limit: Annotated[int | None, Query(gt=0, le=config.NEARBY_MAX_CANDIDATES)] = None,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> Iterable[ShipmentWithDistanceDTO]:
+    """An endpoint for finding unassigned shipments near a point.
+
+    Args:
+        latitude (float): The latitude of the point.
+        longitude (float): The longitude of the point.
+        radius (float): The search radius in kilometers.
+        end (str): Whether the origin or the destination must be near.
+        shipment_status (ShipmentStatus | None): The status to filter by, the
+            ones waiting for a courier if None.
+        limit (int | None): Return only the nearest `limit` shipments.
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        Iterable[ShipmentWithDistanceDTO]: Shipments sorted by distance.
+    """
+    shipments = await service.get_nearby_shipments(
+        (latitude, longitude),
+        radius,
+        end=end,
+        statuses=[shipment_status] if shipment_status else None,
+        limit=limit,
+    )
+    return json_response(shipments)
+
+
+@router.post("/route", response_model=RouteDTO, status_code=status.HTTP_200_OK)
+@auth.role_required(UserRole.COURIER)
+@inject
+async def plan_route(
+    location: Location,
+    current_user: User = Depends(auth.get_current_user),
+    service: IShipmentService = Depends(Provide[Container.shipment_service]),
+) -> RouteDTO:
+    """An endpoint for planning the visiting order of courier's shipments.
+
+    Args:
+        location (Location): Location of courier
+        current_user (User): The currently injected authenticated user.
+        service (IShipmentService): The injected service dependency.
+
+    Returns:
+        RouteDTO: Ordered pickup and delivery stops with distances in km.
+    """
+    try:
+        route = await service.plan_route(current_user.id, location)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+        )
+    if route:
+        return route
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="No shipments found with this courier.",
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException, status
+from src.api.responses import json_response
 from src.container import Container
 from src.core.domain.user import StaffIn, User, UserIn, UserRole
 from src.core.security import auth
@@ -89,4 +90,4 @@ async def get_all_staff(
     current_user: User = Depends(auth.get_current_user),
     service: IStaffService = Depends(Provide[Container.staff_service]),
 ) -> Iterable[StaffDTO]:
-    return await service.get_all_staff()
+    return json_response(await service.get_all_staff())
@@ -1,8 +1,10 @@
-from typing import Iterable
+from typing import Annotated, Iterable
+from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordRequestForm
+from src.api.responses import json_response, ndjson_response
 from src.container import Container
 from src.core.domain.user import User, UserIn, UserRole, UserUpdate
 from src.core.security import auth
@@ -194,21 +196,33 @@ async def update_user(
 @auth.role_required([UserRole.ADMIN])
 @inject
 async def get_all_users(
+    after: UUID | None = None,
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    stream: bool = False,
     current_user: User = Depends(auth.get_current_user),
     service: IUserService = Depends(Provide[Container.user_service]),
 ) -> Iterable[UserDTO]:
     """The endpoint getting all users.
 
+    Users are ordered by id. To get the next page pass the id of the last
+    returned user as `after`.
+
     Args:
+    after (UUID | None): The id of the last user of the previous page.
+    limit (int | None): The maximum number of users.
+    stream (bool): Stream the page as newline-delimited JSON, all users if
+        `after` and `limit` are not given.
     current_user (User): The currently injected authenticated user.
     service (IUserService): The injected user service.
 
     Returns:
          Iterable[UserDTO]: The user objects DTO details.
     """
+    if stream:
+        return ndjson_response(service.iterate_users(after_id=after, limit=limit))
     try:
-        users = await service.get_all_users()
-        return users
+        users = await service.get_all_users(after_id=after, limit=limit)
+        return json_response(users)
     except ValueError as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(error)
@@ -235,7 +249,7 @@ async def get_users_by_role(
     """
     try:
         users = await service.get_users_by_role(role)
-        return users
+        return json_response(users)
     except ValueError as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(error)
@@ -0,0 +1,46 @@
+"""Column management module.
+
+`metadata.create_all` does not alter existing tables, so columns declared
+after a table was created are added here, on every startup, before the
+indexes which may use them. Only columns without a server-side value
+requirement can be added this way: nullable, with a server default or
+generated. Adding a stored generated column rewrites the table once.
+"""
+
+from sqlalchemy import Connection, inspect
+from sqlalchemy.schema import CreateColumn
+
+from src.db import engine, metadata
+
+
+def create_columns(connection: Connection) -> list[str]:
+    """Add the declared columns missing from existing tables.
+
+    Args:
+        connection (Connection): A synchronous connection.
+
+    Returns:
+        list[str]: The added columns as `table.column`.
+    """
+    inspector = inspect(connection)
+    added = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            name = connection.dialect.identifier_preparer.format_table(table)
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {name} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+async def ensure_columns() -> None:
+    """Add missing columns of the application schema."""
+    async with engine.begin() as conn:
+        added = await conn.run_sync(create_columns)
+    if added:
+        print(f"Added columns: {', '.join(added)}.")
@@ -1,5 +1,6 @@
 """A module providing configuration variables."""
 
+import os
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,7 +26,66 @@ class AppConfig(BaseConfig):
     MAIL_PORT: Optional[int] = None
     MAIL_SERVER: Optional[str] = None
 
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF: float = 30.0
+    EMAIL_OUTBOX_BACKOFF_MAX: float = 3600.0
+    EMAIL_OUTBOX_LEASE: float = 300.0
+
     SECRET_KEY: Optional[str] = None
 
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = os.cpu_count() or 1
+
+    GEOCODER_DOMAIN: str = "nominatim.openstreetmap.org"
+    GEOCODER_SCHEME: str = "https"
+    GEOCODER_TIMEOUT: float = 10.0
+    GEOCODER_MAX_WORKERS: int = 4
+    GEOCODER_FALLBACK: bool = True
+    GEOCODER_RATE: float = 1.0
+    GEOCODER_BURST: int = 1
+    GEOCODER_QUEUE_TIMEOUT: float = 10.0
+    GEOCODER_BULK_QUEUE_TIMEOUT: float = 60.0
+    GEOCODER_BREAKER_THRESHOLD: int = 5
+    GEOCODER_BREAKER_RESET: float = 30.0
+
+    GAZETTEER_PATH: Optional[str] = None
+    GAZETTEER_INDEX_PATH: Optional[str] = None
+
+    GEOCODE_CACHE_SIZE: int = 10_000
+    GEOCODE_CACHE_TTL: int = 7 * 24 * 3600
+    GEOCODE_CACHE_NEGATIVE_TTL: int = 3600
+    GEOCODE_CACHE_PERSISTENT: bool = True
+
+    BULK_MAX_ROWS: int = 50_000
+
+    NEARBY_MAX_RADIUS: float = 100.0
+    NEARBY_MAX_CANDIDATES: int = 1000
+
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    SHIPMENT_ARCHIVE_AFTER_DAYS: int = 90
+    SHIPMENT_ARCHIVE_BATCH_SIZE: int = 1000
+    SHIPMENT_ARCHIVE_INTERVAL: float = 3600.0
+
+    SHIPMENT_STATS_MATERIALIZED: bool = True
+    SHIPMENT_STATS_REFRESH_INTERVAL: float = 300.0
+
+    WORKLOAD_RECONCILE_INTERVAL: float = 60.0
+
+    ROUTE_PLANNER_MAX_WORKERS: int = 2
+    ROUTE_PLANNER_TIME_BUDGET: float = 0.5
+
+    ASSIGNMENT_BATCH_SIZE: int = 10_000
+    ASSIGNMENT_COURIER_CAPACITY: int = 50
+    ASSIGNMENT_TIME_BUDGET: float = 2.0
+
+    TRACKING_CACHE_SIZE: int = 10_000
+    TRACKING_CACHE_TTL: int = 300
+
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: int = 60
+
 
 config = AppConfig()
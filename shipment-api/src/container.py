@@ -1,6 +1,10 @@
 from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Factory, Singleton
 
+from src.config import config
+from src.infrastructure.cache.tracking import TrackingCache
+from src.infrastructure.cache.user import UserCache
+from src.infrastructure.cache.workload import WorkloadCounters
 from src.infrastructure.external.email.email_service import EmailService
 from src.infrastructure.repositories.clientdb import ClientRepository
 from src.infrastructure.repositories.packagedb import PackageRepository
@@ -19,17 +23,34 @@ class Container(DeclarativeContainer):
     
     shipment_repository = Singleton(ShipmentRepository)
 
+    tracking_cache = Singleton(
+        TrackingCache,
+        maxsize=config.TRACKING_CACHE_SIZE,
+        ttl=config.TRACKING_CACHE_TTL,
+    )
+
+    workload_counters = Singleton(WorkloadCounters)
+
     shipment_service = Factory(
         ShipmentService,
         repository=shipment_repository,
         email_service=email_service,
+        tracking_cache=tracking_cache,
+        workload=workload_counters,
     )
 
     user_repository = Singleton(UserRepository)
 
+    user_cache = Singleton(
+        UserCache,
+        maxsize=config.USER_CACHE_SIZE,
+        ttl=config.USER_CACHE_TTL,
+    )
+
     user_service = Factory(
         UserService,
         repository=user_repository,
+        user_cache=user_cache,
     )
 
     staff_repository = Singleton(StaffRepository)
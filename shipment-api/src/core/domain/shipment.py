@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from src.core.domain.location import Location
 
 
@@ -63,6 +63,37 @@ class PackageIn(BaseModel):
     model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
+class ResolvedAddress(BaseModel):
+    """A location resolved to the address and coordinates stored for it"""
+
+    query: str
+    address: str
+    coords: tuple[float, float]
+
+
+class ResolvedShipment(BaseModel):
+    """Shipment input data with both ends resolved"""
+
+    data: ShipmentIn
+    origin: ResolvedAddress
+    destination: ResolvedAddress
+
+
+class CourierDepot(BaseModel):
+    """A courier taking part in automatic assignment, starting from a depot"""
+
+    courier_id: UUID
+    coords: tuple[float, float]
+    capacity: Optional[int] = Field(default=None, ge=0)
+
+
+class ShipmentBulkItem(BaseModel):
+    """An input model of one row of bulk shipment ingestion"""
+
+    shipment: ShipmentIn
+    package: PackageIn
+
+
 class Package(PackageIn):
     """The package model class"""
 
@@ -1,7 +1,7 @@
 """Module containing client repository abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import ClientIn
@@ -57,9 +57,29 @@ class IClientRepository(ABC):
         """
 
     @abstractmethod
-    async def get_all_clients(self) -> Iterable[dict] | None:
-        """Get all clients, joined with user.
+    async def get_all_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[dict] | None:
+        """Get a page of clients ordered by id, joined with user.
+
+        Args:
+            after_id (UUID | None): The id of the last client of the previous page.
+            limit (int | None): The maximum number of clients.
 
         Returns:
             Iterable[dict] | None: The joined client+user dicts.
         """
+
+    @abstractmethod
+    def iterate_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[dict]:
+        """Iterate over clients ordered by id, joined with user.
+
+        Args:
+            after_id (UUID | None): Start after the client with this id.
+            limit (int | None): The maximum number of clients.
+
+        Yields:
+            dict: The joined client+user dict.
+        """
@@ -1,7 +1,7 @@
 """Module containing package repository abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterable
+from typing import Any, AsyncIterator, Iterable
 
 from src.core.domain.shipment import Package, PackageIn
 
@@ -20,6 +20,15 @@ class IPackageRepository(ABC):
             Any | None: The package object if created.
         """
 
+    @abstractmethod
+    async def add_packages(self, packages: list[tuple[int, PackageIn]]) -> None:
+        """Bulk load packages to the data storage.
+
+        Args:
+            packages (list[tuple[int, PackageIn]]): The shipment ids and package
+                input data.
+        """
+
     @abstractmethod
     async def get_package_by_id(self, package_id: int) -> Any | None:
         """Get package by provided id (shipment_id).
@@ -32,13 +41,33 @@ class IPackageRepository(ABC):
         """
 
     @abstractmethod
-    async def get_all_packages(self) -> Iterable[Any]:
+    async def get_all_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> Iterable[Any]:
         """Get all packages from data storage.
 
+        Args:
+            after_id (int | None): The id of the last package of the previous page.
+            limit (int | None): The maximum number of packages.
+
         Returns:
             Iterable[Any]: Packages in the data storage.
         """
 
+    @abstractmethod
+    def iterate_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> AsyncIterator[Any]:
+        """Iterate over packages in data storage ordered by id.
+
+        Args:
+            after_id (int | None): Start after the package with this id.
+            limit (int | None): The maximum number of packages.
+
+        Yields:
+            Any: The package details.
+        """
+
     @abstractmethod
     async def update_package(self, package_id: int, data: Package) -> Any | None:
         """Update package data.
@@ -1,7 +1,8 @@
 """Module containing shipment repository abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, Tuple
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable, Tuple
 from uuid import UUID
 
 from src.core.domain.shipment import (
@@ -9,6 +10,7 @@ from src.core.domain.shipment import (
     ShipmentIn,
     ShipmentStatus,
 )
+from src.spatial import BoundingBox
 
 
 class IShipmentRepository(ABC):
@@ -30,46 +32,221 @@ class IShipmentRepository(ABC):
 
     @abstractmethod
     async def update_status(
-        self, shipment_id: int, new_status: ShipmentStatus
+        self,
+        shipment_id: int,
+        new_status: ShipmentStatus,
+        actor_id: UUID | None = None,
+        coords: Tuple[float, float] | None = None,
     ) -> Shipment | None:
         """The abstract changing shipment status by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
             new_status (ShipmentStatus): The new status.
+            actor_id (UUID | None): The id of the user changing the status.
+            coords (Tuple[float, float] | None): Where the status changed.
 
         Returns:
             Any | None: The shipment details if updated.
         """
 
+    @abstractmethod
+    async def assign_shipments(
+        self, assignments: list[tuple[int, UUID]]
+    ) -> Iterable[Any]:
+        """The abstract assigning a batch of shipments to couriers at once.
+
+        Args:
+            assignments (list[tuple[int, UUID]]): The shipment and courier id
+                pairs.
+
+        Returns:
+            Iterable[Any]: The id, courier_id and status of every assigned
+                shipment.
+        """
+
+    @abstractmethod
+    async def get_courier_workload(self) -> Iterable[Any]:
+        """The abstract counting active shipments per courier and status.
+
+        Returns:
+            Iterable[Any]: The courier_id, status and shipments of every
+                courier and status with active shipments.
+        """
+
+    @abstractmethod
+    async def get_events(
+        self, shipment_id: int, since: datetime, until: datetime
+    ) -> Iterable[Any]:
+        """The abstract getting the status history of a shipment.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            since (datetime): The creation time of the shipment.
+            until (datetime): The last update time of the shipment.
+
+        Returns:
+            Iterable[Any]: The events in chronological order.
+        """
+
+    @abstractmethod
+    async def get_stats(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+        materialized: bool = False,
+    ) -> Iterable[Any]:
+        """The abstract getting shipment statistics aggregated in the data storage.
+
+        Args:
+            since (date | None): The first day of creation, unbounded if None.
+            until (date | None): The last day of creation, unbounded if None.
+            materialized (bool): Whether to read the materialized statistics.
+
+        Returns:
+            Iterable[Any]: Rows with the `dimension` they are grouped by,
+                "status", "courier", "day" or "total", its value, the number
+                of shipments and the average delivery time in seconds.
+        """
+
+    @abstractmethod
+    async def refresh_stats(self) -> None:
+        """The abstract refreshing the materialized shipment statistics."""
+
     @abstractmethod
     async def check_status(
-        self, shipment_id: int, recipient_email: str
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
     ) -> Shipment | None:
         """The abstract getting shipment by provided id and Recipient email.
 
         Args:
             shipment_id (int): The id of the shipment.
             recipient_email (int): The recipient_email of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             Any | None: The shipment details if exists.
         """
 
     @abstractmethod
-    async def get_all_shipments(self) -> Iterable[dict]:
+    async def get_all_shipments(
+        self,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[dict]:
         """The abstract getting all shipments from data storage.
 
+        Args:
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
+
         Returns:
             Iterable[Any]: Aiports in the data storage.
         """
 
     @abstractmethod
-    async def get_shipment_by_id(self, shipment_id: int) -> Shipment | None:
+    async def get_filtered_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[dict]:
+        """The abstract getting shipments matching the filters.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient. Combined with
+                sender_id, shipments sent by or addressed to the client match.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
+
+        Returns:
+            Iterable[Any]: The matching shipments.
+        """
+
+    @abstractmethod
+    async def get_unassigned_shipments_in_box(
+        self,
+        end: str,
+        box: BoundingBox,
+        center: tuple[float, float],
+        limit: int,
+        statuses: Iterable[ShipmentStatus] | None = None,
+    ) -> Iterable[dict]:
+        """The abstract getting unassigned shipments with an end inside a box.
+
+        Args:
+            end (str): "origin" or "destination", the end to locate.
+            box (BoundingBox): The area to search.
+            center (tuple[float, float]): Latitude and longitude to order by
+                distance from.
+            limit (int): The maximum number of shipments.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by,
+                the ones waiting for a courier if None.
+
+        Returns:
+            Iterable[Any]: The matching shipments, nearest first.
+        """
+
+    @abstractmethod
+    def iterate_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        include_archived: bool = False,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """The abstract iterating over shipments matching the filters.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            include_archived (bool): Whether archived shipments are listed too.
+            after_id (int | None): Start after the shipment with this id.
+            limit (int | None): The maximum number of shipments.
+
+        Yields:
+            Any: The matching shipments.
+        """
+
+    @abstractmethod
+    async def get_unassigned_shipments(
+        self, statuses: Iterable[ShipmentStatus], limit: int
+    ) -> Iterable[Any]:
+        """The abstract getting the oldest shipments without a courier.
+
+        Args:
+            statuses (Iterable[ShipmentStatus]): Statuses to filter by.
+            limit (int): The maximum number of shipments.
+
+        Returns:
+            Iterable[Any]: The id, status and origin coordinates of the
+                shipments ordered by id.
+        """
+
+    @abstractmethod
+    async def get_shipment_by_id(
+        self, shipment_id: int, include_archived: bool = False
+    ) -> Shipment | None:
         """The abstract getting shipment by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             Any | None: The shipment details if exists.
@@ -86,6 +263,21 @@ class IShipmentRepository(ABC):
             Any | None: The shipment details if deleted.
         """
 
+    @abstractmethod
+    async def archive_shipments(
+        self, statuses: Iterable[ShipmentStatus], before: datetime, limit: int
+    ) -> list[int]:
+        """The abstract moving terminal shipments to the archive.
+
+        Args:
+            statuses (Iterable[ShipmentStatus]): The terminal statuses.
+            before (datetime): Shipments last updated before are archived.
+            limit (int): The maximum number of shipments moved.
+
+        Returns:
+            list[int]: The ids of the archived shipments.
+        """
+
     @abstractmethod
     async def add_shipment(
         self,
@@ -95,6 +287,8 @@ class IShipmentRepository(ABC):
         sender_id: UUID,
         origin_coords: Tuple,
         destination_coords: Tuple,
+        origin_query: str | None = None,
+        destination_query: str | None = None,
     ) -> Shipment | None:
         """The abstract adding new shipment to the data storage.
 
@@ -105,12 +299,26 @@ class IShipmentRepository(ABC):
             origin (Tuple): The origin coords of the shipment.
             destination (Tuple): The destination coords of the shipment.
             user_id (UUID): UUID of the user(sender)
+            origin_query (str | None): The query the origin was resolved from.
+            destination_query (str | None): The query the destination was
+                resolved from.
 
 
         Returns:
             Any | None: The shipment object if created.
         """
 
+    @abstractmethod
+    async def add_shipments(self, rows: list[dict]) -> list[int]:
+        """The abstract bulk loading shipments to the data storage.
+
+        Args:
+            rows (list[dict]): The shipment column values, one dict per shipment.
+
+        Returns:
+            list[int]: The ids of the shipments, in the order of rows.
+        """
+
     @abstractmethod
     async def update_shipment(
         self,
@@ -121,6 +329,8 @@ class IShipmentRepository(ABC):
         destination: str,
         origin_coords: Tuple,
         destination_coords: Tuple,
+        origin_query: str | None = None,
+        destination_query: str | None = None,
     ) -> Any | None:
         """The abstract updating shipment data.
 
@@ -132,6 +342,9 @@ class IShipmentRepository(ABC):
             destination (str): The destination address of the shipment.
             origin (Tuple): The origin coords of the shipment.
             destination (Tuple): The destination coords of the shipment.
+            origin_query (str | None): The query the origin was resolved from.
+            destination_query (str | None): The query the destination was
+                resolved from.
 
 
 
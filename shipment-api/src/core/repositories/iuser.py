@@ -1,7 +1,7 @@
 """Module containing user repository abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import User, UserIn
@@ -67,13 +67,42 @@ class IUserRepository(ABC):
         """
 
     @abstractmethod
-    async def get_all_users(self) -> Iterable[User] | None:
+    async def update_password(self, user_id: UUID, hashed_password: str) -> None:
+        """The abstract replacing the stored password hash of a user.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            hashed_password (str): The new password hash.
+        """
+
+    @abstractmethod
+    async def get_all_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[User] | None:
         """The abstract getting all users.
 
+        Args:
+            after_id (UUID | None): The id of the last user of the previous page.
+            limit (int | None): The maximum number of users.
+
         Returns:
             Iterable[User] | None: The user objects.
         """
 
+    @abstractmethod
+    def iterate_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[User]:
+        """The abstract iterating over users ordered by id.
+
+        Args:
+            after_id (UUID | None): Start after the user with this id.
+            limit (int | None): The maximum number of users.
+
+        Yields:
+            User: The user objects.
+        """
+
     @abstractmethod
     async def get_users_by_role(self, role) -> Iterable[User]:
         """The method getting user by provided role.
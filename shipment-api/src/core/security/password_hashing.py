@@ -1,7 +1,22 @@
-"""Module containing secure hashing of passwords."""
+"""Module containing secure hashing of passwords.
+
+bcrypt is CPU-bound and releases the GIL, so the coroutine helpers run it
+on a dedicated, bounded thread pool instead of the event loop; hashing then
+scales with the number of cores without blocking other requests.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 import bcrypt
 
+from src.config import config
+
+executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_MAX_WORKERS,
+    thread_name_prefix="password-hashing",
+)
+
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """Verify if provided password matches the stored hashed password.
@@ -25,4 +40,50 @@ def hash_password(password: str) -> str:
     Returns:
         str: A securely hashed version of the input password.
     """
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=config.PASSWORD_HASH_ROUNDS)
+    ).decode("utf-8")
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Check if a stored hash uses another cost factor than configured.
+
+    Args:
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if the hash is a bcrypt hash of a different cost.
+    """
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return False
+    return int(parts[2]) != config.PASSWORD_HASH_ROUNDS
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop.
+
+    Args:
+        password (str): The plain-text password provided by the user.
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if the password match, False otherwise.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, verify_password, password, hashed_password
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop.
+
+    Args:
+        password (str): The plain-text password to be hashed.
+
+    Returns:
+        str: A securely hashed version of the input password.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, hash_password, password)
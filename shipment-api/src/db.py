@@ -17,6 +17,7 @@ from sqlalchemy.sql import func
 from src.config import config
 from src.core.domain.shipment import ShipmentStatus
 from src.core.domain.user import UserRole
+from src.spatial import cell_sql
 
 metadata = sqlalchemy.MetaData()
 
@@ -111,13 +112,19 @@ shipment_table = sqlalchemy.Table(
         "sender_id", sqlalchemy.ForeignKey("users.id", ondelete="SET NULL")
     ),
     sqlalchemy.Column(
-        "recipient_id", sqlalchemy.ForeignKey("users.id", ondelete="SET NULL")
+        "recipient_id",
+        sqlalchemy.ForeignKey("users.id", ondelete="SET NULL"),
+        index=True,
     ),
     sqlalchemy.Column(
         "courier_id", sqlalchemy.ForeignKey("users.id", ondelete="SET NULL")
     ),
-    sqlalchemy.Column("status", Enum(ShipmentStatus, name="shipment_status")),
-    sqlalchemy.Column("recipient_email", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column(
+        "status", Enum(ShipmentStatus, name="shipment_status"), index=True
+    ),
+    sqlalchemy.Column(
+        "recipient_email", sqlalchemy.String, nullable=True, index=True
+    ),
     sqlalchemy.Column(
         "created_at",
         sqlalchemy.DateTime(timezone=True),
@@ -133,10 +140,96 @@ shipment_table = sqlalchemy.Table(
     ),
     sqlalchemy.Column("origin", sqlalchemy.String),
     sqlalchemy.Column("destination", sqlalchemy.String),
+    # Geocoding queries the addresses were resolved from.
+    sqlalchemy.Column("origin_query", sqlalchemy.String),
+    sqlalchemy.Column("destination_query", sqlalchemy.String),
     sqlalchemy.Column("origin_latitude", sqlalchemy.Float),
     sqlalchemy.Column("origin_longitude", sqlalchemy.Float),
     sqlalchemy.Column("destination_latitude", sqlalchemy.Float),
     sqlalchemy.Column("destination_longitude", sqlalchemy.Float),
+    # Grid cells of the coordinates, maintained by the database.
+    sqlalchemy.Column(
+        "origin_cell",
+        sqlalchemy.BigInteger,
+        sqlalchemy.Computed(cell_sql("origin_latitude", "origin_longitude")),
+        index=True,
+    ),
+    sqlalchemy.Column(
+        "destination_cell",
+        sqlalchemy.BigInteger,
+        sqlalchemy.Computed(cell_sql("destination_latitude", "destination_longitude")),
+        index=True,
+    ),
+    # Party filters are paginated by id, so id is part of the key.
+    sqlalchemy.Index("ix_shipments_sender_id_id", "sender_id", "id"),
+    sqlalchemy.Index("ix_shipments_courier_id_id", "courier_id", "id"),
+)
+
+ACTIVE_SHIPMENT_STATUSES = (
+    ShipmentStatus.READY_FOR_PICKUP,
+    ShipmentStatus.PICKED_UP,
+    ShipmentStatus.OUT_FOR_DELIVERY,
+    ShipmentStatus.FAILED_ATTEMPT,
+    ShipmentStatus.RETURNED_TO_SENDER,
+)
+
+# Shipments waiting for a courier to be assigned.
+ASSIGNABLE_SHIPMENT_STATUSES = (
+    ShipmentStatus.PENDING,
+    ShipmentStatus.READY_FOR_PICKUP,
+)
+
+# Shipments counted in the workload of their courier: the active ones and
+# those assigned before they are ready for pickup.
+WORKLOAD_SHIPMENT_STATUSES = (ShipmentStatus.PENDING, *ACTIVE_SHIPMENT_STATUSES)
+
+sqlalchemy.Index(
+    "ix_shipments_courier_workload",
+    shipment_table.c.courier_id,
+    shipment_table.c.status,
+    postgresql_where=shipment_table.c.status.in_(WORKLOAD_SHIPMENT_STATUSES),
+)
+
+# Returned shipments are still on their way back, so they are not terminal.
+TERMINAL_SHIPMENT_STATUSES = (
+    ShipmentStatus.DELIVERED,
+    ShipmentStatus.LOST,
+    ShipmentStatus.DAMAGED,
+)
+
+# Append-only history of shipment statuses, partitioned by month, see
+# `src.partitions`. Events outlive their shipment, so there is no foreign key.
+shipment_event_id_sequence = sqlalchemy.Sequence(
+    "shipment_events_id_seq", metadata=metadata
+)
+
+shipment_event_table = sqlalchemy.Table(
+    "shipment_events",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.BigInteger,
+        shipment_event_id_sequence,
+        primary_key=True,
+        server_default=shipment_event_id_sequence.next_value(),
+    ),
+    sqlalchemy.Column("shipment_id", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column(
+        "status", Enum(ShipmentStatus, name="shipment_status"), nullable=False
+    ),
+    sqlalchemy.Column("actor_id", UUID(as_uuid=True), nullable=True),
+    sqlalchemy.Column("latitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("longitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column(
+        "created_at",
+        sqlalchemy.DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+    ),
+    sqlalchemy.Index(
+        "ix_shipment_events_shipment_id_created_at", "shipment_id", "created_at"
+    ),
+    postgresql_partition_by="RANGE (created_at)",
 )
 
 user_table = sqlalchemy.Table(
@@ -159,6 +252,96 @@ user_table = sqlalchemy.Table(
     ),
 )
 
+# Terminal shipments moved out of `shipments` by the archival job, partitioned
+# by month, see `src.partitions`. The values are copied as they were, so the
+# grid cells are plain columns and there are no foreign keys.
+shipment_archive_table = sqlalchemy.Table(
+    "shipments_archive",
+    metadata,
+    *(
+        sqlalchemy.Column(
+            column.name,
+            column.type,
+            primary_key=column.name in ("id", "created_at"),
+            nullable=column.nullable,
+        )
+        for column in shipment_table.columns
+    ),
+    sqlalchemy.Column(
+        "archived_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    sqlalchemy.Index("ix_shipments_archive_sender_id_id", "sender_id", "id"),
+    sqlalchemy.Index("ix_shipments_archive_courier_id_id", "courier_id", "id"),
+    sqlalchemy.Index("ix_shipments_archive_recipient_email", "recipient_email"),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+package_archive_table = sqlalchemy.Table(
+    "packages_archive",
+    metadata,
+    *(
+        sqlalchemy.Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+        for column in packages_table.columns
+    ),
+)
+
+geocode_cache_table = sqlalchemy.Table(
+    "geocode_cache",
+    metadata,
+    sqlalchemy.Column("query", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("address", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("latitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("longitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column(
+        "created_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    sqlalchemy.Column(
+        "expires_at", sqlalchemy.DateTime(timezone=True), nullable=False
+    ),
+)
+
+email_outbox_table = sqlalchemy.Table(
+    "email_outbox",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("to_email", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("subject", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("body", sqlalchemy.Text, nullable=False),
+    sqlalchemy.Column(
+        "is_html", sqlalchemy.Boolean, nullable=False, server_default=sqlalchemy.false()
+    ),
+    sqlalchemy.Column(
+        "attempts", sqlalchemy.Integer, nullable=False, server_default="0"
+    ),
+    sqlalchemy.Column("last_error", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column(
+        "created_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    sqlalchemy.Column(
+        "next_attempt_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Delivered messages are deleted, so the worker scans pending ones only.
+    sqlalchemy.Index("ix_email_outbox_next_attempt_at", "next_attempt_at"),
+)
+
 
 db_uri = (
     f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
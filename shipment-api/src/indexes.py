@@ -0,0 +1,63 @@
+"""Index management module.
+
+Indexes are declared on the tables in `src.db`. `metadata.create_all` creates
+them only together with a new table, so indexes declared after a table
+already exists are created here, idempotently, on every startup.
+"""
+
+from sqlalchemy import Connection
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from src.db import engine, metadata
+
+
+def declared_indexes() -> list:
+    """Get the indexes declared in the metadata.
+
+    Returns:
+        list: The indexes ordered by table dependency and name.
+    """
+    return [
+        index
+        for table in metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda index: index.name)
+    ]
+
+
+def create_indexes(connection: Connection) -> list[str]:
+    """Create the declared indexes which do not exist yet.
+
+    Args:
+        connection (Connection): A synchronous connection.
+
+    Returns:
+        list[str]: The names of the declared indexes.
+    """
+    names = []
+    for index in declared_indexes():
+        connection.execute(CreateIndex(index, if_not_exists=True))
+        names.append(index.name)
+    return names
+
+
+def drop_indexes(connection: Connection) -> list[str]:
+    """Drop the declared indexes which exist.
+
+    Args:
+        connection (Connection): A synchronous connection.
+
+    Returns:
+        list[str]: The names of the declared indexes.
+    """
+    names = []
+    for index in declared_indexes():
+        connection.execute(DropIndex(index, if_exists=True))
+        names.append(index.name)
+    return names
+
+
+async def ensure_indexes() -> None:
+    """Create missing indexes of the application schema."""
+    async with engine.begin() as conn:
+        names = await conn.run_sync(create_indexes)
+    print(f"Ensured {len(names)} indexes.")
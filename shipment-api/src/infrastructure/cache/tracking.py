@@ -0,0 +1,131 @@
+"""A module containing the cache of public tracking responses.
+
+Entries hold the serialized shipment together with its ETag, so a matching
+`If-None-Match` is answered without a DB round trip. Entries are keyed by
+shipment id and hold the recipient email they were read with; a lookup with
+another email is a miss. Writers invalidate entries through the shipment
+service, while the time-to-live bounds staleness across worker processes.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from src.infrastructure.cache.ttl import MISSING, TTLCache
+
+
+@dataclass(frozen=True)
+class TrackingEntry:
+    """A serialized tracking response."""
+
+    recipient_email: str
+    etag: str
+    body: bytes
+
+
+def make_etag(body: bytes) -> str:
+    """Compute a strong ETag of a response body.
+
+    Args:
+        body (bytes): The serialized response.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def make_entry(recipient_email: str, shipment: BaseModel) -> TrackingEntry:
+    """Serialize a tracking response.
+
+    Args:
+        recipient_email (str): The email of the recipient.
+        shipment (BaseModel): The shipment DTO.
+
+    Returns:
+        TrackingEntry: The serialized response.
+    """
+    body = shipment.model_dump_json().encode()
+    return TrackingEntry(recipient_email, make_etag(body), body)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an `If-None-Match` header against an ETag.
+
+    Args:
+        if_none_match (str | None): The header value.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client copy is still current.
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class TrackingCache:
+    """A class representing the tracking response cache."""
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self._entries: TTLCache[int, TrackingEntry] = TTLCache(maxsize, ttl)
+        self.invalidations = 0
+
+    def get(self, shipment_id: int, recipient_email: str) -> TrackingEntry | None:
+        """Get a cached tracking response.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            recipient_email (str): The email of the recipient.
+
+        Returns:
+            TrackingEntry | None: The cached response if present.
+        """
+        entry = self._entries.get(shipment_id)
+        if entry is MISSING or entry.recipient_email != recipient_email:
+            return None
+        return entry
+
+    def set(
+        self,
+        shipment_id: int,
+        recipient_email: str,
+        shipment: BaseModel,
+        invalidations: int | None = None,
+    ) -> TrackingEntry:
+        """Serialize and store a tracking response.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            recipient_email (str): The email of the recipient.
+            shipment (BaseModel): The shipment DTO.
+            invalidations (int | None): The `invalidations` counter read before
+                the shipment was loaded. If any invalidation happened since,
+                the entry may be stale and is not stored.
+
+        Returns:
+            TrackingEntry: The serialized response.
+        """
+        entry = make_entry(recipient_email, shipment)
+        if invalidations is None or invalidations == self.invalidations:
+            self._entries.set(shipment_id, entry)
+        return entry
+
+    def invalidate(self, shipment_id: int) -> None:
+        """Remove the cached response of a shipment.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+        """
+        self.invalidations += 1
+        self._entries.pop(shipment_id)
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            dict: Size, hit and invalidation counters of the cache.
+        """
+        return {**self._entries.stats(), "invalidations": self.invalidations}
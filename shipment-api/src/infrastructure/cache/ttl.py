@@ -0,0 +1,109 @@
+"""A module containing a bounded in-process cache with expiring entries."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MISSING: Any = object()
+
+
+class TTLCache(Generic[K, V]):
+    """A least-recently-used cache whose entries expire after a time-to-live.
+
+    The cache is meant to be shared by coroutines of a single event loop,
+    so it does not lock.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: Any = MISSING) -> V | Any:
+        """Get a value by key, refreshing its recency.
+
+        Args:
+            key (K): The cache key.
+            default (Any): The value returned if the key is absent or expired.
+
+        Returns:
+            V | Any: The cached value or default.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (K): The cache key.
+            value (V): The value to store.
+            ttl (float | None): Time-to-live in seconds overriding the default.
+        """
+        expires_at = self._timer() + (self._ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        """Remove a key from the cache.
+
+        Args:
+            key (K): The cache key.
+            default (Any): The value returned if the key is absent.
+
+        Returns:
+            V | Any: The removed value or default.
+        """
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else default
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore[arg-type]
+        return entry is not None and entry[0] > self._timer()
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            dict: Size, capacity, hits, misses and hit ratio of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,60 @@
+"""A module containing the cache of authenticated users.
+
+Every authenticated request resolves the user of its token, so the user
+DTOs are kept by id. Writers invalidate entries through the user service,
+while the time-to-live bounds staleness across worker processes.
+"""
+
+from uuid import UUID
+
+from src.infrastructure.cache.ttl import MISSING, TTLCache
+from src.infrastructure.dto.userDTO import UserDTO
+
+
+class UserCache:
+    """A class representing the authenticated user cache."""
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self._entries: TTLCache[UUID, UserDTO] = TTLCache(maxsize, ttl)
+        self.invalidations = 0
+
+    def get(self, user_id: UUID) -> UserDTO | None:
+        """Get a cached user.
+
+        Args:
+            user_id (UUID): UUID of the user.
+
+        Returns:
+            UserDTO | None: The cached user if present.
+        """
+        user = self._entries.get(user_id)
+        return None if user is MISSING else user
+
+    def set(self, user: UserDTO, invalidations: int | None = None) -> None:
+        """Store a user.
+
+        Args:
+            user (UserDTO): The user DTO.
+            invalidations (int | None): The `invalidations` counter read before
+                the user was loaded. If any invalidation happened since, the
+                user may be stale and is not stored.
+        """
+        if invalidations is None or invalidations == self.invalidations:
+            self._entries.set(user.id, user)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Remove a cached user.
+
+        Args:
+            user_id (UUID): UUID of the user.
+        """
+        self.invalidations += 1
+        self._entries.pop(user_id)
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            dict: Size, hit and invalidation counters of the cache.
+        """
+        return {**self._entries.stats(), "invalidations": self.invalidations}
@@ -0,0 +1,168 @@
+"""A module containing the in-process courier workload counters.
+
+The counters hold the number of unfinished shipments of every courier, per
+status, so assigning work does not scan the shipments. Shipments assigned
+while still pending count too, as they take the capacity of the courier. They are loaded from
+the database at startup and then moved by the shipment service after each
+assignment, status change and deletion, with the state before and after the
+write returned by the repository.
+
+Writes made by other worker processes are not seen here, so the counters
+are periodically reconciled against the database, and differences are
+counted as drift. A reconciliation is skipped if a write of this process
+ran while the database was read, as the result could not be told apart
+from drift.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+from uuid import UUID
+
+from src.core.domain.shipment import ShipmentStatus
+from src.db import WORKLOAD_SHIPMENT_STATUSES
+
+# The courier and status of a shipment.
+Assignment = tuple[UUID | None, ShipmentStatus | None]
+
+
+class WorkloadCounters:
+    """A class representing active shipment counters of couriers.
+
+    It is meant to be shared by coroutines of a single event loop, so it does
+    not lock.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[UUID, Counter[ShipmentStatus]] = {}
+        self._writes = 0
+        self._pending = 0
+        self.changes = 0
+        self.reconciliations = 0
+        self.skipped = 0
+        self.drifts = 0
+
+    def load(self, rows: Iterable[tuple[UUID, ShipmentStatus, int]]) -> None:
+        """Replace the counters.
+
+        Args:
+            rows (Iterable[tuple[UUID, ShipmentStatus, int]]): The courier,
+                status and number of active shipments of each group.
+        """
+        counts: dict[UUID, Counter[ShipmentStatus]] = {}
+        for courier_id, status, count in rows:
+            counts.setdefault(courier_id, Counter())[ShipmentStatus(status)] = count
+        self._counts = counts
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Mark a write which will move the counters as in progress."""
+        self._writes += 1
+        self._pending += 1
+        try:
+            yield
+        finally:
+            self._pending -= 1
+
+    def move(self, before: Assignment | None, after: Assignment | None) -> None:
+        """Move a shipment between the counters.
+
+        Args:
+            before (Assignment | None): The courier and status before the
+                write, None if the shipment did not exist.
+            after (Assignment | None): The courier and status after the write,
+                None if the shipment was deleted.
+        """
+        if before == after:
+            return
+        self.changes += 1
+        for assignment, delta in ((before, -1), (after, 1)):
+            if assignment is None:
+                continue
+            courier_id, status = assignment
+            if courier_id is None or status is None:
+                continue
+            status = ShipmentStatus(status)
+            if status not in WORKLOAD_SHIPMENT_STATUSES:
+                continue
+            counts = self._counts.setdefault(courier_id, Counter())
+            counts[status] += delta
+            if counts[status] <= 0:
+                del counts[status]
+            if not counts:
+                del self._counts[courier_id]
+
+    def get(self, courier_id: UUID) -> dict[ShipmentStatus, int]:
+        """Get the active shipment counts of a courier.
+
+        Args:
+            courier_id (UUID): The id of the courier.
+
+        Returns:
+            dict[ShipmentStatus, int]: The number of shipments per status.
+        """
+        return dict(self._counts.get(courier_id, {}))
+
+    def snapshot(self) -> dict[UUID, dict[ShipmentStatus, int]]:
+        """Get the active shipment counts of all couriers with any.
+
+        Returns:
+            dict[UUID, dict[ShipmentStatus, int]]: The counts per courier.
+        """
+        return {courier_id: dict(counts) for courier_id, counts in self._counts.items()}
+
+    def checkpoint(self) -> int | None:
+        """Mark the start of a database read for `reconcile`.
+
+        Returns:
+            int | None: The checkpoint, None if a write is in progress.
+        """
+        return None if self._pending else self._writes
+
+    def reconcile(
+        self,
+        rows: Iterable[tuple[UUID, ShipmentStatus, int]],
+        checkpoint: int | None,
+    ) -> dict[UUID, dict[ShipmentStatus, int]] | None:
+        """Replace the counters with the database counts, measuring drift.
+
+        Args:
+            rows (Iterable[tuple[UUID, ShipmentStatus, int]]): The database
+                counts, read after `checkpoint`.
+            checkpoint (int | None): The checkpoint taken before the read.
+
+        Returns:
+            dict[UUID, dict[ShipmentStatus, int]] | None: The database minus
+                the counted number of shipments of every status which
+                differed, None if skipped.
+        """
+        if checkpoint is None or checkpoint != self._writes or self._pending:
+            self.skipped += 1
+            return None
+        counted = self._counts
+        self.load(rows)
+        drift = {}
+        for courier_id in counted.keys() | self._counts.keys():
+            difference = Counter(self._counts.get(courier_id, {}))
+            difference.subtract(counted.get(courier_id, {}))
+            if changed := {status: n for status, n in difference.items() if n}:
+                drift[courier_id] = changed
+        self.reconciliations += 1
+        self.drifts += len(drift)
+        return drift
+
+    def stats(self) -> dict:
+        """Get counter statistics.
+
+        Returns:
+            dict: Courier and shipment totals, applied changes and
+                reconciliation, skip and drifted courier counters.
+        """
+        return {
+            "couriers": len(self._counts),
+            "shipments": sum(sum(counts.values()) for counts in self._counts.values()),
+            "changes": self.changes,
+            "reconciliations": self.reconciliations,
+            "skipped": self.skipped,
+            "drifts": self.drifts,
+        }
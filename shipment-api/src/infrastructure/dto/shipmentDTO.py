@@ -1,7 +1,7 @@
 """A module containing DTO models for output shipments."""
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Iterable, Literal, Optional, TypeVar
 from uuid import UUID
 
 from asyncpg import Record  # type: ignore
@@ -9,6 +9,35 @@ from pydantic import BaseModel, ConfigDict
 
 from src.core.domain.shipment import ShipmentStatus
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _construct(model: type[ModelT], values: dict) -> ModelT:
+    """Create a model instance from trusted values, skipping validation.
+
+    Rows read by the repositories already have the types of the DTO fields,
+    so validating them again only costs CPU on large listings. Unlike
+    `BaseModel.model_construct`, which in pydantic 2 still walks every field
+    for aliases and defaults and is slower than validating, this only sets
+    the instance state. `values` must contain every field of `model`, and
+    every DTO built here has a test that it round-trips through
+    `model_dump()` and `model_dump_json()`. It is meant only for the large
+    listing DTOs; anything else goes through the regular constructor.
+
+    Args:
+        model (type[ModelT]): The model class.
+        values (dict): The values of all fields.
+
+    Returns:
+        ModelT: The model instance.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
 
 class ShipmentDTO(BaseModel):
     """A model representing DTO for shipment data."""
@@ -39,31 +68,183 @@ class ShipmentDTO(BaseModel):
 
     @classmethod
     def from_record(cls, record: Record) -> "ShipmentDTO":
-        record_dict = dict(record)
+        """Build the DTO from a repository record without validation.
+
+        Args:
+            record (Record): A shipment row of our own typed schema.
+
+        Returns:
+            ShipmentDTO: The shipment DTO.
+        """
+        values = dict(record)
+
+        return _construct(
+            cls,
+            {
+                "id": values["id"],
+                "sender_id": values.get("sender_id"),
+                "recipient_id": values.get("recipient_id"),
+                "courier_id": values.get("courier_id"),
+                "sender_fullname": values.get("sender_fullname"),
+                "recipient_fullname": values.get("recipient_fullname"),
+                "recipient_email": values.get("recipient_email"),
+                "status": ShipmentStatus(values["status"]).value,
+                "origin": values["origin"],
+                "destination": values["destination"],
+                "origin_coords": (
+                    values["origin_latitude"],
+                    values["origin_longitude"],
+                ),
+                "destination_coords": (
+                    values["destination_latitude"],
+                    values["destination_longitude"],
+                ),
+                "origin_distance": values.get("origin_distance"),
+                "destination_distance": values.get("destination_distance"),
+                "created_at": values["created_at"],
+                "last_updated": values["last_updated"],
+            },
+        )
+
+
+class ShipmentEventDTO(BaseModel):
+    """A model representing DTO for one status change of a shipment."""
+
+    status: ShipmentStatus
+    actor_id: Optional[UUID]
+    coords: Optional[tuple]
+    created_at: datetime
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    @classmethod
+    def from_record(cls, record: Record) -> "ShipmentEventDTO":
+        """Build the DTO from a repository record.
+
+        Args:
+            record (Record): A shipment event row.
+
+        Returns:
+            ShipmentEventDTO: The shipment event DTO.
+        """
+        coords = (record["latitude"], record["longitude"])
 
         return cls(
-            id=record_dict.pop("id"),
-            courier_id=record_dict.pop("courier_id", None),
-            recipient_id=record_dict.pop("recipient_id", None),
-            sender_fullname=record_dict.pop("sender_fullname", None),
-            recipient_fullname=record_dict.pop("recipient_fullname", None),
-            recipient_email=record_dict.pop("recipient_email", None),
-            sender_id=record_dict.pop("sender_id", None),
-            status=record_dict.pop("status"),
-            origin=record_dict.pop("origin"),
-            destination=record_dict.pop("destination"),
-            origin_coords=(
-                record_dict.pop("origin_latitude"),
-                record_dict.pop("origin_longitude"),
-            ),
-            destination_coords=(
-                record_dict.pop("destination_latitude"),
-                record_dict.pop("destination_longitude"),
-            ),
-            origin_distance=record_dict.pop("origin_distance", None),
-            destination_distance=record_dict.pop("destination_distance", None),
-            created_at=record_dict.pop("created_at"),
-            last_updated=record_dict.pop("last_updated"),
+            status=record["status"],
+            actor_id=record["actor_id"],
+            coords=None if None in coords else coords,
+            created_at=record["created_at"],
+        )
+
+
+class CourierStatsDTO(BaseModel):
+    """A model representing DTO for shipment statistics of one courier."""
+
+    courier_id: Optional[UUID]
+    shipments: int
+    average_delivery_seconds: Optional[float]
+
+
+class DailyStatsDTO(BaseModel):
+    """A model representing DTO for shipment statistics of one day."""
+
+    day: date
+    shipments: int
+
+
+class ShipmentStatsDTO(BaseModel):
+    """A model representing DTO for aggregated shipment statistics."""
+
+    since: Optional[date]
+    until: Optional[date]
+    as_of: Optional[datetime]
+    shipments: int
+    average_delivery_seconds: Optional[float]
+    by_status: dict[str, int]
+    by_courier: list[CourierStatsDTO]
+    by_day: list[DailyStatsDTO]
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Record],
+        since: date | None,
+        until: date | None,
+        as_of: datetime | None,
+    ) -> "ShipmentStatsDTO":
+        """Build the DTO from grouped repository records.
+
+        Args:
+            records (Iterable[Record]): Statistics rows, grouped by the
+                dimension they name.
+            since (date | None): The first day of creation, unbounded if None.
+            until (date | None): The last day of creation, unbounded if None.
+            as_of (datetime | None): When materialized statistics were last
+                refreshed, None if computed live.
+
+        Returns:
+            ShipmentStatsDTO: The shipment statistics DTO.
+        """
+        values = {
+            "since": since,
+            "until": until,
+            "as_of": as_of,
+            "shipments": 0,
+            "average_delivery_seconds": None,
+            "by_status": {},
+            "by_courier": [],
+            "by_day": [],
+        }
+        for record in records:
+            if record["dimension"] == "status":
+                status = ShipmentStatus(record["status"]).value
+                values["by_status"][status] = record["shipments"]
+            elif record["dimension"] == "courier":
+                values["by_courier"].append(
+                    CourierStatsDTO(
+                        courier_id=record["courier_id"],
+                        shipments=record["shipments"],
+                        average_delivery_seconds=record["average_delivery_seconds"],
+                    )
+                )
+            elif record["dimension"] == "day":
+                values["by_day"].append(
+                    DailyStatsDTO(day=record["day"], shipments=record["shipments"])
+                )
+            else:
+                # Sums over no rows are NULL.
+                values["shipments"] = record["shipments"] or 0
+                values["average_delivery_seconds"] = record[
+                    "average_delivery_seconds"
+                ]
+        values["by_day"].sort(key=lambda stats: stats.day)
+        return cls(**values)
+
+
+class CourierWorkloadDTO(BaseModel):
+    """A model representing DTO for active shipments of one courier."""
+
+    courier_id: UUID
+    active: int
+    by_status: dict[ShipmentStatus, int]
+
+    @classmethod
+    def from_counts(
+        cls, courier_id: UUID, counts: dict[ShipmentStatus, int]
+    ) -> "CourierWorkloadDTO":
+        """A method building the DTO from workload counters.
+
+        Args:
+            courier_id (UUID): The id of the courier.
+            counts (dict[ShipmentStatus, int]): The shipments per status.
+
+        Returns:
+            CourierWorkloadDTO: The DTO of the courier workload.
+        """
+        return cls(
+            courier_id=courier_id,
+            active=sum(counts.values()),
+            by_status=counts,
         )
 
 
@@ -76,6 +257,25 @@ class ShipmentWithDistanceDTO(ShipmentDTO):
     destination_distance: Optional[float] = None
 
 
+class RouteStopDTO(BaseModel):
+    """A model representing DTO for one stop of a courier route."""
+
+    shipment_id: int
+    action: Literal["pickup", "delivery"]
+    address: str
+    coords: tuple
+    distance: float
+
+
+class RouteDTO(BaseModel):
+    """A model representing DTO for a planned courier route."""
+
+    stops: list[RouteStopDTO]
+    total_distance: float
+    converged: bool
+    unrouted: list[int] = []
+
+
 class PackageDTO(BaseModel):
     """A model representing DTO for package data."""
 
@@ -102,21 +302,57 @@ class PackageDTO(BaseModel):
 
     @classmethod
     def from_record(cls, record: Record) -> "PackageDTO":
-        record_dict = dict(record)
+        """Build the DTO from a repository record without validation.
 
-        return cls(
-            id=record_dict.pop("id"),
-            weight=record_dict.pop("weight"),
-            length=record_dict.pop("length"),
-            width=record_dict.pop("width"),
-            height=record_dict.pop("height"),
-            fragile=record_dict.pop("fragile"),
-            created_at=record_dict.pop("created_at"),
-            last_updated=record_dict.pop("last_updated"),
-            pickup_scheduled_date=record_dict.pop("pickup_scheduled_date"),
-            pickup_actual_date=record_dict.pop("pickup_actual_date"),
-            delivery_scheduled_date=record_dict.pop("delivery_scheduled_date"),
-            delivery_actual_date=record_dict.pop("delivery_actual_date"),
-            cancelled_at=record_dict.pop("cancelled_at"),
-            note=record_dict.pop("note", None),
+        Args:
+            record (Record): A package row of our own typed schema.
+
+        Returns:
+            PackageDTO: The package DTO.
+        """
+        values = dict(record)
+
+        return _construct(
+            cls,
+            {
+                "id": values["id"],
+                "weight": values["weight"],
+                "length": values["length"],
+                "width": values["width"],
+                "height": values["height"],
+                "fragile": values["fragile"],
+                "created_at": values["created_at"],
+                "last_updated": values["last_updated"],
+                "pickup_scheduled_date": values["pickup_scheduled_date"],
+                "pickup_actual_date": values["pickup_actual_date"],
+                "delivery_scheduled_date": values["delivery_scheduled_date"],
+                "delivery_actual_date": values["delivery_actual_date"],
+                "cancelled_at": values["cancelled_at"],
+                "note": values.get("note"),
+            },
         )
+
+
+class AssignedShipmentDTO(BaseModel):
+    """A model representing DTO for one automatically assigned shipment."""
+
+    shipment_id: int
+    courier_id: UUID
+    distance: float
+
+
+class AssignmentDTO(BaseModel):
+    """A model representing DTO for a batch of automatic assignments."""
+
+    assigned: list[AssignedShipmentDTO]
+    unassigned: list[int]
+    total_distance: float
+    converged: bool
+
+
+class BulkItemResultDTO(BaseModel):
+    """A model representing DTO for the result of one bulk ingestion row."""
+
+    index: int
+    shipment_id: Optional[int] = None
+    error: Optional[str] = None
@@ -1,40 +1,33 @@
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Optional
+from typing import Iterable
 
 from src.config import config
+from src.infrastructure.external.email import outbox
 
 
 class EmailService:
     """Serwis do wysyłania emaili przez SMTP"""
 
     def __init__(self):
-        self.smtp_server = config.MAIL_SERVER
-        self.smtp_port = config.MAIL_PORT
         self.from_email = config.MAIL_FROM
 
     async def send_email(
         self, to_email: str, subject: str, body: str, is_html: bool = False
     ) -> bool:
-        try:
-            msg = MIMEMultipart()
-            msg["From"] = self.from_email
-            msg["To"] = to_email
-            msg["Subject"] = subject
+        """Queue an email in the outbox for background delivery.
 
-            mime_type = "html" if is_html else "plain"
-            msg.attach(MIMEText(body, mime_type))
+        Called inside a transaction, the email is queued only if it commits.
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                text = msg.as_string()
-                server.sendmail(self.from_email, to_email, text)
+        Args:
+            to_email (str): The recipient address.
+            subject (str): The subject of the email.
+            body (str): The body of the email.
+            is_html (bool): Whether the body is HTML.
 
-            return True
-
-        except Exception as e:
-            print(f"Błąd wysyłania emaila: {e}")
-            return False
+        Returns:
+            bool: True once the email is queued.
+        """
+        await outbox.enqueue(to_email, subject, body, is_html)
+        return True
 
     async def send_welcome_email(
         self, user_email: str, first_name: str, address: str
@@ -143,6 +136,27 @@ class EmailService:
         self, recipient_email: str, shipment_id: int
     ) -> bool:
         """Wysyła powiadomienie do odbiorcy o nadaniu paczki"""
+        subject, body = self.package_created_message(recipient_email, shipment_id)
+        return await self.send_email(recipient_email, subject, body, is_html=True)
+
+    async def send_package_created_emails(
+        self, recipients: Iterable[tuple[str, int]]
+    ) -> None:
+        """Queue package-created notifications for many shipments at once.
+
+        Args:
+            recipients (Iterable[tuple[str, int]]): The recipient email and
+                shipment id of each notification.
+        """
+        await outbox.enqueue_many(
+            (email, *self.package_created_message(email, shipment_id), True)
+            for email, shipment_id in recipients
+        )
+
+    def package_created_message(
+        self, recipient_email: str, shipment_id: int
+    ) -> tuple[str, str]:
+        """Buduje temat i treść powiadomienia o nadaniu paczki"""
         subject = "Powiadomienie: Nadano Twoją przesyłkę"
 
         body = f"""
@@ -181,4 +195,4 @@ class EmailService:
         </html>
         """
 
-        return await self.send_email(recipient_email, subject, body, is_html=True)
+        return subject, body
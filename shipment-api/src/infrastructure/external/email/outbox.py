@@ -0,0 +1,349 @@
+"""A module containing the email outbox and its delivery worker.
+
+Emails are not sent inside requests. They are inserted into the
+`email_outbox` table, in the transaction of the change they announce, and a
+background worker delivers them in batches over one persistent SMTP
+connection. Failed deliveries are retried with exponential backoff.
+
+Rows are claimed with `FOR UPDATE SKIP LOCKED` by a single statement which
+leases them, moving their next attempt past the lease, so several
+application workers can drain the same outbox and no transaction is held
+while sending. A batch not finished within the lease, for example because
+its worker died, is claimed again, so messages are delivered at least once.
+Queued messages are announced with `pg_notify`, which Postgres delivers
+only when their transaction commits, and wake every listening worker up.
+
+Delivery can be tried against the
+`mailhog` SMTP sink from docker-compose (MAIL_SERVER=localhost,
+MAIL_PORT=1025); delivered messages show up at http://localhost:8025.
+"""
+
+import asyncio
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Iterable
+
+from sqlalchemy import delete, func, select, update
+
+from src.config import config
+from src.db import database, email_outbox_table
+
+NOTIFY_CHANNEL = "email_outbox"
+
+
+def build_message(
+    from_email: str, to_email: str, subject: str, body: str, is_html: bool
+) -> str:
+    """Build a MIME message.
+
+    Args:
+        from_email (str): The sender address.
+        to_email (str): The recipient address.
+        subject (str): The subject of the message.
+        body (str): The body of the message.
+        is_html (bool): Whether the body is HTML.
+
+    Returns:
+        str: The serialized message.
+    """
+    msg = MIMEMultipart()
+    msg["From"] = from_email
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "html" if is_html else "plain"))
+    return msg.as_string()
+
+
+class SMTPConnection:
+    """A persistent SMTP connection, reopened when the server drops it.
+
+    smtplib is blocking and not thread-safe, so the connection is used from
+    a single-thread executor only.
+    """
+
+    def __init__(
+        self,
+        host: str | None,
+        port: int | None,
+        factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._factory = factory
+        self._smtp: smtplib.SMTP | None = None
+
+    def send(self, from_email: str, to_email: str, message: str) -> None:
+        """Send a message, reconnecting once if the connection is stale.
+
+        Args:
+            from_email (str): The sender address.
+            to_email (str): The recipient address.
+            message (str): The serialized message.
+        """
+        try:
+            self._connection().sendmail(from_email, to_email, message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self.close()
+            self._connection().sendmail(from_email, to_email, message)
+
+    def close(self) -> None:
+        """Close the connection if open."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            self._smtp = self._factory(self._host, self._port)
+        return self._smtp
+
+
+class OutboxWorker:
+    """A class representing the background outbox delivery worker."""
+
+    def __init__(
+        self,
+        connection: SMTPConnection,
+        from_email: str | None,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        backoff: float,
+        backoff_max: float,
+        lease: float,
+    ) -> None:
+        self._connection = connection
+        self._from_email = from_email
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._lease = lease
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.failed = 0
+
+    def notify(self) -> None:
+        """Wake the worker up when new messages were queued."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the worker and close the SMTP connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._connection.close
+        )
+
+    async def run(self) -> None:
+        """Drain the outbox until cancelled.
+
+        The worker listens for queued messages on its own connection and
+        polls every `poll_interval` as well, to pick up retries and expired
+        leases.
+        """
+        async with database.connection() as connection:
+            listener = connection.raw_connection
+            try:
+                await listener.add_listener(NOTIFY_CHANNEL, self._notified)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Email outbox listening failed, polling only: {e}")
+            try:
+                await self._poll()
+            finally:
+                await listener.remove_listener(NOTIFY_CHANNEL, self._notified)
+
+    async def drain(self) -> int:
+        """Deliver one batch of due messages.
+
+        The batch is claimed first, then sent outside any transaction.
+        Delivered messages are deleted; failed ones are rescheduled with
+        exponential backoff until `max_attempts` is reached.
+
+        Returns:
+            int: The number of claimed messages.
+        """
+        loop = asyncio.get_running_loop()
+        rows = await self.claim()
+        delivered = []
+        for row in rows:
+            message = build_message(
+                self._from_email,
+                row["to_email"],
+                row["subject"],
+                row["body"],
+                row["is_html"],
+            )
+            try:
+                await loop.run_in_executor(
+                    self._executor,
+                    self._connection.send,
+                    self._from_email,
+                    row["to_email"],
+                    message,
+                )
+            except (smtplib.SMTPException, OSError) as e:
+                self.failed += 1
+                await self._reschedule(row["id"], row["attempts"] + 1, str(e))
+            else:
+                delivered.append(row["id"])
+        if delivered:
+            self.sent += len(delivered)
+            await database.execute(
+                delete(email_outbox_table).where(email_outbox_table.c.id.in_(delivered))
+            )
+        return len(rows)
+
+    async def claim(self) -> list:
+        """Lease a batch of due messages.
+
+        Returns:
+            list: The claimed outbox rows, oldest first.
+        """
+        now = datetime.now(timezone.utc)
+        due = (
+            select(email_outbox_table.c.id)
+            .where(
+                (email_outbox_table.c.next_attempt_at <= now)
+                & (email_outbox_table.c.attempts < self._max_attempts)
+            )
+            .order_by(email_outbox_table.c.next_attempt_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(email_outbox_table)
+            .where(email_outbox_table.c.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=now + timedelta(seconds=self._lease))
+            .returning(*email_outbox_table.c)
+        )
+        rows = await database.fetch_all(query)
+        return sorted(rows, key=lambda row: row["id"])
+
+    def backoff(self, attempts: int) -> float:
+        """Get the delay before the next delivery attempt.
+
+        Args:
+            attempts (int): The number of failed attempts so far.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return min(self._backoff * 2 ** (attempts - 1), self._backoff_max)
+
+    def stats(self) -> dict:
+        """Get worker counters.
+
+        Returns:
+            dict: Sent and failed delivery counters of this process.
+        """
+        return {"sent": self.sent, "failed": self.failed}
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain()
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Email outbox delivery failed: {e}")
+                claimed = 0
+            if claimed < self._batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def _notified(self, *_) -> None:
+        self.notify()
+
+    async def _reschedule(self, message_id: int, attempts: int, error: str) -> None:
+        next_attempt_at = datetime.now(timezone.utc) + timedelta(
+            seconds=self.backoff(attempts)
+        )
+        await database.execute(
+            update(email_outbox_table)
+            .where(email_outbox_table.c.id == message_id)
+            .values(
+                attempts=attempts,
+                last_error=error[:500],
+                next_attempt_at=next_attempt_at,
+            )
+        )
+
+
+worker = OutboxWorker(
+    SMTPConnection(config.MAIL_SERVER, config.MAIL_PORT),
+    from_email=config.MAIL_FROM,
+    batch_size=config.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=config.EMAIL_OUTBOX_POLL_INTERVAL,
+    max_attempts=config.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    backoff=config.EMAIL_OUTBOX_BACKOFF,
+    backoff_max=config.EMAIL_OUTBOX_BACKOFF_MAX,
+    lease=config.EMAIL_OUTBOX_LEASE,
+)
+
+
+async def enqueue(to_email: str, subject: str, body: str, is_html: bool) -> None:
+    """Queue an email in the outbox.
+
+    Called inside a transaction, the message is committed or rolled back
+    together with it, and the workers are woken up once it commits.
+
+    Args:
+        to_email (str): The recipient address.
+        subject (str): The subject of the message.
+        body (str): The body of the message.
+        is_html (bool): Whether the body is HTML.
+    """
+    await database.execute(
+        email_outbox_table.insert().values(
+            to_email=to_email, subject=subject, body=body, is_html=is_html
+        )
+    )
+    await _announce()
+
+
+async def enqueue_many(messages: Iterable[tuple[str, str, str, bool]]) -> None:
+    """Queue many emails in the outbox with a single COPY.
+
+    Must be called inside a transaction. The workers are woken up once it
+    commits.
+
+    Args:
+        messages (Iterable[tuple[str, str, str, bool]]): The recipient, subject,
+            body and is_html flag of each message.
+    """
+    records = list(messages)
+    if not records:
+        return
+    connection = database.connection().raw_connection
+    await connection.copy_records_to_table(
+        email_outbox_table.name,
+        records=records,
+        columns=["to_email", "subject", "body", "is_html"],
+    )
+    await _announce()
+
+
+async def _announce() -> None:
+    # Postgres delivers notifications at commit, and drops them on rollback.
+    await database.execute(select(func.pg_notify(NOTIFY_CHANNEL, "")))
@@ -0,0 +1,109 @@
+"""A module containing the circuit breaker of the remote geocoder.
+
+After `threshold` consecutive failures the circuit opens and calls fail
+immediately for `reset_timeout` seconds instead of waiting for a provider
+which is down. Then a single trial call is let through (half-open). Its
+success closes the circuit and its failure opens it again.
+"""
+
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from geopy.exc import GeocoderUnavailable
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """A class representing a consecutive failure circuit breaker.
+
+    It is meant to be shared by coroutines of a single event loop, so it does
+    not lock.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        reset_timeout: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._timer = timer
+        self._opened_at = 0.0
+        self._trial = False
+        self.state = CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def check(self) -> None:
+        """Fail fast if the circuit is open.
+
+        Raises:
+            GeocoderUnavailable: If calls are being rejected.
+        """
+        waiting = self.state == OPEN and not self._reset_due()
+        if waiting or (self.state == HALF_OPEN and self._trial):
+            self.rejected += 1
+            raise GeocoderUnavailable("Geocoder circuit is open")
+
+    async def call(self, function: Callable[[], Awaitable[T]]) -> T:
+        """Make a call through the circuit.
+
+        Args:
+            function (Callable[[], Awaitable[T]]): The call to make.
+
+        Raises:
+            GeocoderUnavailable: If the circuit is open.
+            Exception: The exception raised by the call.
+
+        Returns:
+            T: The result of the call.
+        """
+        self.check()
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+        trial = self.state == HALF_OPEN
+        if trial:
+            self._trial = True
+        try:
+            result = await function()
+        except Exception:
+            self._failure(trial)
+            raise
+        finally:
+            if trial:
+                self._trial = False
+        self.state = CLOSED
+        self.failures = 0
+        return result
+
+    def stats(self) -> dict:
+        """Get circuit counters.
+
+        Returns:
+            dict: The state and consecutive failure, rejection and opening
+                counters.
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+    def _reset_due(self) -> bool:
+        return self._timer() - self._opened_at >= self._reset_timeout
+
+    def _failure(self, trial: bool) -> None:
+        self.failures += 1
+        if trial or self.failures >= self._threshold:
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self._opened_at = self._timer()
@@ -0,0 +1,181 @@
+"""A module containing the two-tier geocode cache.
+
+Lookups are served by an in-process LRU first and by the persistent
+`geocode_cache` table second. Queries which cannot be geocoded are cached as
+well (negative caching), with a shorter time-to-live.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db import database, geocode_cache_table
+from src.infrastructure.cache.ttl import MISSING, TTLCache
+
+
+@dataclass(frozen=True)
+class GeocodeResult:
+    """A geocoded address with its coordinates."""
+
+    address: str
+    latitude: float
+    longitude: float
+
+    @property
+    def coords(self) -> tuple[float, float]:
+        """tuple[float, float]: A tuple of (latitude, longitude)."""
+        return (self.latitude, self.longitude)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a location query to a cache key.
+
+    Args:
+        query (str): A free-form location query.
+
+    Returns:
+        str: The case-folded query with separators collapsed to single spaces.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"[\s,;]+", " ", text).strip()
+
+
+class GeocodeCache:
+    """A class representing the in-memory and persistent geocode cache."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        negative_ttl: int,
+        persistent: bool = True,
+    ) -> None:
+        self._memory: TTLCache[str, GeocodeResult | None] = TTLCache(maxsize, ttl)
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._persistent = persistent
+        self.persistent_hits = 0
+        self.negative_hits = 0
+
+    async def get(self, query: str) -> GeocodeResult | None | Any:
+        """Get a cached geocode result.
+
+        Args:
+            query (str): A free-form location query.
+
+        Returns:
+            GeocodeResult | None | Any: The cached result, None for a cached
+                "not found" or MISSING if the query is not cached.
+        """
+        key = normalize_query(query)
+        result = self._memory.get(key)
+        if result is MISSING and self._persistent:
+            result = await self._load(key)
+            if result is not MISSING:
+                self.persistent_hits += 1
+                self._memory.set(key, result, ttl=self._ttl_for(result))
+        if result is None:
+            self.negative_hits += 1
+        return result
+
+    async def set(
+        self, query: str, result: GeocodeResult | None, *aliases: str
+    ) -> None:
+        """Store a geocode result under the query and its aliases.
+
+        Args:
+            query (str): A free-form location query.
+            result (GeocodeResult | None): The result or None if not found.
+            aliases (str): Other queries resolving to the same result,
+                e.g. the formatted address returned by the geocoder.
+        """
+        keys = {normalize_query(key) for key in (query, *aliases)}
+        ttl = self._ttl_for(result)
+        for key in keys:
+            self._memory.set(key, result, ttl=ttl)
+        if self._persistent:
+            await self._store(keys, result, ttl)
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            dict: Hit, miss and negative hit counters of both tiers.
+        """
+        memory = self._memory.stats()
+        misses = memory["misses"] - self.persistent_hits
+        lookups = memory["hits"] + self.persistent_hits + misses
+        return {
+            "size": memory["size"],
+            "maxsize": memory["maxsize"],
+            "memory_hits": memory["hits"],
+            "persistent_hits": self.persistent_hits,
+            "negative_hits": self.negative_hits,
+            "misses": misses,
+            "hit_ratio": (
+                round((lookups - misses) / lookups, 4) if lookups else 0.0
+            ),
+        }
+
+    def clear(self) -> None:
+        """Clear the in-memory tier and reset counters."""
+        self._memory.clear()
+        self.persistent_hits = 0
+        self.negative_hits = 0
+
+    def _ttl_for(self, result: GeocodeResult | None) -> int:
+        return self._ttl if result else self._negative_ttl
+
+    async def _load(self, key: str) -> GeocodeResult | None | Any:
+        query = select(geocode_cache_table).where(
+            (geocode_cache_table.c.query == key)
+            & (geocode_cache_table.c.expires_at > datetime.now(timezone.utc))
+        )
+        try:
+            record = await database.fetch_one(query)
+        except Exception as e:
+            print(f"Geocode cache read failed: {e}")
+            return MISSING
+        if not record:
+            return MISSING
+        if record["address"] is None:
+            return None
+        return GeocodeResult(
+            address=record["address"],
+            latitude=record["latitude"],
+            longitude=record["longitude"],
+        )
+
+    async def _store(
+        self, keys: Iterable[str], result: GeocodeResult | None, ttl: int
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        values = [
+            {
+                "query": key,
+                "address": result.address if result else None,
+                "latitude": result.latitude if result else None,
+                "longitude": result.longitude if result else None,
+                "expires_at": expires_at,
+            }
+            for key in keys
+        ]
+        statement = insert(geocode_cache_table).values(values)
+        query = statement.on_conflict_do_update(
+            index_elements=[geocode_cache_table.c.query],
+            set_={
+                "address": statement.excluded.address,
+                "latitude": statement.excluded.latitude,
+                "longitude": statement.excluded.longitude,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        try:
+            await database.execute(query)
+        except Exception as e:
+            print(f"Geocode cache write failed: {e}")
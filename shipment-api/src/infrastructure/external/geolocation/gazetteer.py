@@ -0,0 +1,336 @@
+"""A module containing the offline gazetteer geocoder.
+
+The gazetteer is a table of addresses with their coordinates, loaded from a
+CSV file or an SQLite database with `city`, `street`, `street_number`,
+`postcode`, `latitude` and `longitude` columns and an optional formatted
+`address`. A row with an empty `street_number` stands for the whole street.
+
+Entries are keyed by their normalized city, street, number and postcode, in
+this order, and sorted, so the entries of one street or one building form a
+contiguous range found by binary search on the key prefix. The sorted table
+is compiled once into a binary index file and memory-mapped, so processes
+share its pages and start without parsing the source again.
+"""
+
+import csv
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from src.infrastructure.external.geolocation.cache import (
+    GeocodeResult,
+    normalize_query,
+)
+from src.infrastructure.external.geolocation.igeocoder import IGeocoder
+
+SEPARATOR = b"\x1f"
+# Magic, entry count, keys size and addresses size.
+HEADER = struct.Struct("<4s4xQQQ")
+MAGIC = b"GAZ1"
+
+_FOLD = str.maketrans({"ł": "l"})
+_STREET_PREFIX = re.compile(r"^(?:ul\.?|ulica) ")
+
+
+@lru_cache(maxsize=65_536)
+def _fold(value: str) -> str:
+    text = normalize_query(value).translate(_FOLD)
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+
+
+def entry_key(city: str, street: str, street_number: str, postcode: str) -> bytes:
+    """Build the index key of an address.
+
+    Letter case, Polish diacritics, separators and the "ul." street prefix
+    are ignored, as are spaces in the number and non-digits in the postcode.
+
+    Args:
+        city (str): The city.
+        street (str): The street.
+        street_number (str): The building number, empty for the street.
+        postcode (str): The postcode.
+
+    Returns:
+        bytes: The key.
+    """
+    parts = (
+        _fold(city),
+        _STREET_PREFIX.sub("", _fold(street)),
+        _fold(street_number).replace(" ", ""),
+        re.sub(r"\D", "", postcode),
+    )
+    return SEPARATOR.join(part.encode() for part in parts)
+
+
+def format_address(row: dict) -> str:
+    """Format the address of a gazetteer row without one.
+
+    Args:
+        row (dict): The gazetteer row.
+
+    Returns:
+        str: The formatted address.
+    """
+    street = f"{row['street']} {row.get('street_number') or ''}".strip()
+    return f"{street}, {row['postcode']} {row['city']}"
+
+
+def compile_rows(rows: Iterable[dict]) -> bytes:
+    """Compile gazetteer rows into the binary index format.
+
+    The layout is the header, the key and address offsets, the coordinates
+    and the key and address blobs. Numbers are stored in the native byte
+    order, so an index is only read on the kind of machine that compiled it.
+    Rows with duplicate keys are dropped.
+
+    Args:
+        rows (Iterable[dict]): The gazetteer rows.
+
+    Returns:
+        bytes: The compiled index.
+    """
+    entries = {}
+    for row in rows:
+        key = entry_key(
+            row["city"],
+            row["street"],
+            row.get("street_number") or "",
+            row.get("postcode") or "",
+        )
+        if key not in entries:
+            entries[key] = (
+                (row.get("address") or format_address(row)).encode(),
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+    keys = sorted(entries)
+    addresses = [entries[key][0] for key in keys]
+    coords = array("d", (value for key in keys for value in entries[key][1:]))
+    key_offsets, address_offsets = array("Q", [0]), array("Q", [0])
+    for key, address in zip(keys, addresses):
+        key_offsets.append(key_offsets[-1] + len(key))
+        address_offsets.append(address_offsets[-1] + len(address))
+    key_blob, address_blob = b"".join(keys), b"".join(addresses)
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, len(keys), len(key_blob), len(address_blob)),
+            key_offsets.tobytes(),
+            address_offsets.tobytes(),
+            coords.tobytes(),
+            key_blob,
+            address_blob,
+        )
+    )
+
+
+def read_rows(path: Path) -> Iterable[dict]:
+    """Read gazetteer rows from a CSV file or an SQLite `gazetteer` table.
+
+    Args:
+        path (Path): The source path, `.csv` for CSV.
+
+    Yields:
+        dict: The gazetteer rows.
+    """
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as source:
+            yield from csv.DictReader(source)
+        return
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    try:
+        for row in connection.execute("SELECT * FROM gazetteer"):
+            yield dict(row)
+    finally:
+        connection.close()
+
+
+class Gazetteer:
+    """A class representing a sorted, prefix-searchable address index."""
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        magic, count, keys_size, _ = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a gazetteer index")
+        # Memoryview casts index as fast as lists without copying the buffer.
+        view = memoryview(buffer)
+        offset = HEADER.size
+        size = (count + 1) * 8
+        self._key_offsets = view[offset : offset + size].cast("Q")
+        offset += size
+        self._address_offsets = view[offset : offset + size].cast("Q")
+        offset += size
+        self._coords = view[offset : offset + count * 16].cast("d")
+        offset += count * 16
+        self._keys_start = offset
+        self._addresses_start = offset + keys_size
+        self._buffer = buffer
+        self._count = count
+
+    @classmethod
+    def load(
+        cls, path: str | Path, index_path: str | Path | None = None
+    ) -> "Gazetteer":
+        """Load a gazetteer, compiling its index if missing or stale.
+
+        The index is written next to the source unless `index_path` is given.
+        If it cannot be written, the compiled index is kept in memory.
+
+        Args:
+            path (str | Path): The CSV or SQLite source, or a compiled index.
+            index_path (str | Path | None): Where to keep the compiled index.
+
+        Returns:
+            Gazetteer: The loaded gazetteer.
+        """
+        path = Path(path)
+        with path.open("rb") as source:
+            if source.read(len(MAGIC)) == MAGIC:
+                return cls.open(path)
+        index = Path(index_path or path.with_name(path.name + ".idx"))
+        if index.exists() and index.stat().st_mtime >= path.stat().st_mtime:
+            return cls.open(index)
+        compiled = compile_rows(read_rows(path))
+        try:
+            temporary = index.with_name(index.name + ".tmp")
+            temporary.write_bytes(compiled)
+            os.replace(temporary, index)
+        except OSError as e:
+            print(f"Gazetteer index write failed: {e}")
+            return cls(compiled)
+        return cls.open(index)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "Gazetteer":
+        """Memory-map a compiled gazetteer index.
+
+        Args:
+            path (str | Path): The index path.
+
+        Returns:
+            Gazetteer: The gazetteer backed by the mapped file.
+        """
+        with open(path, "rb") as index:
+            return cls(mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._keys_start + self._key_offsets[index]
+        end = self._keys_start + self._key_offsets[index + 1]
+        return self._buffer[start:end]
+
+    def find(
+        self, city: str, street: str, street_number: str, postcode: str
+    ) -> GeocodeResult | None:
+        """Find an address.
+
+        The building with the postcode is preferred, then the building with
+        any postcode and then the street, if the gazetteer has it.
+
+        Args:
+            city (str): The city.
+            street (str): The street.
+            street_number (str): The building number.
+            postcode (str): The postcode.
+
+        Returns:
+            GeocodeResult | None: The address or None if not found.
+        """
+        key = entry_key(city, street, street_number, postcode)
+        building = key[: key.rindex(SEPARATOR) + 1]
+        start, end = self._prefix_range(building)
+        if start == end:
+            street_key = building[: building.rindex(SEPARATOR, 0, -1) + 1]
+            start, end = self._prefix_range(street_key + SEPARATOR)
+        if start == end:
+            return None
+        for index in range(start, end):
+            if self[index] == key:
+                return self._result(index)
+        return self._result(start)
+
+    def _prefix_range(self, prefix: bytes) -> tuple[int, int]:
+        # The prefix ends with the separator, the byte after it bounds the range.
+        upper = prefix[:-1] + bytes([prefix[-1] + 1])
+        return bisect_left(self, prefix), bisect_left(self, upper)
+
+    def _result(self, index: int) -> GeocodeResult:
+        start = self._addresses_start + self._address_offsets[index]
+        end = self._addresses_start + self._address_offsets[index + 1]
+        return GeocodeResult(
+            self._buffer[start:end].decode(),
+            self._coords[index * 2],
+            self._coords[index * 2 + 1],
+        )
+
+
+class GazetteerGeocoder(IGeocoder):
+    """A geocoder resolving queries from a local gazetteer.
+
+    It understands queries built by `geopy.location_query`, that is street,
+    number, city and postcode separated by commas. Other queries are misses.
+    """
+
+    def __init__(self, gazetteer: Gazetteer) -> None:
+        self._gazetteer = gazetteer
+        self.hits = 0
+        self.misses = 0
+
+    async def geocode(self, query: str) -> GeocodeResult | None:
+        """Geocode a query from the gazetteer.
+
+        Args:
+            query (str): A free-form location query.
+
+        Returns:
+            GeocodeResult | None: The geocoded address or None if not found.
+        """
+        return self.lookup(query)
+
+    def lookup(self, query: str) -> GeocodeResult | None:
+        """Geocode a query from the gazetteer synchronously.
+
+        Args:
+            query (str): A free-form location query.
+
+        Returns:
+            GeocodeResult | None: The geocoded address or None if not found.
+        """
+        parts = [part.strip() for part in query.split(",")]
+        result = None
+        if len(parts) == 4 and all(parts[:3]):
+            street, street_number, city, postcode = parts
+            result = self._gazetteer.find(city, street, street_number, postcode)
+        if result:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    def stats(self) -> dict:
+        """Get gazetteer counters.
+
+        Returns:
+            dict: Size, hit and miss counters of the gazetteer.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._gazetteer),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
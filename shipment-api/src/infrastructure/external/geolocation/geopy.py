@@ -1,14 +1,169 @@
 """A module containing geolocation methods.
 For better performance and faster application functionality, a local instance of OpenStreetMap should be used.
 Enought for testing purposes.
+
+Nominatim is queried through geopy's synchronous client, so every lookup runs on a
+dedicated, bounded thread pool instead of the event loop. Results are cached in
+memory and in the `geocode_cache` table, so warm queries make no external calls.
+Concurrent lookups of the same normalized query and priority share one in-flight
+lookup.
+
+Calls to Nominatim are throttled to `GEOCODER_RATE` per second, interactive
+lookups ahead of bulk ones, and fail fast with GeocoderUnavailable while the
+circuit breaker is open after repeated provider failures.
+
+If `GAZETTEER_PATH` is set, queries are resolved from the local gazetteer first
+and only its misses go to the cache and Nominatim. With `GEOCODER_FALLBACK`
+disabled, Nominatim is never called.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+from geopy.exc import GeocoderTimedOut
 from geopy.geocoders import Nominatim
-from haversine import haversine
+from haversine import Unit, haversine, haversine_vector
 
+from src.config import config
 from src.core.domain.location import Location
+from src.infrastructure.cache.ttl import MISSING
+from src.infrastructure.external.geolocation.breaker import CircuitBreaker
+from src.infrastructure.external.geolocation.cache import (
+    GeocodeCache,
+    GeocodeResult,
+    normalize_query,
+)
+from src.infrastructure.external.geolocation.gazetteer import (
+    Gazetteer,
+    GazetteerGeocoder,
+)
+from src.infrastructure.external.geolocation.igeocoder import IGeocoder
+from src.infrastructure.external.geolocation.ratelimit import (
+    Priority,
+    RateLimiter,
+    current_priority,
+)
+from src.infrastructure.external.geolocation.singleflight import SingleFlight
+
+geolocator = Nominatim(
+    user_agent="shipment_app",
+    domain=config.GEOCODER_DOMAIN,
+    scheme=config.GEOCODER_SCHEME,
+    timeout=config.GEOCODER_TIMEOUT,
+)
+
+executor = ThreadPoolExecutor(
+    max_workers=config.GEOCODER_MAX_WORKERS,
+    thread_name_prefix="geocoder",
+)
+
+cache = GeocodeCache(
+    maxsize=config.GEOCODE_CACHE_SIZE,
+    ttl=config.GEOCODE_CACHE_TTL,
+    negative_ttl=config.GEOCODE_CACHE_NEGATIVE_TTL,
+    persistent=config.GEOCODE_CACHE_PERSISTENT,
+)
+
+limiter = RateLimiter(rate=config.GEOCODER_RATE, burst=config.GEOCODER_BURST)
+
+breaker = CircuitBreaker(
+    threshold=config.GEOCODER_BREAKER_THRESHOLD,
+    reset_timeout=config.GEOCODER_BREAKER_RESET,
+)
+
+
+class NominatimGeocoder(IGeocoder):
+    """A geocoder querying Nominatim on the geocoder thread pool."""
+
+    def __init__(self, limiter: RateLimiter, breaker: CircuitBreaker) -> None:
+        self._limiter = limiter
+        self._breaker = breaker
 
-geolocator = Nominatim(user_agent="shipment_app", timeout=1000)
+    async def geocode(self, query: str) -> GeocodeResult | None:
+        """Geocode a query with Nominatim.
+
+        Interactive lookups wait at most `GEOCODER_QUEUE_TIMEOUT` seconds
+        for their turn, bulk lookups at most `GEOCODER_BULK_QUEUE_TIMEOUT`.
+
+        Args:
+            query (str): A free-form location query.
+
+        Raises:
+            GeocoderUnavailable: If the circuit breaker is open.
+            GeocoderTimedOut: If the lookup waited too long for its turn.
+
+        Returns:
+            GeocodeResult | None: The geocoded address or None if not found.
+        """
+        self._breaker.check()
+        priority = current_priority.get()
+        timeout = (
+            config.GEOCODER_QUEUE_TIMEOUT
+            if priority == Priority.INTERACTIVE
+            else config.GEOCODER_BULK_QUEUE_TIMEOUT
+        )
+        try:
+            await self._limiter.acquire(priority, timeout)
+        except TimeoutError:
+            raise GeocoderTimedOut("Geocoder rate limit queue wait exceeded") from None
+        loop = asyncio.get_running_loop()
+        location = await self._breaker.call(
+            lambda: loop.run_in_executor(executor, geolocator.geocode, query)
+        )
+        return (
+            GeocodeResult(str(location), location.latitude, location.longitude)
+            if location
+            else None
+        )
+
+
+gazetteer: GazetteerGeocoder | None = (
+    GazetteerGeocoder(
+        Gazetteer.load(config.GAZETTEER_PATH, config.GAZETTEER_INDEX_PATH)
+    )
+    if config.GAZETTEER_PATH
+    else None
+)
+
+remote: IGeocoder | None = (
+    NominatimGeocoder(limiter, breaker) if config.GEOCODER_FALLBACK else None
+)
+
+in_flight: SingleFlight[tuple[Priority, str], GeocodeResult | None] = SingleFlight()
+
+
+async def geocode(query: str) -> GeocodeResult | None:
+    """Geocode a query without blocking the event loop.
+
+    The gazetteer is tried first. Its misses are looked up in the cache and
+    then geocoded remotely, once for all concurrent callers of the query with
+    the same priority, so an interactive caller never waits behind a bulk
+    lookup.
+
+    Args:
+        query (str): A free-form location query.
+
+    Returns:
+        GeocodeResult | None: The geocoded address or None if cannot be found.
+    """
+    if gazetteer:
+        result = gazetteer.lookup(query)
+        if result:
+            return result
+    key = (current_priority.get(), normalize_query(query))
+    return await in_flight.do(key, lambda: _lookup(query))
+
+
+async def _lookup(query: str) -> GeocodeResult | None:
+    cached = await cache.get(query)
+    if cached is not MISSING:
+        return cached
+    if remote is None:
+        return None
+    result = await remote.geocode(query)
+    await cache.set(query, result, *([result.address] if result else []))
+    return result
 
 
 async def get_address(location: str) -> str:
@@ -23,10 +178,22 @@ async def get_address(location: str) -> str:
     Returns:
         str: Formatted address.
     """
-    address = geolocator.geocode(location)
-    if not address:
+    result = await geocode(location)
+    if not result:
         raise ValueError(f"Address not found: {location}")
-    return str(address)
+    return result.address
+
+
+def location_query(location: Location) -> str:
+    """Build a geocoding query from a Location object.
+
+    Args:
+        location (Location): A Location object.
+
+    Returns:
+        str: The free-form location query.
+    """
+    return f"{location.street}, {location.street_number}, {location.city}, {location.postcode}"
 
 
 async def get_address_from_location(location: Location) -> str:
@@ -38,8 +205,7 @@ async def get_address_from_location(location: Location) -> str:
     Returns:
         str: Formatted address.
     """
-    location = f"{location.street}, {location.street_number}, {location.city}, {location.postcode}"
-    return await get_address(location)
+    return await get_address(location_query(location))
 
 
 async def get_coords(address: str) -> tuple[float, float] | None:
@@ -51,8 +217,8 @@ async def get_coords(address: str) -> tuple[float, float] | None:
     Returns:
         tuple[float,float]: A tuple of (latitude, longitude) of None if cannot be found.
     """
-    location = geolocator.geocode(address)
-    return (location.latitude, location.longitude) or None
+    result = await geocode(address)
+    return result.coords if result else None
 
 
 async def get_distance(
@@ -68,3 +234,23 @@ async def get_distance(
         float: Distance between the two points in kilometers, rounded to two decimal places.
     """
     return round(haversine(courier_coords, shipment_coords), 2)
+
+
+def get_distances(
+    origin_coords: tuple[float, float], coords: numpy.ndarray
+) -> numpy.ndarray:
+    """Calculate distances from one point to many points in a single vectorized pass.
+
+    Args:
+        origin_coords (tuple[float, float]): Latitude and longitude of the origin.
+        coords (numpy.ndarray): An (n, 2) array of latitudes and longitudes.
+            Missing coordinates should be NaN.
+
+    Returns:
+        numpy.ndarray: Distances in kilometers rounded to two decimal places,
+            NaN where coordinates are missing.
+    """
+    if not len(coords):
+        return numpy.empty(0)
+    distances = haversine_vector(coords, [origin_coords], Unit.KILOMETERS, comb=True)
+    return numpy.round(distances[0], 2)
@@ -0,0 +1,20 @@
+"""Module containing geocoder abstractions."""
+
+from abc import ABC, abstractmethod
+
+from src.infrastructure.external.geolocation.cache import GeocodeResult
+
+
+class IGeocoder(ABC):
+    """An abstract class representing protocol of a geocoding backend."""
+
+    @abstractmethod
+    async def geocode(self, query: str) -> GeocodeResult | None:
+        """The abstract geocoding of a free-form location query.
+
+        Args:
+            query (str): A free-form location query.
+
+        Returns:
+            GeocodeResult | None: The geocoded address or None if not found.
+        """
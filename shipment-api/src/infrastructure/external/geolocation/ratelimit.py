@@ -0,0 +1,142 @@
+"""A module containing the prioritized token bucket rate limiter.
+
+Tokens are added at a fixed rate up to the bucket size and every call takes
+one. Callers which find the bucket empty are queued by priority and then by
+arrival, and a single dispatcher task hands out tokens as they are refilled,
+so interactive requests overtake queued bulk work. The priority of a call
+comes from the context, see `prioritized`.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Iterator
+
+
+class Priority(IntEnum):
+    """Priorities of rate limited calls, lower first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+current_priority: ContextVar[Priority] = ContextVar(
+    "current_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def prioritized(priority: Priority) -> Iterator[None]:
+    """Set the priority of rate limited calls made within the block.
+
+    Tasks started within the block inherit the priority.
+
+    Args:
+        priority (Priority): The priority.
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class RateLimiter:
+    """A class representing a token bucket with a priority queue.
+
+    It is meant to be shared by coroutines of a single event loop, so it does
+    not lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._timer = timer
+        self._tokens = float(burst)
+        self._updated = timer()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self.acquired = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(
+        self, priority: Priority | None = None, timeout: float | None = None
+    ) -> None:
+        """Wait for a token.
+
+        Args:
+            priority (Priority | None): The priority, from the context if None.
+            timeout (float | None): The longest time to wait in the queue.
+
+        Raises:
+            TimeoutError: If no token was given within the timeout.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.acquired += 1
+            return
+        priority = current_priority.get() if priority is None else priority
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        started = self._timer()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        wait = self._timer() - started
+        self.acquired += 1
+        self.queued += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def stats(self) -> dict:
+        """Get limiter counters.
+
+        Returns:
+            dict: Queue depth, acquired, queued and timed out call counters
+                and the mean and longest queue wait in seconds.
+        """
+        return {
+            "queue_depth": sum(not future.done() for *_, future in self._waiters),
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "timeouts": self.timeouts,
+            "mean_wait": (
+                round(self.total_wait / self.queued, 4) if self.queued else 0.0
+            ),
+            "max_wait": round(self.max_wait, 4),
+        }
+
+    def _refill(self) -> None:
+        now = self._timer()
+        elapsed, self._updated = now - self._updated, now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                continue
+            *_, future = heapq.heappop(self._waiters)
+            # Waiters which timed out or were cancelled are skipped.
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
@@ -0,0 +1,68 @@
+"""A module containing coalescing of concurrent identical calls.
+
+While a call for a key is in flight, later calls for the same key await its
+result instead of starting their own. The shared call is shielded, so a
+cancelled caller does not cancel it for the others, and it is forgotten as
+soon as it finishes, so results are never served stale from here.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """A class coalescing concurrent calls with the same key.
+
+    It is meant to be shared by coroutines of a single event loop, so it does
+    not lock.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, function: Callable[[], Awaitable[V]]) -> V:
+        """Call a function unless a call for the key is already in flight.
+
+        Args:
+            key (K): The key identifying identical calls.
+            function (Callable[[], Awaitable[V]]): The call to make.
+
+        Raises:
+            Exception: The exception raised by the shared call.
+
+        Returns:
+            V: The result of the shared call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Get coalescing counters.
+
+        Returns:
+            dict: Started, coalesced and in-flight call counters.
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+    def _forget(self, key: K, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,100 @@
+"""A module containing the background archival of terminal shipments.
+
+Delivered, lost and damaged shipments not updated for
+`SHIPMENT_ARCHIVE_AFTER_DAYS` are moved from `shipments` to the
+month-partitioned `shipments_archive`, so the live table, its indexes and
+the joins over it only hold shipments still in progress. Archived shipments
+are read only when asked for, see `include_archived`.
+
+Batches lock their rows with `FOR UPDATE SKIP LOCKED`, so several
+application workers can run the job at the same time.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from src.config import config
+from src.infrastructure.services.ishipment import IShipmentService
+
+
+class ArchiveWorker:
+    """A class representing the periodic shipment archival worker."""
+
+    def __init__(self, after: timedelta, batch_size: int, interval: float) -> None:
+        self._after = after
+        self._batch_size = batch_size
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.archived = 0
+        self.runs = 0
+        self.last_run: datetime | None = None
+
+    def start(self, service: IShipmentService) -> None:
+        """Start the worker on the running event loop.
+
+        Args:
+            service (IShipmentService): The service archiving the shipments.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(service))
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self, service: IShipmentService) -> None:
+        """Archive shipments every interval until cancelled.
+
+        Args:
+            service (IShipmentService): The service archiving the shipments.
+        """
+        while True:
+            try:
+                await self.archive(service)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Shipment archival failed: {e}")
+            await asyncio.sleep(self._interval)
+
+    async def archive(self, service: IShipmentService) -> int:
+        """Archive the shipments which are due.
+
+        Args:
+            service (IShipmentService): The service archiving the shipments.
+
+        Returns:
+            int: The number of archived shipments.
+        """
+        now = datetime.now(timezone.utc)
+        archived = await service.archive_shipments(
+            now - self._after, self._batch_size
+        )
+        self.archived += archived
+        self.runs += 1
+        self.last_run = now
+        return archived
+
+    def stats(self) -> dict:
+        """Get worker counters.
+
+        Returns:
+            dict: Archived shipment and run counters of this process and the
+                start time of the last run.
+        """
+        return {
+            "archived": self.archived,
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
+
+
+worker = ArchiveWorker(
+    after=timedelta(days=config.SHIPMENT_ARCHIVE_AFTER_DAYS),
+    batch_size=config.SHIPMENT_ARCHIVE_BATCH_SIZE,
+    interval=config.SHIPMENT_ARCHIVE_INTERVAL,
+)
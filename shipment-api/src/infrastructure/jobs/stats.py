@@ -0,0 +1,84 @@
+"""A module containing the background refresh of shipment statistics.
+
+The `shipment_daily_stats` materialized view, see `src.views`, is refreshed
+every `SHIPMENT_STATS_REFRESH_INTERVAL`, so the statistics endpoint reads a
+few aggregated rows instead of every shipment and lags behind them by at
+most the interval. Until this process has refreshed the view once, the
+statistics are computed from the shipments.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+from src.config import config
+from src.infrastructure.services.ishipment import IShipmentService
+
+
+class StatsRefreshWorker:
+    """A class representing the periodic statistics refresh worker."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.refreshes = 0
+        self.refreshed_at: datetime | None = None
+
+    def start(self, service: IShipmentService) -> None:
+        """Start the worker on the running event loop.
+
+        Args:
+            service (IShipmentService): The service refreshing the statistics.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(service))
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self, service: IShipmentService) -> None:
+        """Refresh the statistics every interval until cancelled.
+
+        Args:
+            service (IShipmentService): The service refreshing the statistics.
+        """
+        while True:
+            try:
+                await self.refresh(service)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Shipment statistics refresh failed: {e}")
+            await asyncio.sleep(self._interval)
+
+    async def refresh(self, service: IShipmentService) -> None:
+        """Refresh the statistics.
+
+        Args:
+            service (IShipmentService): The service refreshing the statistics.
+        """
+        started = datetime.now(timezone.utc)
+        await service.refresh_stats()
+        self.refreshes += 1
+        self.refreshed_at = started
+
+    def stats(self) -> dict:
+        """Get worker counters.
+
+        Returns:
+            dict: The refresh counter of this process and the start time of
+                the last successful refresh.
+        """
+        return {
+            "refreshes": self.refreshes,
+            "refreshed_at": (
+                self.refreshed_at.isoformat() if self.refreshed_at else None
+            ),
+        }
+
+
+worker = StatsRefreshWorker(interval=config.SHIPMENT_STATS_REFRESH_INTERVAL)
@@ -0,0 +1,77 @@
+"""A module containing the background reconciliation of courier workloads.
+
+The workload counters of this process, see
+`src.infrastructure.cache.workload`, miss the writes of other processes, so
+every `WORKLOAD_RECONCILE_INTERVAL` they are replaced by the counts in the
+database. Couriers whose counts differed are logged and counted as drift.
+"""
+
+import asyncio
+
+from src.config import config
+from src.infrastructure.services.ishipment import IShipmentService
+
+
+class WorkloadReconcileWorker:
+    """A class representing the periodic workload reconciliation worker."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.drifted = 0
+
+    def start(self, service: IShipmentService) -> None:
+        """Start the worker on the running event loop.
+
+        Args:
+            service (IShipmentService): The service reconciling the counters.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(service))
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self, service: IShipmentService) -> None:
+        """Reconcile the counters every interval until cancelled.
+
+        Args:
+            service (IShipmentService): The service reconciling the counters.
+        """
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.reconcile(service)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Courier workload reconciliation failed: {e}")
+
+    async def reconcile(self, service: IShipmentService) -> None:
+        """Reconcile the counters.
+
+        Args:
+            service (IShipmentService): The service reconciling the counters.
+        """
+        drift = await service.reconcile_workload()
+        self.runs += 1
+        if drift:
+            self.drifted += len(drift)
+            print(f"Courier workload drifted for {len(drift)} couriers.")
+
+    def stats(self) -> dict:
+        """Get worker counters.
+
+        Returns:
+            dict: Run and drifted courier counters of this process.
+        """
+        return {"runs": self.runs, "drifted": self.drifted}
+
+
+worker = WorkloadReconcileWorker(interval=config.WORKLOAD_RECONCILE_INTERVAL)
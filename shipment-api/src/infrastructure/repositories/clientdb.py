@@ -1,13 +1,14 @@
 """Module containing client repository implementation."""
 
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import FromClause, Select, delete, select, update
 
 from src.core.domain.user import Client, ClientIn
 from src.core.repositories.iclient import IClientRepository
 from src.db import client_table, database, user_table
+from src.infrastructure.repositories.pagination import paginate
 
 
 class ClientRepository(IClientRepository):
@@ -15,63 +16,78 @@ class ClientRepository(IClientRepository):
 
     async def register_client(self, client: ClientIn, user_id: UUID) -> dict | None:
         """Register a new client and return joined client+user dict."""
-        query = client_table.insert().values(
-            id=user_id,
-            first_name=client.first_name,
-            last_name=client.last_name,
-            phone_number=client.phone_number,
-            address=client.address,
+        inserted = (
+            client_table.insert()
+            .values(
+                id=user_id,
+                first_name=client.first_name,
+                last_name=client.last_name,
+                phone_number=client.phone_number,
+                address=client.address,
+            )
+            .returning(client_table)
+            .cte("inserted_client")
         )
-        await database.execute(query)
-        return await self.get_client(user_id)
+        record = await database.fetch_one(self._clients_query(inserted))
+        return dict(record) if record else None
 
     async def get_client(self, client_id: UUID) -> dict | None:
         """Get client by provided client id (user_id), joined with user."""
-        query = (
-            select(
-                client_table.c.id,
-                client_table.c.first_name,
-                client_table.c.last_name,
-                client_table.c.phone_number,
-                client_table.c.address,
-                user_table.c.email,
-                user_table.c.role,
-            )
-            .join(user_table, client_table.c.id == user_table.c.id)
-            .where(client_table.c.id == client_id)
-        )
+        query = self._clients_query().where(client_table.c.id == client_id)
         record = await database.fetch_one(query)
         return dict(record) if record else None
 
     async def delete_client(self, client_id: UUID) -> dict | None:
         """Delete client by provided client id (user_id), joined with user."""
-        client = await self.get_client(client_id)
-        if not client:
-            return None
-        query = delete(client_table).where(client_table.c.id == client_id)
-        await database.execute(query)
-        return client
+        deleted = (
+            delete(client_table)
+            .where(client_table.c.id == client_id)
+            .returning(client_table)
+            .cte("deleted_client")
+        )
+        record = await database.fetch_one(self._clients_query(deleted))
+        return dict(record) if record else None
 
     async def update_client(self, client_id: UUID, data: ClientIn) -> dict | None:
         """Update client by provided client id (user_id), joined with user."""
-        query = (
+        updated = (
             update(client_table)
             .where(client_table.c.id == client_id)
             .values(data.model_dump())
+            .returning(client_table)
+            .cte("updated_client")
         )
-        await database.execute(query)
-        return await self.get_client(client_id)
+        record = await database.fetch_one(self._clients_query(updated))
+        return dict(record) if record else None
 
-    async def get_all_clients(self) -> Iterable[dict] | None:
-        """Get all clients, joined with user."""
-        query = select(
-            client_table.c.id,
-            client_table.c.first_name,
-            client_table.c.last_name,
-            client_table.c.phone_number,
-            client_table.c.address,
-            user_table.c.email,
-            user_table.c.role,
-        ).join(user_table, client_table.c.id == user_table.c.id)
+    async def get_all_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[dict] | None:
+        """Get a page of clients ordered by id, joined with user."""
+        query = paginate(self._clients_query(), client_table.c.id, after_id, limit)
         records = await database.fetch_all(query)
         return [dict(record) for record in records] if records else None
+
+    async def iterate_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[dict]:
+        """Iterate over clients ordered by id, joined with user."""
+        query = paginate(self._clients_query(), client_table.c.id, after_id, limit)
+        async for record in database.iterate(query):
+            yield dict(record)
+
+    def _clients_query(self, clients: FromClause = client_table) -> Select:
+        """Build a query selecting clients joined with user.
+
+        `clients` may be a CTE of a write returning client rows, so the write
+        and the join run as a single statement.
+        """
+        return select(
+            clients.c.id,
+            clients.c.first_name,
+            clients.c.last_name,
+            clients.c.phone_number,
+            clients.c.address,
+            user_table.c.email,
+            user_table.c.role,
+        ).join(user_table, clients.c.id == user_table.c.id)
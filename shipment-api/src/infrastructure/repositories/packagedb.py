@@ -1,39 +1,75 @@
 """A class representing package DB repository."""
 
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 
 from sqlalchemy import delete, insert, select, update
 
 from src.core.domain.shipment import Package, PackageIn
 from src.core.repositories.ipackage import IPackageRepository
 from src.db import database, packages_table
+from src.infrastructure.repositories.pagination import paginate
 
 
 class PackageRepository(IPackageRepository):
     """Implementation of package repository."""
 
     async def add_package(self, data: PackageIn, shipment_id: int) -> dict | None:
-        query = insert(packages_table).values(
-            id=shipment_id,
-            weight=data.weight,
-            length=data.length,
-            width=data.width,
-            height=data.height,
-            fragile=data.fragile,
+        query = (
+            insert(packages_table)
+            .values(
+                id=shipment_id,
+                weight=data.weight,
+                length=data.length,
+                width=data.width,
+                height=data.height,
+                fragile=data.fragile,
+            )
+            .returning(packages_table)
+        )
+        record = await database.fetch_one(query)
+        return dict(record) if record else None
+
+    async def add_packages(self, packages: list[tuple[int, PackageIn]]) -> None:
+        """Bulk load packages with COPY. Must be called inside a transaction."""
+        if not packages:
+            return
+        connection = database.connection().raw_connection
+        await connection.copy_records_to_table(
+            packages_table.name,
+            records=[
+                (
+                    shipment_id,
+                    data.weight,
+                    data.length,
+                    data.width,
+                    data.height,
+                    data.fragile,
+                    data.note,
+                )
+                for shipment_id, data in packages
+            ],
+            columns=["id", "weight", "length", "width", "height", "fragile", "note"],
         )
-        await database.execute(query)
-        return await self.get_package_by_id(shipment_id)
 
     async def get_package_by_id(self, package_id: int) -> dict | None:
         query = select(packages_table).where(packages_table.c.id == package_id)
         record = await database.fetch_one(query)
         return dict(record) if record else None
 
-    async def get_all_packages(self) -> Iterable[dict]:
-        query = select(packages_table)
+    async def get_all_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> Iterable[dict]:
+        query = paginate(select(packages_table), packages_table.c.id, after_id, limit)
         records = await database.fetch_all(query)
         return [dict(record) for record in records] if records else []
 
+    async def iterate_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> AsyncIterator[dict]:
+        query = paginate(select(packages_table), packages_table.c.id, after_id, limit)
+        async for record in database.iterate(query):
+            yield dict(record)
+
     async def update_package(self, package_id: int, data: Package) -> dict | None:
         query = (
             update(packages_table)
@@ -51,14 +87,16 @@ class PackageRepository(IPackageRepository):
                 cancelled_at=data.cancelled_at,
                 note=data.note,
             )
+            .returning(packages_table)
         )
-        await database.execute(query)
-        return await self.get_package_by_id(package_id)
+        record = await database.fetch_one(query)
+        return dict(record) if record else None
 
     async def delete_package(self, package_id: int) -> dict | None:
-        package = await self.get_package_by_id(package_id)
-        if not package:
-            return None
-        query = delete(packages_table).where(packages_table.c.id == package_id)
-        await database.execute(query)
-        return package
+        query = (
+            delete(packages_table)
+            .where(packages_table.c.id == package_id)
+            .returning(packages_table)
+        )
+        record = await database.fetch_one(query)
+        return dict(record) if record else None
@@ -0,0 +1,33 @@
+"""Module containing keyset pagination of repository queries."""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select
+
+
+def paginate(
+    query: Select,
+    key: ColumnElement,
+    after: Any | None = None,
+    limit: int | None = None,
+) -> Select:
+    """Apply keyset pagination to a query.
+
+    Rows are ordered by the key and only rows with keys greater than `after`
+    are returned, so deep pages cost the same as the first one.
+
+    Args:
+        query (Select): The query to paginate.
+        key (ColumnElement): The unique column to order and seek by.
+        after (Any | None): The key of the last row of the previous page.
+        limit (int | None): The maximum number of rows.
+
+    Returns:
+        Select: The paginated query.
+    """
+    query = query.order_by(key)
+    if after is not None:
+        query = query.where(key > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
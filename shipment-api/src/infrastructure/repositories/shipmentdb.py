@@ -1,9 +1,30 @@
 """Module containing shipment repository implementation."""
 
-from typing import Any, Iterable, Tuple
+import math
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable, Tuple
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    FromClause,
+    Integer,
+    Select,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.sql import literal_column
 
 from src.core.domain.shipment import (
@@ -11,8 +32,36 @@ from src.core.domain.shipment import (
     ShipmentIn,
     ShipmentStatus,
 )
+from src.core.domain.user import UserRole
 from src.core.repositories.ishipment import IShipmentRepository
-from src.db import client_table, database, shipment_table, user_table
+from src.db import (
+    ASSIGNABLE_SHIPMENT_STATUSES,
+    WORKLOAD_SHIPMENT_STATUSES,
+    client_table,
+    database,
+    package_archive_table,
+    packages_table,
+    shipment_archive_table,
+    shipment_event_table,
+    shipment_table,
+    user_table,
+)
+from src.infrastructure.repositories.pagination import paginate
+from src.spatial import BoundingBox, cell_ranges
+from src.views import daily_stats_query, shipment_daily_stats
+
+BULK_SHIPMENT_COLUMNS = (
+    "sender_id",
+    "recipient_email",
+    "origin",
+    "destination",
+    "origin_query",
+    "destination_query",
+    "origin_latitude",
+    "origin_longitude",
+    "destination_latitude",
+    "destination_longitude",
+)
 
 
 class ShipmentRepository(IShipmentRepository):
@@ -28,136 +77,410 @@ class ShipmentRepository(IShipmentRepository):
             shipment_id (int): The id of the shipment.
 
         Returns:
-            Any | None: The shipment details if updated.
+            Any | None: The shipment details, with the courier it was assigned
+                to before as `previous_courier_id`, if updated.
         """
-
+        previous = self._locked_shipment(shipment_id)
         query = (
             update(shipment_table)
-            .where(shipment_table.c.id == shipment_id)
+            .where(shipment_table.c.id == previous.c.id)
             .values(courier_id=courier_id)
-            .returning(shipment_table)
+            .returning(
+                shipment_table,
+                previous.c.courier_id.label("previous_courier_id"),
+            )
         )
         shipment = await database.fetch_one(query)
         return shipment
 
     async def update_status(
-        self, shipment_id: int, new_status: ShipmentStatus
+        self,
+        shipment_id: int,
+        new_status: ShipmentStatus,
+        actor_id: UUID | None = None,
+        coords: Tuple[float, float] | None = None,
     ) -> Any | None:
         """The method changing shipment status by provided id in the data storage.
 
+        The status change is appended to the shipment events by the same
+        statement, so the history is written atomically, in one round trip.
+
         Args:
             shipment_id (int): The id of the shipment.
             new_status (ShipmentStatus): The new status.
+            actor_id (UUID | None): The id of the user changing the status.
+            coords (Tuple[float, float] | None): Where the status changed.
 
         Returns:
-            Any | None: The shipment details if updated.
+            Any | None: The shipment details, with the status it had before as
+                `previous_status`, if updated.
         """
-        query = (
+        latitude, longitude = coords or (None, None)
+        previous = self._locked_shipment(shipment_id)
+        updated = (
             update(shipment_table)
-            .where(shipment_table.c.id == shipment_id)
+            .where(shipment_table.c.id == previous.c.id)
             .values(status=new_status)
-            .returning(shipment_table)
+            .returning(shipment_table, previous.c.status.label("previous_status"))
+            .cte("updated")
         )
-        shipment = await database.fetch_one(query)
+        event = (
+            insert(shipment_event_table)
+            .from_select(
+                ["shipment_id", "status", "actor_id", "latitude", "longitude"],
+                select(
+                    updated.c.id,
+                    updated.c.status,
+                    literal(actor_id, PG_UUID(as_uuid=True)),
+                    literal(latitude, Float),
+                    literal(longitude, Float),
+                ),
+            )
+            .cte("event")
+        )
+        shipment = await database.fetch_one(select(updated).add_cte(event))
         return shipment
 
-    async def check_status(self, shipment_id: int, recipient_email: str) -> Any | None:
-        """The method getting shipment by provided id and Recipient email from the data storage.
+    async def assign_shipments(
+        self, assignments: list[tuple[int, UUID]]
+    ) -> Iterable[Any]:
+        """The method assigning a batch of shipments to couriers at once.
+
+        The pairs are sent as two arrays joined by one UPDATE. Shipments
+        assigned meanwhile or no longer waiting for a courier, and ids which
+        are not couriers are skipped.
 
         Args:
-            shipment_id (int): The id of the shipment.
-            recipient_email (int): The recipient_email of the shipment.
+            assignments (list[tuple[int, UUID]]): The shipment and courier id
+                pairs.
 
         Returns:
-            Any | None: The shipment details if exists.
+            Iterable[Any]: The id, courier_id and status of every assigned
+                shipment.
         """
-        recipient_user = user_table.alias("recipient_user")
-        recipient_client = client_table.alias("recipient_client")
-
-        sender_fullname = func.concat_ws(
-            literal_column("' '"),
-            client_table.c.first_name,
-            client_table.c.last_name,
-        ).label("sender_fullname")
+        shipment_ids = [shipment_id for shipment_id, _ in assignments]
+        courier_ids = [courier_id for _, courier_id in assignments]
+        batch = (
+            func.unnest(
+                bindparam("shipment_ids", shipment_ids, ARRAY(Integer)),
+                bindparam("courier_ids", courier_ids, ARRAY(PG_UUID(as_uuid=True))),
+            )
+            .table_valued("shipment_id", "courier_id")
+            .render_derived("batch")
+        )
+        query = (
+            update(shipment_table)
+            .where(
+                shipment_table.c.id == batch.c.shipment_id,
+                shipment_table.c.courier_id.is_(None),
+                shipment_table.c.status.in_(ASSIGNABLE_SHIPMENT_STATUSES),
+                user_table.c.id == batch.c.courier_id,
+                user_table.c.role == UserRole.COURIER,
+            )
+            .values(courier_id=batch.c.courier_id)
+            .returning(
+                shipment_table.c.id,
+                shipment_table.c.courier_id,
+                shipment_table.c.status,
+            )
+        )
+        shipments = await database.fetch_all(query)
+        return shipments
 
-        recipient_fullname = func.concat_ws(
-            literal_column("' '"),
-            recipient_client.c.first_name,
-            recipient_client.c.last_name,
-        ).label("recipient_fullname")
+    async def get_courier_workload(self) -> Iterable[Any]:
+        """The method counting unfinished shipments per courier and status.
 
+        Returns:
+            Iterable[Any]: The courier_id, status and shipments of every
+                courier and status in `WORKLOAD_SHIPMENT_STATUSES`.
+        """
         query = (
             select(
-                shipment_table,
-                sender_fullname,
-                recipient_fullname,
-            )
-            .select_from(
-                shipment_table.outerjoin(
-                    user_table, shipment_table.c.sender_id == user_table.c.id
-                )
-                .outerjoin(client_table, user_table.c.id == client_table.c.id)
-                .outerjoin(
-                    recipient_user, shipment_table.c.recipient_id == recipient_user.c.id
-                )
-                .outerjoin(
-                    recipient_client, recipient_user.c.id == recipient_client.c.id
-                )
+                shipment_table.c.courier_id,
+                shipment_table.c.status,
+                func.count().label("shipments"),
             )
             .where(
-                (shipment_table.c.id == shipment_id)
-                & (shipment_table.c.recipient_email == recipient_email)
+                shipment_table.c.courier_id.is_not(None),
+                shipment_table.c.status.in_(WORKLOAD_SHIPMENT_STATUSES),
             )
+            .group_by(shipment_table.c.courier_id, shipment_table.c.status)
+        )
+        workload = await database.fetch_all(query)
+        return workload
+
+    async def get_events(
+        self, shipment_id: int, since: datetime, until: datetime
+    ) -> Iterable[Any]:
+        """The method getting the status history of a shipment.
+
+        Events cannot precede the creation of the shipment nor follow its
+        last update, so the bounds limit the scan to the partitions of its
+        lifetime.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            since (datetime): The creation time of the shipment.
+            until (datetime): The last update time of the shipment.
+
+        Returns:
+            Iterable[Any]: The events in chronological order.
+        """
+        query = self._events_query(shipment_id, since, until)
+        return await database.fetch_all(query)
+
+    async def get_stats(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+        materialized: bool = False,
+    ) -> Iterable[Any]:
+        """The method getting shipment statistics aggregated in the data storage.
+
+        Counts and average delivery times by status, by courier, per day and
+        in total are computed by a single grouping sets query, either from
+        the shipments or from the `shipment_daily_stats` view.
+
+        Args:
+            since (date | None): The first day of creation, unbounded if None.
+            until (date | None): The last day of creation, unbounded if None.
+            materialized (bool): Whether to read the materialized view.
+
+        Returns:
+            Iterable[Any]: Rows with the `dimension` they are grouped by,
+                "status", "courier", "day" or "total", its value, the number
+                of shipments and the average delivery time in seconds.
+        """
+        query = self._stats_query(since, until, materialized)
+        return await database.fetch_all(query)
+
+    async def refresh_stats(self) -> None:
+        """The method refreshing the materialized shipment statistics.
+
+        The first refresh populates the view and blocks its readers, the
+        later ones are concurrent.
+        """
+        populated = await database.fetch_val(
+            "SELECT ispopulated FROM pg_matviews "
+            "WHERE matviewname = :name AND schemaname = current_schema()",
+            {"name": shipment_daily_stats.name},
+        )
+        concurrently = "CONCURRENTLY " if populated else ""
+        await database.execute(
+            f"REFRESH MATERIALIZED VIEW {concurrently}{shipment_daily_stats.name}"
+        )
+
+    async def check_status(
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
+    ) -> Any | None:
+        """The method getting shipment by provided id and Recipient email from the data storage.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            recipient_email (int): The recipient_email of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
+
+        Returns:
+            Any | None: The shipment details if exists.
+        """
+        shipments = self._shipments(include_archived)
+        query = self._joined_shipments_query(shipments).where(
+            (shipments.c.id == shipment_id)
+            & (shipments.c.recipient_email == recipient_email)
         )
         shipment = await database.fetch_one(query)
         return shipment
 
-    async def get_all_shipments(self) -> Iterable[Any]:
-        """The method getting all shipments from the data storage."""
-        recipient_user = user_table.alias("recipient_user")
-        recipient_client = client_table.alias("recipient_client")
+    async def get_all_shipments(
+        self,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[Any]:
+        """The method getting all shipments from the data storage.
 
-        sender_fullname = func.concat_ws(
-            literal_column("' '"),
-            client_table.c.first_name,
-            client_table.c.last_name,
-        ).label("sender_fullname")
+        Args:
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
 
-        recipient_fullname = func.concat_ws(
-            literal_column("' '"),
-            recipient_client.c.first_name,
-            recipient_client.c.last_name,
-        ).label("recipient_fullname")
+        Returns:
+            Iterable[Any]: The shipments ordered by id.
+        """
+        shipments = self._shipments(include_archived)
+        query = paginate(
+            self._joined_shipments_query(shipments), shipments.c.id, after_id, limit
+        )
+        shipments = await database.fetch_all(query)
+        return shipments
 
-        query = select(
-            shipment_table,
-            sender_fullname,
-            recipient_fullname,
-        ).select_from(
-            shipment_table.outerjoin(
-                user_table, shipment_table.c.sender_id == user_table.c.id
-            )
-            .outerjoin(client_table, user_table.c.id == client_table.c.id)
-            .outerjoin(
-                recipient_user, shipment_table.c.recipient_id == recipient_user.c.id
+    async def get_filtered_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[Any]:
+        """The method getting shipments matching the filters from the data storage.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient. Combined with
+                sender_id, shipments sent by or addressed to the client match.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
+
+        Returns:
+            Iterable[Any]: The matching shipments ordered by id.
+        """
+        shipments = self._shipments(include_archived)
+        query = paginate(
+            self._filtered_shipments_query(
+                courier_id, sender_id, recipient_email, statuses, shipments
+            ),
+            shipments.c.id,
+            after_id,
+            limit,
+        )
+        shipments = await database.fetch_all(query)
+        return shipments
+
+    async def get_unassigned_shipments_in_box(
+        self,
+        end: str,
+        box: BoundingBox,
+        center: tuple[float, float],
+        limit: int,
+        statuses: Iterable[ShipmentStatus] | None = None,
+    ) -> Iterable[Any]:
+        """The method getting unassigned shipments with an end inside a box.
+
+        The box is covered by ranges of grid cells, one per row of cells, so
+        the cell index is scanned only where the box is. The coordinates are
+        then checked against the box itself. The shipments nearest to the
+        center are returned first, by an equirectangular approximation of
+        the distance, which is close to the great-circle one within a box.
+
+        Args:
+            end (str): "origin" or "destination", the end to locate.
+            box (BoundingBox): The area to search.
+            center (tuple[float, float]): Latitude and longitude to order by
+                distance from.
+            limit (int): The maximum number of shipments.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by,
+                the ones waiting for a courier if None.
+
+        Returns:
+            Iterable[Any]: The matching shipments, nearest first.
+        """
+        cell = shipment_table.c[f"{end}_cell"]
+        latitude = shipment_table.c[f"{end}_latitude"]
+        longitude = shipment_table.c[f"{end}_longitude"]
+        if statuses is None:
+            statuses = ASSIGNABLE_SHIPMENT_STATUSES
+        scale = math.cos(math.radians(center[0]))
+        north = latitude - center[0]
+        east = (longitude - center[1]) * scale
+        query = (
+            self._filtered_shipments_query(None, None, None, statuses)
+            .where(
+                shipment_table.c.courier_id.is_(None),
+                or_(*(cell.between(first, last) for first, last in cell_ranges(box))),
+                latitude.between(box.min_latitude, box.max_latitude),
+                longitude.between(box.min_longitude, box.max_longitude),
             )
-            .outerjoin(recipient_client, recipient_user.c.id == recipient_client.c.id)
+            .order_by(north * north + east * east, shipment_table.c.id)
+            .limit(limit)
         )
+        shipments = await database.fetch_all(query)
+        return shipments
+
+    async def get_unassigned_shipments(
+        self, statuses: Iterable[ShipmentStatus], limit: int
+    ) -> Iterable[Any]:
+        """The method getting the oldest shipments without a courier.
+
+        Args:
+            statuses (Iterable[ShipmentStatus]): Statuses to filter by.
+            limit (int): The maximum number of shipments.
 
+        Returns:
+            Iterable[Any]: The id, status and origin coordinates of the
+                shipments ordered by id.
+        """
+        query = (
+            select(
+                shipment_table.c.id,
+                shipment_table.c.status,
+                shipment_table.c.origin_latitude,
+                shipment_table.c.origin_longitude,
+            )
+            .where(
+                shipment_table.c.courier_id.is_(None),
+                shipment_table.c.status.in_(list(statuses)),
+            )
+            .order_by(shipment_table.c.id)
+            .limit(limit)
+        )
         shipments = await database.fetch_all(query)
         return shipments
 
-    async def get_shipment_by_id(self, shipment_id: int) -> Any | None:
+    async def iterate_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        include_archived: bool = False,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """The method iterating over shipments matching the filters with a DB cursor.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            include_archived (bool): Whether archived shipments are listed too.
+            after_id (int | None): Start after the shipment with this id.
+            limit (int | None): The maximum number of shipments.
+
+        Yields:
+            Any: The matching shipments ordered by id.
+        """
+        shipments = self._shipments(include_archived)
+        query = paginate(
+            self._filtered_shipments_query(
+                courier_id, sender_id, recipient_email, statuses, shipments
+            ),
+            shipments.c.id,
+            after_id,
+            limit,
+        )
+        async for shipment in database.iterate(query):
+            yield shipment
+
+    async def get_shipment_by_id(
+        self, shipment_id: int, include_archived: bool = False
+    ) -> Any | None:
         """The method getting shipment by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             Any | None: The shipment details if exists.
         """
-
-        query = select(shipment_table).where(shipment_table.c.id == shipment_id)
+        shipments = self._shipments(include_archived)
+        query = select(shipments).where(shipments.c.id == shipment_id)
         shipment = await database.fetch_one(query)
         return shipment if shipment else None
 
@@ -178,6 +501,27 @@ class ShipmentRepository(IShipmentRepository):
         deleted_shipment = await database.fetch_one(query)
         return deleted_shipment if deleted_shipment else None
 
+    async def archive_shipments(
+        self, statuses: Iterable[ShipmentStatus], before: datetime, limit: int
+    ) -> list[int]:
+        """The method moving terminal shipments to the archive.
+
+        The shipments and their packages are deleted and inserted into the
+        archive tables by a single statement, so a batch is moved atomically.
+        Rows locked by concurrent updates are skipped until the next batch.
+
+        Args:
+            statuses (Iterable[ShipmentStatus]): The terminal statuses.
+            before (datetime): Shipments last updated before are archived.
+            limit (int): The maximum number of shipments moved.
+
+        Returns:
+            list[int]: The ids of the archived shipments.
+        """
+        query = self._archive_query(statuses, before, limit)
+        rows = await database.fetch_all(query)
+        return [row["id"] for row in rows]
+
     async def add_shipment(
         self,
         data: ShipmentIn,
@@ -186,6 +530,8 @@ class ShipmentRepository(IShipmentRepository):
         origin_coords: Tuple,
         destination_coords: Tuple,
         user_id: UUID,
+        origin_query: str | None = None,
+        destination_query: str | None = None,
     ) -> Any | None:
         """The method adding new shipment to the data storage.
 
@@ -196,27 +542,71 @@ class ShipmentRepository(IShipmentRepository):
             origin (Tuple): The origin coords of the shipment.
             destination (Tuple): The destination coords of the shipment.
             user_id (UUID): UUID of the user(sender)
+            origin_query (str | None): The query the origin was resolved from.
+            destination_query (str | None): The query the destination was
+                resolved from.
 
         Returns:
             Any | None: The shipment object if created.
         """
-        query = shipment_table.insert().values(
-            sender_id=user_id,
-            status="pending",
-            recipient_email=(
-                None if data.recipient_email == "" else data.recipient_email
-            ),
-            origin=origin,
-            destination=destination,
-            origin_latitude=origin_coords[0],
-            origin_longitude=origin_coords[1],
-            destination_latitude=destination_coords[0],
-            destination_longitude=destination_coords[1],
+        query = (
+            shipment_table.insert()
+            .values(
+                sender_id=user_id,
+                status="pending",
+                recipient_email=(
+                    None if data.recipient_email == "" else data.recipient_email
+                ),
+                origin=origin,
+                destination=destination,
+                origin_query=origin_query,
+                destination_query=destination_query,
+                origin_latitude=origin_coords[0],
+                origin_longitude=origin_coords[1],
+                destination_latitude=destination_coords[0],
+                destination_longitude=destination_coords[1],
+            )
+            .returning(shipment_table)
         )
-        new_shipment_id = await database.execute(query)
-        new_shipment = await self.get_shipment_by_id(new_shipment_id)
+        new_shipment = await database.fetch_one(query)
         return new_shipment if new_shipment else None
 
+    async def add_shipments(self, rows: list[dict]) -> list[int]:
+        """The method bulk loading shipments with COPY.
+
+        Ids are reserved from the sequence first, so the rows are loaded with
+        a single COPY and no RETURNING. Must be called inside a transaction.
+
+        Args:
+            rows (list[dict]): The BULK_SHIPMENT_COLUMNS values of each shipment.
+
+        Returns:
+            list[int]: The ids of the shipments, in the order of rows.
+        """
+        if not rows:
+            return []
+        connection = database.connection().raw_connection
+        reserved = await connection.fetch(
+            "SELECT nextval(pg_get_serial_sequence('shipments', 'id')) "
+            "FROM generate_series(1, $1)",
+            len(rows),
+        )
+        ids = [record[0] for record in reserved]
+        status = ShipmentStatus.PENDING.name
+        await connection.copy_records_to_table(
+            shipment_table.name,
+            records=[
+                (
+                    shipment_id,
+                    status,
+                    *(row[column] for column in BULK_SHIPMENT_COLUMNS),
+                )
+                for shipment_id, row in zip(ids, rows)
+            ],
+            columns=["id", "status", *BULK_SHIPMENT_COLUMNS],
+        )
+        return ids
+
     async def update_shipment(
         self,
         shipment_id: int,
@@ -226,6 +616,8 @@ class ShipmentRepository(IShipmentRepository):
         destination: str,
         origin_coords: Tuple,
         destination_coords: Tuple,
+        origin_query: str | None = None,
+        destination_query: str | None = None,
     ) -> Any | None:
         """The method updating shipment data in the data storage.
 
@@ -237,6 +629,9 @@ class ShipmentRepository(IShipmentRepository):
             destination (str): The destination address of the shipment.
             origin (Tuple): The origin coords of the shipment.
             destination (Tuple): The destination coords of the shipment.
+            origin_query (str | None): The query the origin was resolved from.
+            destination_query (str | None): The query the destination was
+                resolved from.
 
         Returns:
             Any | None: The updated shipment if updated.
@@ -254,6 +649,8 @@ class ShipmentRepository(IShipmentRepository):
                 ),
                 origin=origin,
                 destination=destination,
+                origin_query=origin_query,
+                destination_query=destination_query,
                 origin_latitude=origin_coords[0],
                 origin_longitude=origin_coords[1],
                 destination_latitude=destination_coords[0],
@@ -263,3 +660,191 @@ class ShipmentRepository(IShipmentRepository):
         )
         shipment = await database.fetch_one(query)
         return shipment if shipment else None
+
+    def _locked_shipment(self, shipment_id: int) -> FromClause:
+        # The row is locked before it is updated, so the returned previous
+        # values are the ones the update replaced.
+        return (
+            select(
+                shipment_table.c.id,
+                shipment_table.c.courier_id,
+                shipment_table.c.status,
+            )
+            .where(shipment_table.c.id == shipment_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+
+    def _filtered_shipments_query(
+        self,
+        courier_id: UUID | None,
+        sender_id: UUID | None,
+        recipient_email: str | None,
+        statuses: Iterable[ShipmentStatus] | None,
+        shipments: FromClause = shipment_table,
+    ) -> Select:
+        """The method building a joined shipments query with filters applied.
+
+        Returns:
+            Select: The filtered query.
+        """
+        query = self._joined_shipments_query(shipments)
+        if courier_id is not None:
+            query = query.where(shipments.c.courier_id == courier_id)
+        parties = []
+        if sender_id is not None:
+            parties.append(shipments.c.sender_id == sender_id)
+        if recipient_email is not None:
+            parties.append(shipments.c.recipient_email == recipient_email)
+        if parties:
+            query = query.where(or_(*parties))
+        if statuses is not None:
+            query = query.where(shipments.c.status.in_(list(statuses)))
+        return query
+
+    def _events_query(
+        self, shipment_id: int, since: datetime, until: datetime
+    ) -> Select:
+        return (
+            select(shipment_event_table)
+            .where(
+                (shipment_event_table.c.shipment_id == shipment_id)
+                & (shipment_event_table.c.created_at >= since)
+                & (shipment_event_table.c.created_at <= until)
+            )
+            .order_by(shipment_event_table.c.created_at, shipment_event_table.c.id)
+        )
+
+    def _archive_query(
+        self, statuses: Iterable[ShipmentStatus], before: datetime, limit: int
+    ) -> Select:
+        batch = (
+            select(shipment_table.c.id)
+            .where(
+                shipment_table.c.status.in_(list(statuses)),
+                shipment_table.c.last_updated < before,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(shipment_table)
+            .where(shipment_table.c.id.in_(batch.scalar_subquery()))
+            .returning(*shipment_table.c)
+            .cte("moved")
+        )
+        moved_packages = (
+            delete(packages_table)
+            .where(packages_table.c.id.in_(select(moved.c.id)))
+            .returning(*packages_table.c)
+            .cte("moved_packages")
+        )
+        archived_packages = (
+            insert(package_archive_table)
+            .from_select(list(packages_table.c.keys()), select(moved_packages))
+            .cte("archived_packages")
+        )
+        archived = (
+            insert(shipment_archive_table)
+            .from_select(list(shipment_table.c.keys()), select(moved))
+            .returning(shipment_archive_table.c.id)
+            .cte("archived")
+        )
+        return select(archived.c.id).add_cte(archived_packages)
+
+    def _stats_query(
+        self, since: date | None, until: date | None, materialized: bool
+    ) -> Select:
+        if materialized:
+            daily = shipment_daily_stats
+            query = select(daily)
+            if since is not None:
+                query = query.where(daily.c.day >= since)
+            if until is not None:
+                query = query.where(daily.c.day <= until)
+            daily = query.subquery("daily")
+        else:
+            daily = daily_stats_query(since, until).subquery("daily")
+        grouping = func.grouping(daily.c.status, daily.c.courier_id, daily.c.day)
+        return select(
+            # The bits of GROUPING are set for the columns not grouped by.
+            case(
+                (grouping == 0b011, "status"),
+                (grouping == 0b101, "courier"),
+                (grouping == 0b110, "day"),
+                else_="total",
+            ).label("dimension"),
+            daily.c.status,
+            daily.c.courier_id,
+            daily.c.day,
+            cast(func.sum(daily.c.shipments), BigInteger).label("shipments"),
+            cast(
+                func.sum(daily.c.delivery_seconds)
+                / func.nullif(func.sum(daily.c.delivered), 0),
+                Float,
+            ).label("average_delivery_seconds"),
+        ).group_by(
+            func.grouping_sets(
+                tuple_(daily.c.status),
+                tuple_(daily.c.courier_id),
+                tuple_(daily.c.day),
+                tuple_(),
+            )
+        )
+
+    def _shipments(self, include_archived: bool) -> FromClause:
+        """The method getting the shipments to read from.
+
+        Archived shipments are appended to the live ones with UNION ALL, which
+        the planner pushes filters and ordering into, so both tables are read
+        through their indexes.
+
+        Args:
+            include_archived (bool): Whether archived shipments are included.
+
+        Returns:
+            FromClause: The shipments table or the union with the archive.
+        """
+        if not include_archived:
+            return shipment_table
+        return union_all(
+            select(shipment_table),
+            select(*(shipment_archive_table.c[key] for key in shipment_table.c.keys())),
+        ).subquery("all_shipments")
+
+    def _joined_shipments_query(
+        self, shipments: FromClause = shipment_table
+    ) -> Select:
+        """The method building a query for shipments joined with parties' names.
+
+        Args:
+            shipments (FromClause): The shipments to read from.
+
+        Returns:
+            Select: The query selecting shipments with sender and recipient fullnames.
+        """
+        recipient_user = user_table.alias("recipient_user")
+        recipient_client = client_table.alias("recipient_client")
+
+        sender_fullname = func.concat_ws(
+            literal_column("' '"),
+            client_table.c.first_name,
+            client_table.c.last_name,
+        ).label("sender_fullname")
+
+        recipient_fullname = func.concat_ws(
+            literal_column("' '"),
+            recipient_client.c.first_name,
+            recipient_client.c.last_name,
+        ).label("recipient_fullname")
+
+        return select(
+            shipments,
+            sender_fullname,
+            recipient_fullname,
+        ).select_from(
+            shipments.outerjoin(user_table, shipments.c.sender_id == user_table.c.id)
+            .outerjoin(client_table, user_table.c.id == client_table.c.id)
+            .outerjoin(recipient_user, shipments.c.recipient_id == recipient_user.c.id)
+            .outerjoin(recipient_client, recipient_user.c.id == recipient_client.c.id)
+        )
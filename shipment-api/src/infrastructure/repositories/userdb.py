@@ -1,6 +1,6 @@
 """Module containing user repository implementation."""
 
-from typing import Any, Iterable
+from typing import Any, AsyncIterator, Iterable
 from uuid import UUID
 
 from sqlalchemy import delete, select, update
@@ -8,6 +8,7 @@ from sqlalchemy import delete, select, update
 from src.core.domain.user import User, UserIn
 from src.core.repositories.iuser import IUserRepository
 from src.db import database, user_table
+from src.infrastructure.repositories.pagination import paginate
 
 
 class UserRepository(IUserRepository):
@@ -25,11 +26,10 @@ class UserRepository(IUserRepository):
         query = (
             user_table.insert()
             .values(email=data.email, password=data.password, role=data.role)
-            .returning(user_table.c.id)
+            .returning(user_table)
         )
-        new_user_id = await database.execute(query)
-        user_record = await self.get_user_by_id(new_user_id)
-        return user_record if user_record else None
+        user_record = await database.fetch_one(query)
+        return User(**user_record) if user_record else None
 
     async def get_user_by_id(self, user_id: UUID) -> User | None:
         """The method getting user by provided id.
@@ -92,16 +92,52 @@ class UserRepository(IUserRepository):
         updated_user = await database.fetch_one(query)
         return User(**updated_user) if updated_user else None
 
-    async def get_all_users(self) -> Iterable[User]:
+    async def update_password(self, user_id: UUID, hashed_password: str) -> None:
+        """The method replacing the stored password hash of a user.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            hashed_password (str): The new password hash.
+        """
+        query = (
+            update(user_table)
+            .where(user_table.c.id == user_id)
+            .values(password=hashed_password)
+        )
+        await database.execute(query)
+
+    async def get_all_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[User]:
         """The method getting all users from database.
 
+        Args:
+            after_id (UUID | None): The id of the last user of the previous page.
+            limit (int | None): The maximum number of users.
+
         Returns:
-            Iterable[Any]: The user objects.
+            Iterable[Any]: The user objects ordered by id.
         """
-        query = select(user_table)
+        query = paginate(select(user_table), user_table.c.id, after_id, limit)
         users = await database.fetch_all(query)
         return [User(**user) for user in users]
 
+    async def iterate_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[User]:
+        """The method iterating over users with a database cursor.
+
+        Args:
+            after_id (UUID | None): Start after the user with this id.
+            limit (int | None): The maximum number of users.
+
+        Yields:
+            User: The user objects ordered by id.
+        """
+        query = paginate(select(user_table), user_table.c.id, after_id, limit)
+        async for user in database.iterate(query):
+            yield User(**user)
+
     async def get_users_by_role(self, role) -> Iterable[User]:
         """The method getting user by provided role.
 
@@ -0,0 +1,303 @@
+"""A module containing the courier assignment engine.
+
+Shipments waiting for pickup are split among couriers, each starting from
+its depot and taking at most its remaining capacity. A shipment costs the
+great-circle distance from the depot of its courier to its origin, and the
+total cost is minimized.
+
+Shipments are first assigned greedily to the nearest courier with capacity
+left, those which lose the most when their nearest courier is full (the
+largest regret) first. The assignment is then improved by local search:
+a shipment is moved to a courier with spare capacity, or two shipments of
+different couriers are swapped, the most improving move first, until no
+move helps or the time budget is spent.
+
+For every pair of couriers the cheapest shipment of the first one to hand
+over to the second one is kept in a matrix, together with the best move of
+every row, so a move only refreshes the rows and columns of the two
+couriers it changed.
+
+Assignment is CPU-bound, so it runs on the route planner thread pool.
+Callers hold `lock` from reading the spare capacities until the assignment
+is written, so runs of one process do not hand out the same capacity twice.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import numpy
+from haversine import Unit, haversine_vector
+
+from src.config import config
+from src.infrastructure.routing import planner
+
+UNASSIGNED = -1
+IMPROVEMENT_EPSILON = 1e-9
+
+lock = asyncio.Lock()
+
+
+@dataclass
+class Assignment:
+    """A computed assignment.
+
+    Attributes:
+        couriers (list[int]): Index of the courier of each shipment, or
+            UNASSIGNED if no courier had capacity left.
+        distances (list[float]): Distance in km from the depot of the courier
+            to each shipment, 0 for unassigned ones.
+        total_distance (float): Sum of the distances in km.
+        moves (int): Number of improving moves applied after the greedy step.
+        converged (bool): Whether local search ran until no move helped,
+            within the time budget.
+    """
+
+    couriers: list[int]
+    distances: list[float]
+    total_distance: float
+    moves: int
+    converged: bool
+
+
+class _RowMinima:
+    """The minimum of every row of a square matrix, kept as it changes."""
+
+    def __init__(self, matrix: numpy.ndarray) -> None:
+        self.matrix = matrix
+        self.columns = numpy.argmin(matrix, axis=1)
+        self.values = matrix[numpy.arange(len(matrix)), self.columns]
+
+    def changed(self, indices: list[int]) -> None:
+        """Update the minima after rows and columns of the matrix changed.
+
+        Only rows whose minimum was in a changed column are searched again,
+        the others are compared with the changed columns.
+
+        Args:
+            indices (list[int]): The changed rows and columns.
+        """
+        stale = numpy.isin(self.columns, indices)
+        stale[indices] = True
+        rows = numpy.flatnonzero(stale)
+        self.columns[rows] = numpy.argmin(self.matrix[rows], axis=1)
+        self.values[rows] = self.matrix[rows, self.columns[rows]]
+        rows = numpy.flatnonzero(~stale)
+        for index in indices:
+            values = self.matrix[rows, index]
+            better = values < self.values[rows]
+            self.values[rows[better]] = values[better]
+            self.columns[rows[better]] = index
+
+    def best(self) -> tuple[int, int, float]:
+        """Get the smallest element of the matrix.
+
+        Returns:
+            tuple[int, int, float]: Its row, column and value.
+        """
+        row = int(numpy.argmin(self.values))
+        return row, int(self.columns[row]), float(self.values[row])
+
+
+def cost_matrix(shipments: numpy.ndarray, depots: numpy.ndarray) -> numpy.ndarray:
+    """Calculate great-circle distances from every depot to every shipment.
+
+    Args:
+        shipments (numpy.ndarray): An (n, 2) array of shipment coordinates.
+        depots (numpy.ndarray): An (m, 2) array of depot coordinates.
+
+    Returns:
+        numpy.ndarray: An (n, m) array of distances in kilometers.
+    """
+    return haversine_vector(depots, shipments, Unit.KILOMETERS, comb=True)
+
+
+def greedy(costs: numpy.ndarray, capacities: numpy.ndarray) -> numpy.ndarray:
+    """Assign each shipment to the nearest courier with capacity left.
+
+    Args:
+        costs (numpy.ndarray): The (n, m) cost matrix.
+        capacities (numpy.ndarray): The number of shipments each courier
+            may take.
+
+    Returns:
+        numpy.ndarray: The courier index of each shipment, or UNASSIGNED.
+    """
+    count, size = costs.shape
+    couriers = numpy.full(count, UNASSIGNED)
+    remaining = numpy.maximum(capacities, 0).astype(int)
+    if not count or not remaining.sum():
+        return couriers
+    nearest = numpy.argmin(costs, axis=1)
+    nearest_costs = costs[numpy.arange(count), nearest]
+    if size > 1:
+        regret = numpy.partition(costs, 1, axis=1)[:, 1] - nearest_costs
+    else:
+        regret = numpy.zeros(count)
+    left = int(remaining.sum())
+    for shipment in numpy.lexsort((nearest_costs, -regret)):
+        courier = nearest[shipment]
+        if not remaining[courier]:
+            courier = int(
+                numpy.argmin(numpy.where(remaining > 0, costs[shipment], numpy.inf))
+            )
+        couriers[shipment] = courier
+        remaining[courier] -= 1
+        left -= 1
+        if not left:
+            break
+    return couriers
+
+
+def improve(
+    couriers: numpy.ndarray,
+    costs: numpy.ndarray,
+    capacities: numpy.ndarray,
+    deadline: float,
+) -> tuple[int, bool]:
+    """Improve an assignment in place by moving and swapping shipments.
+
+    Unassigned shipments are left out.
+
+    Args:
+        couriers (numpy.ndarray): The courier index of each shipment.
+        costs (numpy.ndarray): The (n, m) cost matrix.
+        capacities (numpy.ndarray): The number of shipments each courier
+            may take.
+        deadline (float): The `time.perf_counter()` value to stop at.
+
+    Returns:
+        tuple[int, bool]: The number of moves applied and whether no
+            improving move is left.
+    """
+    size = costs.shape[1]
+    assigned = numpy.flatnonzero(couriers != UNASSIGNED)
+    spare = capacities - numpy.bincount(couriers[assigned], minlength=size)
+    order = assigned[numpy.argsort(couriers[assigned], kind="stable")]
+    bounds = numpy.searchsorted(couriers[order], numpy.arange(size + 1))
+    members = [order[bounds[courier] : bounds[courier + 1]] for courier in range(size)]
+
+    # gains[a, b] is the cost change of handing the shipment handover[a, b]
+    # of courier a over to courier b.
+    gains = numpy.full((size, size), numpy.inf)
+    handover = numpy.full((size, size), UNASSIGNED)
+    columns = numpy.arange(size)
+
+    def refresh(courier: int) -> None:
+        shipments = members[courier]
+        if not len(shipments):
+            gains[courier] = numpy.inf
+            return
+        delta = costs[shipments] - costs[shipments, courier][:, None]
+        best = numpy.argmin(delta, axis=0)
+        gains[courier] = delta[best, columns]
+        handover[courier] = shipments[best]
+        gains[courier, courier] = numpy.inf
+
+    for courier in range(size):
+        refresh(courier)
+    swaps = gains + gains.T
+    relocations = numpy.where(spare > 0, gains, numpy.inf)
+    swap_minima, relocation_minima = _RowMinima(swaps), _RowMinima(relocations)
+
+    moves = 0
+    while True:
+        if time.perf_counter() > deadline:
+            return moves, False
+        *swap, swap_gain = swap_minima.best()
+        *relocation, relocation_gain = relocation_minima.best()
+        if min(relocation_gain, swap_gain) >= -IMPROVEMENT_EPSILON:
+            return moves, True
+        if relocation_gain <= swap_gain:
+            source, target = relocation
+            shipment = handover[source, target]
+            couriers[shipment] = target
+            members[source] = members[source][members[source] != shipment]
+            members[target] = numpy.append(members[target], shipment)
+            spare[source] += 1
+            spare[target] -= 1
+        else:
+            source, target = swap
+            first, second = handover[source, target], handover[target, source]
+            couriers[first], couriers[second] = target, source
+            members[source][members[source] == first] = second
+            members[target][members[target] == second] = first
+        for courier in (source, target):
+            refresh(courier)
+        for courier in (source, target):
+            swaps[courier] = gains[courier] + gains[:, courier]
+            swaps[:, courier] = swaps[courier]
+            relocations[courier] = numpy.where(spare > 0, gains[courier], numpy.inf)
+            relocations[:, courier] = (
+                gains[:, courier] if spare[courier] > 0 else numpy.inf
+            )
+        swap_minima.changed([source, target])
+        relocation_minima.changed([source, target])
+        moves += 1
+
+
+def assign(
+    shipments: numpy.ndarray,
+    depots: numpy.ndarray,
+    capacities: numpy.ndarray,
+    time_budget: float,
+) -> Assignment:
+    """Assign shipments to couriers.
+
+    Args:
+        shipments (numpy.ndarray): An (n, 2) array of shipment coordinates.
+        depots (numpy.ndarray): An (m, 2) array of courier depot coordinates.
+        capacities (numpy.ndarray): The number of shipments each courier
+            may take.
+        time_budget (float): Seconds available for local search.
+
+    Returns:
+        Assignment: The computed assignment.
+    """
+    deadline = time.perf_counter() + time_budget
+    if not len(shipments) or not len(depots):
+        return Assignment(
+            couriers=[UNASSIGNED] * len(shipments),
+            distances=[0.0] * len(shipments),
+            total_distance=0.0,
+            moves=0,
+            converged=True,
+        )
+    costs = cost_matrix(shipments, depots)
+    capacities = numpy.maximum(numpy.asarray(capacities, dtype=int), 0)
+    couriers = greedy(costs, capacities)
+    moves, converged = improve(couriers, costs, capacities, deadline)
+    assigned = couriers != UNASSIGNED
+    distances = numpy.zeros(len(couriers))
+    distances[assigned] = costs[assigned, couriers[assigned]]
+    return Assignment(
+        couriers=couriers.tolist(),
+        distances=numpy.round(distances, 2).tolist(),
+        total_distance=round(float(distances.sum()), 2),
+        moves=moves,
+        converged=converged,
+    )
+
+
+async def assign_async(
+    shipments: numpy.ndarray,
+    depots: numpy.ndarray,
+    capacities: numpy.ndarray,
+    time_budget: float = config.ASSIGNMENT_TIME_BUDGET,
+) -> Assignment:
+    """Assign shipments to couriers on the route planner thread pool.
+
+    Args:
+        shipments (numpy.ndarray): An (n, 2) array of shipment coordinates.
+        depots (numpy.ndarray): An (m, 2) array of courier depot coordinates.
+        capacities (numpy.ndarray): The number of shipments each courier
+            may take.
+        time_budget (float): Seconds available for local search.
+
+    Returns:
+        Assignment: The computed assignment.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        planner.executor, assign, shipments, depots, capacities, time_budget
+    )
@@ -0,0 +1,233 @@
+"""A module containing the courier route planner.
+
+A route starts at the courier location and visits every stop once. Some
+stops must be visited after another one (a parcel is delivered only after
+it was picked up). The route is built greedily by nearest neighbour and
+then improved by 2-opt segment reversals until no reversal shortens it or
+the time budget is spent.
+
+Planning is CPU-bound, so it runs on a small dedicated thread pool instead
+of the event loop.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy
+from haversine import Unit, haversine_vector
+
+from src.config import config
+
+NO_PREDECESSOR = -1
+IMPROVEMENT_EPSILON = 1e-9
+
+executor = ThreadPoolExecutor(
+    max_workers=config.ROUTE_PLANNER_MAX_WORKERS,
+    thread_name_prefix="route-planner",
+)
+
+
+@dataclass
+class Route:
+    """A planned route.
+
+    Attributes:
+        order (list[int]): Indices of the stops in visiting order.
+        legs (list[float]): Distance in km from the previous stop (or the
+            start) to each stop of `order`.
+        total_distance (float): Length of the route in km.
+        converged (bool): Whether 2-opt ran until no reversal helped,
+            within the time budget.
+    """
+
+    order: list[int]
+    legs: list[float]
+    total_distance: float
+    converged: bool
+
+
+def distance_matrix(coords: numpy.ndarray) -> numpy.ndarray:
+    """Calculate great-circle distances between all pairs of points.
+
+    Args:
+        coords (numpy.ndarray): An (n, 2) array of latitudes and longitudes.
+
+    Returns:
+        numpy.ndarray: An (n, n) array of distances in kilometers.
+    """
+    return haversine_vector(coords, coords, Unit.KILOMETERS, comb=True)
+
+
+def _successors(predecessors: numpy.ndarray) -> numpy.ndarray:
+    """Map each node to the node that must follow it, or NO_PREDECESSOR."""
+    successors = numpy.full(len(predecessors) + 1, NO_PREDECESSOR)
+    has_predecessor = predecessors != NO_PREDECESSOR
+    successors[predecessors[has_predecessor] + 1] = (
+        numpy.flatnonzero(has_predecessor) + 1
+    )
+    return successors
+
+
+def _blocking(route: numpy.ndarray, successors: numpy.ndarray) -> numpy.ndarray:
+    """Get the route position of the successor of each route position.
+
+    Positions without a successor get the route length.
+    """
+    size = len(route)
+    positions = numpy.empty(size, dtype=int)
+    positions[route] = numpy.arange(size)
+    following = successors[route]
+    return numpy.where(following >= 0, positions[following], size)
+
+
+def nearest_neighbour(
+    distances: numpy.ndarray, predecessors: numpy.ndarray
+) -> numpy.ndarray:
+    """Build a route by always moving to the nearest available stop.
+
+    Args:
+        distances (numpy.ndarray): The (n + 1, n + 1) distance matrix, with
+            the start point at index 0 and stop `k` at index `k + 1`.
+        predecessors (numpy.ndarray): For each stop, the index of the stop
+            that must be visited before it, or NO_PREDECESSOR. A stop is the
+            predecessor of at most one other stop.
+
+    Returns:
+        numpy.ndarray: Node indices of the route, starting with 0.
+    """
+    count = len(predecessors)
+    successors = _successors(predecessors)
+    # Added to the distances from the current stop, so that visited stops
+    # and stops waiting for their predecessor are never the nearest.
+    blocked = numpy.zeros(count + 1)
+    blocked[0] = numpy.inf
+    blocked[1:][predecessors != NO_PREDECESSOR] = numpy.inf
+
+    route = numpy.empty(count + 1, dtype=int)
+    route[0] = current = 0
+    for position in range(1, count + 1):
+        current = int(numpy.argmin(distances[current] + blocked))
+        route[position] = current
+        blocked[current] = numpy.inf
+        successor = successors[current]
+        if successor != NO_PREDECESSOR:
+            blocked[successor] = 0.0
+    return route
+
+
+def two_opt(
+    route: numpy.ndarray,
+    distances: numpy.ndarray,
+    predecessors: numpy.ndarray,
+    deadline: float,
+) -> bool:
+    """Improve an open route in place by reversing segments.
+
+    A segment is reversed only when it does not contain both stops of a
+    precedence pair, so every stop stays after its predecessor.
+
+    Args:
+        route (numpy.ndarray): Node indices of the route, starting with 0.
+        distances (numpy.ndarray): The distance matrix.
+        predecessors (numpy.ndarray): Precedence of stops, as in
+            `nearest_neighbour`.
+        deadline (float): The `time.perf_counter()` value to stop at.
+
+    Returns:
+        bool: True if no improving reversal is left, False if the deadline
+            was reached first.
+    """
+    size = len(route)
+    successors = _successors(predecessors)
+
+    improved = True
+    while improved:
+        improved = False
+        blocking = _blocking(route, successors)
+        for start in range(1, size - 1):
+            if time.perf_counter() > deadline:
+                return False
+            # A segment [start, end] is valid while no stop in it has its
+            # successor inside it as well.
+            limit = numpy.minimum.accumulate(blocking[start:])
+            ends = numpy.arange(start + 1, size)
+            ends = ends[: int(numpy.count_nonzero(ends < limit[1:]))]
+            if not len(ends):
+                continue
+            before, first = route[start - 1], route[start]
+            lasts = route[ends]
+            afters = route[numpy.minimum(ends + 1, size - 1)]
+            is_tail = ends == size - 1
+            gain = (
+                distances[before, lasts]
+                - distances[before, first]
+                + numpy.where(
+                    is_tail, 0.0, distances[first, afters] - distances[lasts, afters]
+                )
+            )
+            best = int(numpy.argmin(gain))
+            if gain[best] < -IMPROVEMENT_EPSILON:
+                end = int(ends[best])
+                route[start : end + 1] = route[start : end + 1][::-1].copy()
+                blocking = _blocking(route, successors)
+                improved = True
+    return True
+
+
+def plan(
+    start: tuple[float, float],
+    stops: numpy.ndarray,
+    predecessors: numpy.ndarray,
+    time_budget: float,
+) -> Route:
+    """Plan a route visiting all stops from the start point.
+
+    Args:
+        start (tuple[float, float]): Latitude and longitude of the courier.
+        stops (numpy.ndarray): An (n, 2) array of stop coordinates.
+        predecessors (numpy.ndarray): For each stop, the index of the stop
+            that must be visited before it, or NO_PREDECESSOR.
+        time_budget (float): Seconds available for 2-opt improvement.
+
+    Returns:
+        Route: The planned route.
+    """
+    deadline = time.perf_counter() + time_budget
+    if not len(stops):
+        return Route(order=[], legs=[], total_distance=0.0, converged=True)
+    points = numpy.vstack([numpy.asarray(start, dtype=float), stops])
+    distances = distance_matrix(points)
+    route = nearest_neighbour(distances, predecessors)
+    converged = two_opt(route, distances, predecessors, deadline)
+    legs = distances[route[:-1], route[1:]]
+    return Route(
+        order=(route[1:] - 1).tolist(),
+        legs=numpy.round(legs, 2).tolist(),
+        total_distance=round(float(legs.sum()), 2),
+        converged=converged,
+    )
+
+
+async def plan_async(
+    start: tuple[float, float],
+    stops: numpy.ndarray,
+    predecessors: numpy.ndarray,
+    time_budget: float = config.ROUTE_PLANNER_TIME_BUDGET,
+) -> Route:
+    """Plan a route on the planner thread pool.
+
+    Args:
+        start (tuple[float, float]): Latitude and longitude of the courier.
+        stops (numpy.ndarray): An (n, 2) array of stop coordinates.
+        predecessors (numpy.ndarray): Precedence of stops, as in `plan`.
+        time_budget (float): Seconds available for 2-opt improvement.
+
+    Returns:
+        Route: The planned route.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, plan, start, stops, predecessors, time_budget
+    )
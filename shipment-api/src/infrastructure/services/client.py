@@ -1,6 +1,6 @@
 """Module containing client service implementation."""
 
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import ClientIn, UserIn
@@ -40,14 +40,11 @@ class ClientService(IClientService):
             record = await self._repository.register_client(client, user.id)
             if not record:
                 raise ValueError("Failed to register the client. Please try again.")
-            try:
-                await self._email_service.send_welcome_email(
-                    user_email=record["email"],
-                    first_name=record["first_name"],
-                    address=record["address"],
-                )
-            except Exception as e:
-                raise ValueError(f"Failed to send email: {str(e)}")
+            await self._email_service.send_welcome_email(
+                user_email=record["email"],
+                first_name=record["first_name"],
+                address=record["address"],
+            )
             return ClientDTO.from_record(record)
 
     async def get_client(self, user_id: UUID) -> ClientDTO:
@@ -71,7 +68,18 @@ class ClientService(IClientService):
             raise ValueError(f"No client found with the provided user_id: {user_id}")
         return ClientDTO.from_record(record)
 
-    async def get_all_clients(self) -> Iterable[ClientDTO]:
-        """Get all clients from repository and return DTOs."""
-        records = await self._repository.get_all_clients()
+    async def get_all_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[ClientDTO]:
+        """Get a page of clients from repository and return DTOs."""
+        records = await self._repository.get_all_clients(
+            after_id=after_id, limit=limit
+        )
         return [ClientDTO.from_record(record) for record in records] if records else []
+
+    async def iterate_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[ClientDTO]:
+        """Iterate over clients from repository as DTOs."""
+        async for record in self._repository.iterate_clients(after_id, limit):
+            yield ClientDTO.from_record(record)
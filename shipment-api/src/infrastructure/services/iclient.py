@@ -1,7 +1,7 @@
 """Module containing client service abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import ClientIn, UserIn
@@ -59,9 +59,29 @@ class IClientService(ABC):
         """
 
     @abstractmethod
-    async def get_all_clients(self) -> Iterable[ClientDTO]:
-        """Get all clients.
+    async def get_all_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[ClientDTO]:
+        """Get a page of clients ordered by id.
+
+        Args:
+            after_id (UUID | None): The id of the last client of the previous page.
+            limit (int | None): The maximum number of clients.
 
         Returns:
             Iterable[ClientDTO]: The client objects DTO details.
         """
+
+    @abstractmethod
+    def iterate_clients(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[ClientDTO]:
+        """Iterate over clients ordered by id.
+
+        Args:
+            after_id (UUID | None): Start after the client with this id.
+            limit (int | None): The maximum number of clients.
+
+        Yields:
+            ClientDTO: The client DTO details.
+        """
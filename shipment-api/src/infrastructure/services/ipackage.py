@@ -1,11 +1,11 @@
 """Module containing package service abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.shipment import Package, PackageIn, ShipmentIn
-from src.infrastructure.dto.shipmentDTO import PackageDTO
+from src.infrastructure.dto.shipmentDTO import BulkItemResultDTO, PackageDTO
 
 
 class IPackageService(ABC):
@@ -17,13 +17,27 @@ class IPackageService(ABC):
     ) -> PackageDTO | None:
         """Add a new package to the data storage."""
 
+    @abstractmethod
+    async def add_packages_with_shipments(
+        self, rows: Iterable[dict], user_id: UUID
+    ) -> list[BulkItemResultDTO]:
+        """Add packages with shipments in bulk, returning per-row results."""
+
     @abstractmethod
     async def get_package_by_id(self, package_id: int) -> PackageDTO | None:
         """Get package by provided id (shipment_id)."""
 
     @abstractmethod
-    async def get_all_packages(self) -> Iterable[Any]:
-        """Get all packages from data storage."""
+    async def get_all_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> Iterable[PackageDTO]:
+        """Get a page of packages from data storage, ordered by id."""
+
+    @abstractmethod
+    def iterate_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> AsyncIterator[PackageDTO]:
+        """Iterate over packages in data storage ordered by id."""
 
     @abstractmethod
     async def update_package(self, package_id: int, data: Package) -> PackageDTO | None:
@@ -1,17 +1,27 @@
 """Module containing shipment service abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.location import Location
 from src.core.domain.shipment import (
+    CourierDepot,
+    ResolvedAddress,
+    ResolvedShipment,
     Shipment,
     ShipmentIn,
     ShipmentStatus,
 )
+from src.infrastructure.cache.tracking import TrackingEntry
 from src.infrastructure.dto.shipmentDTO import (
+    AssignmentDTO,
+    CourierWorkloadDTO,
+    RouteDTO,
     ShipmentDTO,
+    ShipmentEventDTO,
+    ShipmentStatsDTO,
     ShipmentWithDistanceDTO,
 )
 
@@ -35,51 +45,205 @@ class IShipmentService(ABC):
 
     @abstractmethod
     async def update_status(
-        self, shipment_id: int, new_status: ShipmentStatus
+        self,
+        shipment_id: int,
+        new_status: ShipmentStatus,
+        actor_id: UUID | None = None,
+        coords: tuple[float, float] | None = None,
     ) -> ShipmentDTO | None:
         """The abstract changing shipment status by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
             new_status (ShipmentStatus): The new status.
+            actor_id (UUID | None): The id of the user changing the status.
+            coords (tuple[float, float] | None): Where the status changed.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if updated.
         """
 
+    @abstractmethod
+    async def get_timeline(self, shipment_id: int) -> list[ShipmentEventDTO] | None:
+        """The abstract getting the status history of a shipment.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+
+        Returns:
+            list[ShipmentEventDTO] | None: The events in chronological order
+                if the shipment exists.
+        """
+
+    @abstractmethod
+    async def get_stats(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+        live: bool = False,
+    ) -> ShipmentStatsDTO:
+        """The abstract getting aggregated shipment statistics.
+
+        Args:
+            since (date | None): The first day of creation, unbounded if None.
+            until (date | None): The last day of creation, unbounded if None.
+            live (bool): Whether to compute the statistics from the shipments.
+
+        Returns:
+            ShipmentStatsDTO: The statistics by status, courier and day.
+        """
+
+    @abstractmethod
+    async def refresh_stats(self) -> None:
+        """The abstract refreshing the materialized shipment statistics."""
+
+    @abstractmethod
+    async def assign_automatically(
+        self, couriers: list[CourierDepot], limit: int | None = None
+    ) -> AssignmentDTO:
+        """The abstract assigning the oldest unassigned shipments to couriers.
+
+        Args:
+            couriers (list[CourierDepot]): The couriers and their depots.
+            limit (int | None): The maximum number of shipments, by default
+                `ASSIGNMENT_BATCH_SIZE`.
+
+        Returns:
+            AssignmentDTO: The assigned and left out shipments.
+        """
+
+    @abstractmethod
+    async def rebuild_workload(self) -> None:
+        """The abstract loading the courier workload counters."""
+
+    @abstractmethod
+    async def reconcile_workload(self) -> dict | None:
+        """The abstract reconciling the courier workload counters.
+
+        Returns:
+            dict | None: The drifted counts per courier, None if skipped.
+        """
+
+    @abstractmethod
+    def get_workload(self, courier_id: UUID | None = None) -> list[CourierWorkloadDTO]:
+        """The abstract getting the active shipment counts of couriers.
+
+        Args:
+            courier_id (UUID | None): The id of the courier, all if None.
+
+        Returns:
+            list[CourierWorkloadDTO]: The workloads, busiest first.
+        """
+
     @abstractmethod
     async def check_status(
-        self, shipment_id: int, recipient_email: str
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
     ) -> ShipmentDTO | None:
         """The abstract getting shipment by provided id and recipient email.
 
         Args:
             shipment_id (int): The id of the shipment.
             recipient_email (str): The email of the Recipient.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if exists.
         """
 
     @abstractmethod
-    async def get_shipment_by_id(self, shipment_id: int) -> ShipmentDTO | None:
+    async def get_tracking(
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
+    ) -> TrackingEntry | None:
+        """The abstract getting the serialized tracking response of a shipment.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            recipient_email (str): The email of the Recipient.
+            include_archived (bool): Whether archived shipments are searched too.
+
+        Returns:
+            TrackingEntry | None: The serialized shipment and its ETag if exists.
+        """
+
+    @abstractmethod
+    async def get_shipment_by_id(
+        self, shipment_id: int, include_archived: bool = False
+    ) -> ShipmentDTO | None:
         """The abstract getting shipment by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if exists.
         """
 
     @abstractmethod
-    async def get_all_shipments(self) -> Iterable[ShipmentDTO]:
+    async def get_all_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[ShipmentDTO]:
         """The abstract getting all shipment from the repository.
 
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient. Combined with
+                sender_id, shipments sent by or addressed to the client match.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
+
         Returns:
             Iterable[ShipmentDTO]: The collection of the shipments.
         """
 
+    @abstractmethod
+    def iterate_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        include_archived: bool = False,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[ShipmentDTO]:
+        """The abstract iterating over shipments from the repository.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            include_archived (bool): Whether archived shipments are listed too.
+            after_id (int | None): Start after the shipment with this id.
+            limit (int | None): The maximum number of shipments.
+
+        Yields:
+            ShipmentDTO: The shipment DTO details.
+        """
+
+    @abstractmethod
+    async def archive_shipments(self, before: datetime, batch_size: int) -> int:
+        """The abstract moving terminal shipments to the archive.
+
+        Args:
+            before (datetime): Shipments last updated before are archived.
+            batch_size (int): The number of shipments moved per statement.
+
+        Returns:
+            int: The number of archived shipments.
+        """
+
     @abstractmethod
     async def add_shipment(
         self, shipment: ShipmentIn, user_id: UUID
@@ -93,19 +257,135 @@ class IShipmentService(ABC):
             ShipmentDTO | None: The newly added shipment DTO details if added.
         """
 
+    @abstractmethod
+    async def resolve_addresses(
+        self,
+        locations: list[tuple[Location, tuple[float, float] | None]],
+        known: Iterable[ResolvedAddress] = (),
+    ) -> list[ResolvedAddress | None]:
+        """The abstract resolving locations to stored addresses and coordinates.
+
+        Args:
+            locations (list[tuple[Location, tuple[float, float] | None]]):
+                The locations with their coordinates, if given.
+            known (Iterable[ResolvedAddress]): Addresses resolved before.
+
+        Raises:
+            GeocoderServiceError: If the geocoder is unavailable.
+
+        Returns:
+            list[ResolvedAddress | None]: The resolved addresses, None where a
+                location could not be geocoded.
+        """
+
+    @abstractmethod
+    async def resolve_shipment(self, data: ShipmentIn) -> ResolvedShipment:
+        """The abstract resolving both ends of a shipment.
+
+        Args:
+            data (ShipmentIn): The shipment input data.
+
+        Raises:
+            ValueError: If an address cannot be found.
+
+        Returns:
+            ResolvedShipment: The resolved shipment.
+        """
+
+    @abstractmethod
+    async def add_resolved_shipment(
+        self, shipment: ResolvedShipment, user_id: UUID
+    ) -> ShipmentDTO | None:
+        """The abstract adding a resolved shipment to the repository.
+
+        Args:
+            shipment (ResolvedShipment): The resolved shipment.
+            user_id (UUID): UUID of the user(sender).
+
+        Returns:
+            ShipmentDTO | None: The newly added shipment DTO details if added.
+        """
+
+    @abstractmethod
+    async def resolve_shipments(
+        self, shipments: list[ShipmentIn]
+    ) -> list[ResolvedShipment | None]:
+        """The abstract resolving both ends of many shipments.
+
+        Args:
+            shipments (list[ShipmentIn]): The shipment input data.
+
+        Returns:
+            list[ResolvedShipment | None]: The resolved shipments, None where
+                an address could not be geocoded.
+        """
+
+    @abstractmethod
+    async def add_shipments(
+        self, shipments: list[ResolvedShipment], user_id: UUID
+    ) -> list[int]:
+        """The abstract bulk adding resolved shipments to the repository.
+
+        Args:
+            shipments (list[ResolvedShipment]): The resolved shipments.
+            user_id (UUID): UUID of the user(sender).
+
+        Returns:
+            list[int]: The ids of the added shipments, in the input order.
+        """
+
     @abstractmethod
     async def sort_by_distance(
-        self, courier_id: UUID, courier_location: Location
+        self, courier_id: UUID, courier_location: Location, limit: int | None = None
     ) -> Iterable[ShipmentWithDistanceDTO]:
         """The abstract sorting shipments by destination distance from courier.
 
         Args:
+            courier_id (UUID): The id of the courier.
             courier_location (Location): Location of courier.
+            limit (int | None): Return only the nearest `limit` shipments.
 
         Returns:
             Iterable[ShipmentWithDistanceDTO]: Shipments with distance attribute sorted collection.
         """
 
+    @abstractmethod
+    async def get_nearby_shipments(
+        self,
+        coords: tuple[float, float],
+        radius: float,
+        end: str = "origin",
+        statuses: Iterable[ShipmentStatus] | None = None,
+        limit: int | None = None,
+    ) -> list[ShipmentWithDistanceDTO]:
+        """The abstract getting unassigned shipments within a radius of a point.
+
+        Args:
+            coords (tuple[float, float]): Latitude and longitude of the point.
+            radius (float): The radius in kilometers.
+            end (str): "origin" or "destination", the end to measure from.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by,
+                the ones waiting for a courier if None.
+            limit (int | None): Return only the nearest `limit` shipments.
+
+        Returns:
+            list[ShipmentWithDistanceDTO]: Shipments sorted by distance.
+        """
+
+    @abstractmethod
+    async def plan_route(
+        self, courier_id: UUID, courier_location: Location
+    ) -> RouteDTO | None:
+        """The abstract planning the visiting order of courier's shipments.
+
+        Args:
+            courier_id (UUID): The id of the courier.
+            courier_location (Location): Location of courier.
+
+        Returns:
+            RouteDTO | None: The planned route if the courier has shipments.
+        """
+
     @abstractmethod
     async def delete_shipment(self, shipment_id: int) -> dict | None:
         """The abstract deleting shipment by provided id.
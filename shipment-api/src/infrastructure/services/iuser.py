@@ -2,7 +2,7 @@
 
 # pylint: disable=redefined-outer-name
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import User, UserIn, UserUpdate
@@ -82,13 +82,33 @@ class IUserService(ABC):
         """
 
     @abstractmethod
-    async def get_all_users(self) -> Iterable[UserDTO]:
+    async def get_all_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[UserDTO]:
         """The abstract getting all users.
 
+        Args:
+            after_id (UUID | None): The id of the last user of the previous page.
+            limit (int | None): The maximum number of users.
+
         Returns:
             Iterable[UserDTO]: The user objects DTO details.
         """
 
+    @abstractmethod
+    def iterate_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[UserDTO]:
+        """The abstract iterating over users ordered by id.
+
+        Args:
+            after_id (UUID | None): Start after the user with this id.
+            limit (int | None): The maximum number of users.
+
+        Yields:
+            UserDTO: The user DTO details.
+        """
+
     @abstractmethod
     async def get_users_by_role(self, role) -> Iterable[UserDTO]:
         """The method getting user by provided role.
@@ -1,12 +1,22 @@
 """A class representing package service."""
 
-from typing import Any, Iterable
+from typing import Any, AsyncIterator, Iterable
 from uuid import UUID
 
-from src.core.domain.shipment import Package, PackageIn, ShipmentIn
+from geopy.exc import GeocoderServiceError
+from pydantic import ValidationError
+
+from src.core.domain.shipment import (
+    Package,
+    PackageIn,
+    ShipmentBulkItem,
+    ShipmentIn,
+)
 from src.core.repositories.ipackage import IPackageRepository
 from src.db import database
+from src.infrastructure.dto.shipmentDTO import BulkItemResultDTO, PackageDTO
 from src.infrastructure.external.email.email_service import EmailService
+from src.infrastructure.external.geolocation.ratelimit import Priority, prioritized
 from src.infrastructure.services.ipackage import IPackageService
 from src.infrastructure.services.ishipment import IShipmentService
 
@@ -24,30 +34,98 @@ class PackageService(IPackageService):
     async def add_package_with_shipment(
         self, data: PackageIn, shipment_data: ShipmentIn, user_id: UUID
     ) -> Any | None:
+        # Addresses are geocoded before the transaction, so no connection is
+        # held while the geocoder is waited for.
+        try:
+            resolved = await self._shipment_service.resolve_shipment(shipment_data)
+        except GeocoderServiceError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Shipment add failed: {str(e)}")
         async with database.transaction():
             try:
-                shipment = await self._shipment_service.add_shipment(
-                    shipment_data, user_id
+                shipment = await self._shipment_service.add_resolved_shipment(
+                    resolved, user_id
                 )
             except Exception as e:
                 raise ValueError(f"Shipment add failed: {str(e)}")
             package = await self._repository.add_package(data, shipment.id)
             if not package:
                 raise ValueError("Failed to add package. Try again later.")
-            try:
-                if shipment_data.recipient_email:
-                    await self._email_service.send_package_created_email(
-                        shipment_data.recipient_email, shipment.id
-                    )
-            except Exception as e:
-                print(f"Email sending failed: {str(e)}")
+            if shipment_data.recipient_email:
+                await self._email_service.send_package_created_email(
+                    shipment_data.recipient_email, shipment.id
+                )
             return package
 
+    async def add_packages_with_shipments(
+        self, rows: Iterable[dict], user_id: UUID
+    ) -> list[BulkItemResultDTO]:
+        """Add packages with shipments in bulk, returning per-row results.
+
+        Invalid rows and rows whose address cannot be geocoded are reported
+        and skipped; the others are loaded in one transaction, with their
+        notifications queued in the same transaction. Addresses are geocoded
+        behind interactive requests.
+        """
+        results = []
+        items = []
+        for index, row in enumerate(rows):
+            results.append(BulkItemResultDTO(index=index))
+            try:
+                items.append((index, ShipmentBulkItem.model_validate(row)))
+            except ValidationError as e:
+                results[index].error = "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors()
+                )
+
+        with prioritized(Priority.BULK):
+            shipments = await self._shipment_service.resolve_shipments(
+                [item.shipment for _, item in items]
+            )
+        loaded = []
+        for (index, item), shipment in zip(items, shipments):
+            if shipment is None:
+                results[index].error = "Address not found"
+            else:
+                loaded.append((index, shipment, item.package))
+
+        async with database.transaction():
+            ids = await self._shipment_service.add_shipments(
+                [shipment for _, shipment, _ in loaded], user_id
+            )
+            await self._repository.add_packages(
+                [
+                    (shipment_id, package)
+                    for shipment_id, (_, _, package) in zip(ids, loaded)
+                ]
+            )
+            await self._email_service.send_package_created_emails(
+                (shipment.data.recipient_email, shipment_id)
+                for shipment_id, (_, shipment, _) in zip(ids, loaded)
+                if shipment.data.recipient_email
+            )
+        for shipment_id, (index, _, _) in zip(ids, loaded):
+            results[index].shipment_id = shipment_id
+        return results
+
     async def get_package_by_id(self, package_id: int) -> Any | None:
         return await self._repository.get_package_by_id(package_id)
 
-    async def get_all_packages(self) -> Iterable[Any]:
-        return await self._repository.get_all_packages()
+    async def get_all_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> Iterable[PackageDTO]:
+        packages = await self._repository.get_all_packages(
+            after_id=after_id, limit=limit
+        )
+        return [PackageDTO.from_record(package) for package in packages]
+
+    async def iterate_packages(
+        self, after_id: int | None = None, limit: int | None = None
+    ) -> AsyncIterator[PackageDTO]:
+        async for package in self._repository.iterate_packages(after_id, limit):
+            yield PackageDTO.from_record(package)
 
     async def update_package(self, package_id: int, data: Package) -> Any | None:
         return await self._repository.update_package(package_id, data)
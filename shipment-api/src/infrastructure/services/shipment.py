@@ -1,35 +1,75 @@
 """Module containing shipment service implementation."""
 
-from typing import Any, Iterable
+import asyncio
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable
 from uuid import UUID
 
+import numpy
+
+from src import spatial
+from src.config import config
 from src.core.domain.location import Location
 from src.core.domain.shipment import (
+    CourierDepot,
+    ResolvedAddress,
+    ResolvedShipment,
     Shipment,
     ShipmentIn,
     ShipmentStatus,
 )
 from src.core.repositories.ishipment import IShipmentRepository
+from src.db import (
+    ASSIGNABLE_SHIPMENT_STATUSES,
+    TERMINAL_SHIPMENT_STATUSES,
+    database,
+)
+from src.infrastructure.cache.tracking import (
+    TrackingCache,
+    TrackingEntry,
+    make_entry,
+)
+from src.infrastructure.cache.workload import WorkloadCounters
 from src.infrastructure.dto.shipmentDTO import (
+    AssignedShipmentDTO,
+    AssignmentDTO,
+    CourierWorkloadDTO,
+    RouteDTO,
+    RouteStopDTO,
     ShipmentDTO,
+    ShipmentEventDTO,
+    ShipmentStatsDTO,
     ShipmentWithDistanceDTO,
 )
 from src.infrastructure.external.email.email_service import EmailService
 from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.jobs import stats
+from src.infrastructure.routing import assignment, planner
 from src.infrastructure.services.ishipment import IShipmentService
 
+PICKUP_STATUSES = (ShipmentStatus.READY_FOR_PICKUP, ShipmentStatus.RETURNED_TO_SENDER)
+DELIVERY_STATUSES = (ShipmentStatus.OUT_FOR_DELIVERY, ShipmentStatus.FAILED_ATTEMPT)
+
 
 class ShipmentService(IShipmentService):
     """A class representing implementation of shipment-related services."""
 
     _repository: IShipmentRepository
     _email_service: EmailService
+    _tracking_cache: TrackingCache
+    _workload: WorkloadCounters
 
     def __init__(
-        self, repository: IShipmentRepository, email_service: EmailService
+        self,
+        repository: IShipmentRepository,
+        email_service: EmailService,
+        tracking_cache: TrackingCache,
+        workload: WorkloadCounters,
     ) -> None:
         self._repository = repository
         self._email_service = email_service
+        self._tracking_cache = tracking_cache
+        self._workload = workload
 
     async def assign_shipment_to_courier(
         self, shipment_id: int, courier_id: UUID
@@ -43,64 +83,318 @@ class ShipmentService(IShipmentService):
         Returns:
             ShipmentDTO | None: The shipment DTO details if updated.
         """
-        shipment = await self._repository.assign_shipment_to_courier(
-            shipment_id, courier_id
-        )
+        with self._workload.writing():
+            shipment = await self._repository.assign_shipment_to_courier(
+                shipment_id, courier_id
+            )
+            if shipment:
+                self._workload.move(
+                    (shipment["previous_courier_id"], shipment["status"]),
+                    (shipment["courier_id"], shipment["status"]),
+                )
+        self._tracking_cache.invalidate(shipment_id)
         return ShipmentDTO.from_record(shipment) if shipment else None
 
+    async def assign_automatically(
+        self, couriers: list[CourierDepot], limit: int | None = None
+    ) -> AssignmentDTO:
+        """The method assigning the oldest unassigned shipments to couriers.
+
+        Shipments waiting for pickup are split among the couriers by the
+        assignment engine, see `src.infrastructure.routing.assignment`. Each
+        courier takes at most its capacity less its unfinished shipments,
+        pending ones included, read from the workload counters. The
+        assignments are written by one batched update, which skips shipments
+        assigned or advanced meanwhile. Shipments without origin coordinates,
+        left over or skipped are unassigned.
+
+        Runs of this process are serialized, so each one reads the counters
+        moved by the previous one. Runs of other worker processes are not,
+        and may fill the same spare capacity until the counters are
+        reconciled; this is a known limit.
+
+        Args:
+            couriers (list[CourierDepot]): The couriers and their depots.
+            limit (int | None): The maximum number of shipments, by default
+                `ASSIGNMENT_BATCH_SIZE`.
+
+        Returns:
+            AssignmentDTO: The assigned and left out shipments.
+        """
+        async with assignment.lock:
+            return await self._assign_automatically(couriers, limit)
+
+    async def _assign_automatically(
+        self, couriers: list[CourierDepot], limit: int | None
+    ) -> AssignmentDTO:
+        depots = list({courier.courier_id: courier for courier in couriers}.values())
+        shipments = await self._repository.get_unassigned_shipments(
+            ASSIGNABLE_SHIPMENT_STATUSES, limit or config.ASSIGNMENT_BATCH_SIZE
+        )
+        located = [
+            shipment
+            for shipment in shipments
+            if None not in (shipment["origin_latitude"], shipment["origin_longitude"])
+        ]
+        capacities = [
+            (
+                config.ASSIGNMENT_COURIER_CAPACITY
+                if depot.capacity is None
+                else depot.capacity
+            )
+            - sum(self._workload.get(depot.courier_id).values())
+            for depot in depots
+        ]
+        result = await assignment.assign_async(
+            numpy.array(
+                [
+                    (shipment["origin_latitude"], shipment["origin_longitude"])
+                    for shipment in located
+                ],
+                dtype=float,
+            ).reshape(-1, 2),
+            numpy.array([depot.coords for depot in depots], dtype=float).reshape(-1, 2),
+            numpy.array(capacities, dtype=int),
+        )
+        planned = {
+            shipment["id"]: (depots[courier].courier_id, distance)
+            for shipment, courier, distance in zip(
+                located, result.couriers, result.distances
+            )
+            if courier != assignment.UNASSIGNED
+        }
+
+        updated = []
+        if planned:
+            with self._workload.writing():
+                updated = await self._repository.assign_shipments(
+                    [(shipment_id, pair[0]) for shipment_id, pair in planned.items()]
+                )
+                for shipment in updated:
+                    self._workload.move(
+                        (None, shipment["status"]),
+                        (shipment["courier_id"], shipment["status"]),
+                    )
+            for shipment in updated:
+                self._tracking_cache.invalidate(shipment["id"])
+
+        done = {shipment["id"] for shipment in updated}
+        assigned = sorted(
+            (
+                AssignedShipmentDTO(
+                    shipment_id=shipment["id"],
+                    courier_id=shipment["courier_id"],
+                    distance=planned[shipment["id"]][1],
+                )
+                for shipment in updated
+            ),
+            key=lambda item: item.shipment_id,
+        )
+        return AssignmentDTO(
+            assigned=assigned,
+            unassigned=[
+                shipment["id"] for shipment in shipments if shipment["id"] not in done
+            ],
+            total_distance=round(sum(item.distance for item in assigned), 2),
+            converged=result.converged,
+        )
+
     async def update_status(
-        self, shipment_id: int, new_status: ShipmentStatus
+        self,
+        shipment_id: int,
+        new_status: ShipmentStatus,
+        actor_id: UUID | None = None,
+        coords: tuple[float, float] | None = None,
     ) -> ShipmentDTO | None:
         """The method changing shipment status by provided id in the repository.
 
         Args:
             shipment_id (int): The id of the shipment.
             new_status (ShipmentStatus): The new status.
+            actor_id (UUID | None): The id of the user changing the status.
+            coords (tuple[float, float] | None): Where the status changed.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if updated.
         """
-        shipment = await self._repository.update_status(shipment_id, new_status)
-
-        if shipment:
-            # Wyślij email do odbiorcy o zmianie statusu
-            try:
-                recipient_email = shipment["recipient_email"]
-                if recipient_email:
+        with self._workload.writing():
+            async with database.transaction():
+                shipment = await self._repository.update_status(
+                    shipment_id, new_status, actor_id, coords
+                )
+                # Powiadomienie trafia do outboxu w tej samej transakcji
+                if shipment and shipment["recipient_email"]:
                     await self._email_service.send_shipment_notification(
-                        recipient_email, shipment_id, new_status.value
+                        shipment["recipient_email"], shipment_id, new_status.value
                     )
-            except Exception as e:
-                # Nie blokuj zmiany statusu jeśli email nie działa
-                print(f"Błąd podczas wysyłania emaila o zmianie statusu: {e}")
+            # The counters are moved once the transaction is committed.
+            if shipment:
+                self._workload.move(
+                    (shipment["courier_id"], shipment["previous_status"]),
+                    (shipment["courier_id"], shipment["status"]),
+                )
+        self._tracking_cache.invalidate(shipment_id)
 
         return ShipmentDTO.from_record(shipment) if shipment else None
 
+    async def get_timeline(self, shipment_id: int) -> list[ShipmentEventDTO] | None:
+        """The method getting the status history of a shipment.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+
+        Returns:
+            list[ShipmentEventDTO] | None: The events in chronological order
+                if the shipment exists.
+        """
+        shipment = await self._repository.get_shipment_by_id(
+            shipment_id, include_archived=True
+        )
+        if not shipment:
+            return None
+        events = await self._repository.get_events(
+            shipment_id, shipment["created_at"], shipment["last_updated"]
+        )
+        return [ShipmentEventDTO.from_record(event) for event in events]
+
+    async def get_stats(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+        live: bool = False,
+    ) -> ShipmentStatsDTO:
+        """The method getting aggregated shipment statistics.
+
+        The statistics are read from the materialized view once this process
+        has refreshed it, unless disabled or asked to be computed live.
+
+        Args:
+            since (date | None): The first day of creation, unbounded if None.
+            until (date | None): The last day of creation, unbounded if None.
+            live (bool): Whether to compute the statistics from the shipments.
+
+        Returns:
+            ShipmentStatsDTO: The statistics by status, courier and day.
+        """
+        as_of = None
+        if config.SHIPMENT_STATS_MATERIALIZED and not live:
+            as_of = stats.worker.refreshed_at
+        records = await self._repository.get_stats(
+            since, until, materialized=as_of is not None
+        )
+        return ShipmentStatsDTO.from_records(records, since, until, as_of)
+
+    async def refresh_stats(self) -> None:
+        """The method refreshing the materialized shipment statistics."""
+        await self._repository.refresh_stats()
+
+    async def rebuild_workload(self) -> None:
+        """The method loading the courier workload counters from the repository."""
+        workload = await self._repository.get_courier_workload()
+        self._workload.load(
+            (row["courier_id"], row["status"], row["shipments"]) for row in workload
+        )
+
+    async def reconcile_workload(self) -> dict | None:
+        """The method reconciling the courier workload counters with the repository.
+
+        Returns:
+            dict | None: The drifted counts per courier, None if skipped.
+        """
+        checkpoint = self._workload.checkpoint()
+        workload = await self._repository.get_courier_workload()
+        return self._workload.reconcile(
+            ((row["courier_id"], row["status"], row["shipments"]) for row in workload),
+            checkpoint,
+        )
+
+    def get_workload(self, courier_id: UUID | None = None) -> list[CourierWorkloadDTO]:
+        """The method getting the active shipment counts of couriers.
+
+        The counts are kept in process, see `WorkloadCounters`.
+
+        Args:
+            courier_id (UUID | None): The id of the courier, all if None.
+
+        Returns:
+            list[CourierWorkloadDTO]: The workloads, busiest first.
+        """
+        if courier_id is not None:
+            counts = {courier_id: self._workload.get(courier_id)}
+        else:
+            counts = self._workload.snapshot()
+        workloads = [
+            CourierWorkloadDTO.from_counts(courier, by_status)
+            for courier, by_status in counts.items()
+        ]
+        workloads.sort(key=lambda workload: workload.active, reverse=True)
+        return workloads
+
     async def check_status(
-        self, shipment_id: int, recipient_email: str
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
     ) -> ShipmentDTO | None:
         """The method getting shipment by provided id and Recipient email from the repository.
 
         Args:
             shipment_id (int): The id of the shipment.
             recipient_email (str): The email of the Recipient.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if exists.
         """
-        shipment = await self._repository.check_status(shipment_id, recipient_email)
+        shipment = await self._repository.check_status(
+            shipment_id, recipient_email, include_archived
+        )
         return ShipmentDTO.from_record(shipment) if shipment else None
 
-    async def get_shipment_by_id(self, shipment_id: int) -> ShipmentDTO | None:
+    async def get_tracking(
+        self, shipment_id: int, recipient_email: str, include_archived: bool = False
+    ) -> TrackingEntry | None:
+        """The method getting the serialized tracking response, read through the cache.
+
+        Archival does not change shipments, so other processes may serve an
+        entry cached before its shipment was archived until it expires.
+        Shipments found with `include_archived` are not cached, as the entry
+        would then be served to lookups of live shipments only.
+
+        Args:
+            shipment_id (int): The id of the shipment.
+            recipient_email (str): The email of the Recipient.
+            include_archived (bool): Whether archived shipments are searched too.
+
+        Returns:
+            TrackingEntry | None: The serialized shipment and its ETag if exists.
+        """
+        if entry := self._tracking_cache.get(shipment_id, recipient_email):
+            return entry
+        invalidations = self._tracking_cache.invalidations
+        shipment = await self.check_status(
+            shipment_id, recipient_email, include_archived
+        )
+        if not shipment:
+            return None
+        if include_archived:
+            return make_entry(recipient_email, shipment)
+        return self._tracking_cache.set(
+            shipment_id, recipient_email, shipment, invalidations
+        )
+
+    async def get_shipment_by_id(
+        self, shipment_id: int, include_archived: bool = False
+    ) -> ShipmentDTO | None:
         """The method getting shipment by provided id.
 
         Args:
             shipment_id (int): The id of the shipment.
+            include_archived (bool): Whether archived shipments are searched too.
 
         Returns:
             ShipmentDTO | None: The shipment DTO details if exists.
         """
-        shipment = await self._repository.get_shipment_by_id(shipment_id)
+        shipment = await self._repository.get_shipment_by_id(
+            shipment_id, include_archived=include_archived
+        )
         return ShipmentDTO.from_record(shipment) if shipment else None
 
     async def delete_shipment(self, shipment_id: int) -> dict | None:
@@ -112,63 +406,305 @@ class ShipmentService(IShipmentService):
         Returns:
             dict | None: The shipment object from repository if deleted.
         """
-        deleted_shipment = await self._repository.delete_shipment(shipment_id)
+        with self._workload.writing():
+            deleted_shipment = await self._repository.delete_shipment(shipment_id)
+            if deleted_shipment:
+                self._workload.move(
+                    (deleted_shipment["courier_id"], deleted_shipment["status"]),
+                    None,
+                )
+        self._tracking_cache.invalidate(shipment_id)
         return deleted_shipment if deleted_shipment else None
 
-    async def get_all_shipments(self) -> Iterable[ShipmentDTO]:
+    async def get_all_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> Iterable[ShipmentDTO]:
         """The method getting all shipment from the repository.
 
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient. Combined with
+                sender_id, shipments sent by or addressed to the client match.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            after_id (int | None): The id of the last shipment of the previous page.
+            limit (int | None): The maximum number of shipments.
+            include_archived (bool): Whether archived shipments are listed too.
+
         Returns:
             Iterable[ShipmentDTO]: The collection of the shipments.
         """
-        shipments = await self._repository.get_all_shipments()
+        if courier_id is sender_id is recipient_email is statuses is None:
+            shipments = await self._repository.get_all_shipments(
+                after_id=after_id, limit=limit, include_archived=include_archived
+            )
+        else:
+            shipments = await self._repository.get_filtered_shipments(
+                courier_id=courier_id,
+                sender_id=sender_id,
+                recipient_email=recipient_email,
+                statuses=statuses,
+                after_id=after_id,
+                limit=limit,
+                include_archived=include_archived,
+            )
         return [ShipmentDTO.from_record(shipment) for shipment in shipments]
 
+    async def iterate_shipments(
+        self,
+        courier_id: UUID | None = None,
+        sender_id: UUID | None = None,
+        recipient_email: str | None = None,
+        statuses: Iterable[ShipmentStatus] | None = None,
+        include_archived: bool = False,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[ShipmentDTO]:
+        """The method iterating over shipments from the repository.
+
+        Args:
+            courier_id (UUID | None): The id of the assigned courier.
+            sender_id (UUID | None): The id of the sender.
+            recipient_email (str | None): The email of the recipient.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by.
+            include_archived (bool): Whether archived shipments are listed too.
+            after_id (int | None): Start after the shipment with this id.
+            limit (int | None): The maximum number of shipments.
+
+        Yields:
+            ShipmentDTO: The shipment DTO details.
+        """
+        async for shipment in self._repository.iterate_shipments(
+            courier_id=courier_id,
+            sender_id=sender_id,
+            recipient_email=recipient_email,
+            statuses=statuses,
+            include_archived=include_archived,
+            after_id=after_id,
+            limit=limit,
+        ):
+            yield ShipmentDTO.from_record(shipment)
+
+    async def archive_shipments(self, before: datetime, batch_size: int) -> int:
+        """The method moving terminal shipments to the archive.
+
+        Shipments are moved in batches, each in its own short transaction, so
+        live traffic is never blocked for long.
+
+        Args:
+            before (datetime): Shipments last updated before are archived.
+            batch_size (int): The number of shipments moved per statement.
+
+        Returns:
+            int: The number of archived shipments.
+        """
+        archived = 0
+        while True:
+            ids = await self._repository.archive_shipments(
+                TERMINAL_SHIPMENT_STATUSES, before, batch_size
+            )
+            for shipment_id in ids:
+                self._tracking_cache.invalidate(shipment_id)
+            archived += len(ids)
+            if len(ids) < batch_size:
+                return archived
+
     async def sort_by_distance(
-        self, courier_id: UUID, courier_location: Location
+        self, courier_id: UUID, courier_location: Location, limit: int | None = None
     ) -> Iterable[ShipmentWithDistanceDTO] | None:
         """The method sorting shipments by destination distance from courier.
 
+        Pickups are ranked by origin distance and deliveries by destination
+        distance, computed for all courier's shipments in one vectorized pass.
+
         Args:
+            courier_id (UUID): The id of the courier.
             courier_location (Location): Location of courier.
+            limit (int | None): Return only the nearest `limit` shipments.
 
         Returns:
             Iterable[ShipmentWithDistanceDTO]: Shipments with distance attribute sorted collection.
         """
-        if shipments := await self._repository.get_all_shipments():
-            courier_address = await geopy.get_address_from_location(courier_location)
-            courier_coords = await geopy.get_coords(courier_address)
-            shipmentsDTOs = [
-                ShipmentWithDistanceDTO.from_record(shipment)
+        shipments = await self._repository.get_filtered_shipments(
+            courier_id=courier_id, statuses=PICKUP_STATUSES + DELIVERY_STATUSES
+        )
+        if not shipments:
+            return None
+        courier_coords = await self._get_location_coords(courier_location)
+
+        is_pickup = numpy.fromiter(
+            (shipment["status"] in PICKUP_STATUSES for shipment in shipments),
+            dtype=bool,
+            count=len(shipments),
+        )
+        coords = numpy.array(
+            [
+                (
+                    shipment["origin_latitude"],
+                    shipment["origin_longitude"],
+                    shipment["destination_latitude"],
+                    shipment["destination_longitude"],
+                )
                 for shipment in shipments
-                if shipment.courier_id == courier_id
-            ]
+            ],
+            dtype=float,
+        )
+        targets = numpy.where(is_pickup[:, None], coords[:, :2], coords[:, 2:])
+        distances = geopy.get_distances(courier_coords, targets)
+
+        if limit is not None and limit < len(distances):
+            nearest = numpy.argpartition(distances, limit - 1)[:limit]
+            order = nearest[numpy.argsort(distances[nearest], kind="stable")]
+        else:
+            order = numpy.argsort(distances, kind="stable")
+
+        sorted_shipments = []
+        for index in order.tolist():
+            shipment = ShipmentWithDistanceDTO.from_record(shipments[index])
+            distance = distances[index]
+            distance = None if numpy.isnan(distance) else float(distance)
+            if is_pickup[index]:
+                shipment.origin_distance = distance
+            else:
+                shipment.destination_distance = distance
+            sorted_shipments.append(shipment)
+        return sorted_shipments
+
+    async def get_nearby_shipments(
+        self,
+        coords: tuple[float, float],
+        radius: float,
+        end: str = "origin",
+        statuses: Iterable[ShipmentStatus] | None = None,
+        limit: int | None = None,
+    ) -> list[ShipmentWithDistanceDTO]:
+        """The method getting unassigned shipments within a radius of a point.
+
+        Candidates are read from the grid cells covering the bounding box of
+        the circle, nearest first and at most `NEARBY_MAX_CANDIDATES` of them,
+        then exact distances are computed for them only.
 
-            sorted_shipments = []
+        Args:
+            coords (tuple[float, float]): Latitude and longitude of the point.
+            radius (float): The radius in kilometers.
+            end (str): "origin" or "destination", the end to measure from.
+            statuses (Iterable[ShipmentStatus] | None): Statuses to filter by,
+                the ones waiting for a courier if None.
+            limit (int | None): Return only the nearest `limit` shipments.
 
-            for shipment in shipmentsDTOs:
-                if shipment.status in ["ready_for_pickup", "returned_to_sender"]:
-                    origin_coords = shipment.origin_coords
-                    shipment.origin_distance = await geopy.get_distance(
-                        courier_coords, origin_coords
-                    )
-                    sorted_shipments.append(shipment)
-                elif shipment.status in ["out_for_delivery", "failed_attempt"]:
-                    destination_coords = shipment.destination_coords
-                    shipment.destination_distance = await geopy.get_distance(
-                        courier_coords, destination_coords
-                    )
-                    sorted_shipments.append(shipment)
-                sorted_shipments = sorted(
-                    sorted_shipments,
-                    key=lambda x: (
-                        x.origin_distance
-                        if x.status in ["ready_for_pickup", "returned_to_sender"]
-                        else x.destination_distance
-                    ),
+        Returns:
+            list[ShipmentWithDistanceDTO]: Shipments sorted by distance.
+        """
+        shipments = await self._repository.get_unassigned_shipments_in_box(
+            end,
+            spatial.bounding_box(*coords, radius),
+            coords,
+            min(limit or config.NEARBY_MAX_CANDIDATES, config.NEARBY_MAX_CANDIDATES),
+            statuses,
+        )
+        if not shipments:
+            return []
+        targets = numpy.array(
+            [
+                (shipment[f"{end}_latitude"], shipment[f"{end}_longitude"])
+                for shipment in shipments
+            ],
+            dtype=float,
+        )
+        distances = geopy.get_distances(coords, targets)
+        inside = numpy.flatnonzero(distances <= radius)
+        order = inside[numpy.argsort(distances[inside], kind="stable")][:limit]
+
+        nearby = []
+        for index in order.tolist():
+            shipment = ShipmentWithDistanceDTO.from_record(shipments[index])
+            setattr(shipment, f"{end}_distance", float(distances[index]))
+            nearby.append(shipment)
+        return nearby
+
+    async def plan_route(
+        self, courier_id: UUID, courier_location: Location
+    ) -> RouteDTO | None:
+        """The method planning the visiting order of courier's shipments.
+
+        Pickups are visited at the origin and then delivered at the
+        destination, deliveries are visited at the destination only. The
+        order is built from stored coordinates by nearest neighbour and
+        improved by 2-opt within the planner time budget. Shipments without
+        coordinates are left out and listed as unrouted.
+
+        Args:
+            courier_id (UUID): The id of the courier.
+            courier_location (Location): Location of courier.
+
+        Returns:
+            RouteDTO | None: The planned route if the courier has shipments.
+        """
+        shipments = await self._repository.get_filtered_shipments(
+            courier_id=courier_id, statuses=PICKUP_STATUSES + DELIVERY_STATUSES
+        )
+        if not shipments:
+            return None
+        courier_coords = await self._get_location_coords(courier_location)
+
+        stops, coords, predecessors, unrouted = [], [], [], []
+        for shipment in shipments:
+            origin = (shipment["origin_latitude"], shipment["origin_longitude"])
+            destination = (
+                shipment["destination_latitude"],
+                shipment["destination_longitude"],
+            )
+            is_pickup = shipment["status"] in PICKUP_STATUSES
+            if None in destination or (is_pickup and None in origin):
+                unrouted.append(shipment["id"])
+                continue
+            if is_pickup:
+                stops.append((shipment["id"], "pickup", shipment["origin"]))
+                coords.append(origin)
+                predecessors.append(planner.NO_PREDECESSOR)
+            stops.append((shipment["id"], "delivery", shipment["destination"]))
+            coords.append(destination)
+            predecessors.append(
+                len(stops) - 2 if is_pickup else planner.NO_PREDECESSOR
+            )
+
+        route = await planner.plan_async(
+            courier_coords,
+            numpy.array(coords, dtype=float).reshape(-1, 2),
+            numpy.array(predecessors, dtype=int),
+        )
+        return RouteDTO(
+            stops=[
+                RouteStopDTO(
+                    shipment_id=stops[index][0],
+                    action=stops[index][1],
+                    address=stops[index][2],
+                    coords=coords[index],
+                    distance=distance,
                 )
-            return sorted_shipments
-        return None
+                for index, distance in zip(route.order, route.legs)
+            ],
+            total_distance=route.total_distance,
+            converged=route.converged,
+            unrouted=unrouted,
+        )
+
+    @staticmethod
+    async def _get_location_coords(location: Location) -> tuple[float, float]:
+        # Geocoded once, as the formatted address of a gazetteer hit is not a
+        # query the gazetteer understands.
+        query = geopy.location_query(location)
+        result = await geopy.geocode(query)
+        if not result:
+            raise ValueError(f"Coordinates not found: {query}")
+        return result.coords
 
     async def add_shipment(self, data: ShipmentIn, user_id: UUID) -> ShipmentDTO | None:
         """The method adding a shipment to the repository.
@@ -177,43 +713,257 @@ class ShipmentService(IShipmentService):
             shipment (ShipmentIn): The shipment input data.
             user_id (UUID): UUID of the user(sender).
 
+        Raises:
+            ValueError: If an address cannot be found.
+
+        Returns:
+            ShipmentDTO | None: The newly added shipment if added.
+        """
+        return await self.add_resolved_shipment(
+            await self.resolve_shipment(data), user_id
+        )
+
+    async def resolve_shipment(self, data: ShipmentIn) -> ResolvedShipment:
+        """The method resolving both ends of a shipment.
+
+        Args:
+            data (ShipmentIn): The shipment input data.
+
+        Raises:
+            ValueError: If an address cannot be found.
+
+        Returns:
+            ResolvedShipment: The resolved shipment.
+        """
+        origin, destination = await self._resolve_ends(data)
+        return ResolvedShipment(data=data, origin=origin, destination=destination)
+
+    async def add_resolved_shipment(
+        self, shipment: ResolvedShipment, user_id: UUID
+    ) -> ShipmentDTO | None:
+        """The method adding a resolved shipment to the repository.
+
+        Args:
+            shipment (ResolvedShipment): The resolved shipment.
+            user_id (UUID): UUID of the user(sender).
+
         Returns:
             ShipmentDTO | None: The newly added shipment if added.
         """
-        origin = f"Miejscowość: {data.origin.city}, Ulica: {data.origin.street} {data.origin.street_number}, Kod pocztowy: {data.origin.postcode}"
-        destination = f"Miejscowość: {data.destination.city}, Ulica: {data.destination.street} {data.destination.street_number}, Kod pocztowy: {data.destination.postcode}"
-        origin_coords = data.origin_coords
-        destination_coords = data.destination_coords
         new_shipment = await self._repository.add_shipment(
-            data, origin, destination, origin_coords, destination_coords, user_id
+            shipment.data,
+            shipment.origin.address,
+            shipment.destination.address,
+            shipment.origin.coords,
+            shipment.destination.coords,
+            user_id,
+            origin_query=shipment.origin.query,
+            destination_query=shipment.destination.query,
         )
         return ShipmentDTO.from_record(new_shipment) if new_shipment else None
 
+    async def resolve_addresses(
+        self,
+        locations: list[tuple[Location, tuple[float, float] | None]],
+        known: Iterable[ResolvedAddress] = (),
+    ) -> list[ResolvedAddress | None]:
+        """The method resolving locations to stored addresses and coordinates.
+
+        A location given with coordinates keeps them, with its formatted
+        address. A location with the query of a `known` address, one the
+        shipment already has, reuses it. Every other distinct query is
+        geocoded once, all of them concurrently, and its normalized address
+        is stored.
+
+        Args:
+            locations (list[tuple[Location, tuple[float, float] | None]]):
+                The locations with their coordinates, if given.
+            known (Iterable[ResolvedAddress]): Addresses resolved before.
+
+        Raises:
+            GeocoderServiceError: If the geocoder is unavailable.
+            Exception: Any other error raised by a lookup.
+
+        Returns:
+            list[ResolvedAddress | None]: The resolved addresses, None where a
+                location could not be geocoded.
+        """
+        known_queries = {address.query: address for address in known}
+        queries = [geopy.location_query(location) for location, _ in locations]
+        pending = list(
+            dict.fromkeys(
+                query
+                for query, (_, coords) in zip(queries, locations)
+                if coords is None and query not in known_queries
+            )
+        )
+        results = await asyncio.gather(
+            *(geopy.geocode(query) for query in pending), return_exceptions=True
+        )
+        # Misses are None, anything raised is a failure of the whole batch.
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        geocoded = {
+            query: ResolvedAddress(
+                query=query, address=result.address, coords=result.coords
+            )
+            for query, result in zip(pending, results)
+            if result
+        }
+
+        resolved = []
+        for query, (location, coords) in zip(queries, locations):
+            if coords is not None:
+                previous = known_queries.get(query)
+                address = previous.address if previous else None
+                resolved.append(
+                    ResolvedAddress(
+                        query=query,
+                        address=address or self._format_address(location),
+                        coords=coords,
+                    )
+                )
+            else:
+                resolved.append(known_queries.get(query) or geocoded.get(query))
+        return resolved
+
+    async def resolve_shipments(
+        self, shipments: list[ShipmentIn]
+    ) -> list[ResolvedShipment | None]:
+        """The method resolving both ends of many shipments.
+
+        Each distinct address is geocoded once, concurrently.
+
+        Args:
+            shipments (list[ShipmentIn]): The shipment input data.
+
+        Returns:
+            list[ResolvedShipment | None]: The resolved shipments, None where
+                an address could not be geocoded.
+        """
+        ends = await self.resolve_addresses(
+            [
+                end
+                for shipment in shipments
+                for end in (
+                    (shipment.origin, shipment.origin_coords),
+                    (shipment.destination, shipment.destination_coords),
+                )
+            ]
+        )
+        return [
+            (
+                ResolvedShipment(data=shipment, origin=origin, destination=destination)
+                if origin and destination
+                else None
+            )
+            for shipment, origin, destination in zip(
+                shipments, ends[::2], ends[1::2]
+            )
+        ]
+
+    async def add_shipments(
+        self, shipments: list[ResolvedShipment], user_id: UUID
+    ) -> list[int]:
+        """The method bulk adding resolved shipments to the repository.
+
+        Args:
+            shipments (list[ResolvedShipment]): The resolved shipments.
+            user_id (UUID): UUID of the user(sender).
+
+        Returns:
+            list[int]: The ids of the added shipments, in the input order.
+        """
+        return await self._repository.add_shipments(
+            [
+                {
+                    "sender_id": user_id,
+                    "recipient_email": shipment.data.recipient_email or None,
+                    "origin": shipment.origin.address,
+                    "destination": shipment.destination.address,
+                    "origin_query": shipment.origin.query,
+                    "destination_query": shipment.destination.query,
+                    "origin_latitude": shipment.origin.coords[0],
+                    "origin_longitude": shipment.origin.coords[1],
+                    "destination_latitude": shipment.destination.coords[0],
+                    "destination_longitude": shipment.destination.coords[1],
+                }
+                for shipment in shipments
+            ]
+        )
+
+    async def _resolve_ends(
+        self, data: ShipmentIn, known: Iterable[ResolvedAddress] = ()
+    ) -> tuple[ResolvedAddress, ResolvedAddress]:
+        ends = [(data.origin, data.origin_coords)]
+        ends.append((data.destination, data.destination_coords))
+        origin, destination = await self.resolve_addresses(ends, known)
+        for (location, _), resolved in zip(ends, (origin, destination)):
+            if resolved is None:
+                raise ValueError(
+                    f"Address not found: {geopy.location_query(location)}"
+                )
+        return origin, destination
+
+    @staticmethod
+    def _known_addresses(shipment: Any) -> list[ResolvedAddress]:
+        known = []
+        for end in ("origin", "destination"):
+            query = shipment[f"{end}_query"]
+            coords = (shipment[f"{end}_latitude"], shipment[f"{end}_longitude"])
+            if query is not None and None not in coords:
+                known.append(
+                    ResolvedAddress(query=query, address=shipment[end], coords=coords)
+                )
+        return known
+
+    @staticmethod
+    def _format_address(location: Location) -> str:
+        """The method formatting a location as a stored shipment address.
+
+        Args:
+            location (Location): The location.
+
+        Returns:
+            str: The address.
+        """
+        return f"Miejscowość: {location.city}, Ulica: {location.street} {location.street_number}, Kod pocztowy: {location.postcode}"
+
     async def update_shipment(
         self, shipment_id: int, data: ShipmentIn
     ) -> ShipmentDTO | None:
         """The method updating shipment data in the reposistory.
 
+        Addresses which did not change keep their stored address and
+        coordinates and are not geocoded again.
+
         Args:
             shipment_id (int): The id of the shipment.
             data (ShipmentIn): The updated shipment details.
 
+        Raises:
+            ValueError: If an address cannot be found.
+
         Returns:
             ShipmentDTO | None: The updated shipment DTO details if updated.
         """
-        origin = await geopy.get_address_from_location(data.origin)
-        destination = await geopy.get_address_from_location(data.destination)
-        origin_coords = await geopy.get_coords(origin)
-        destination_coords = await geopy.get_coords(destination)
-        if old_shipment := await self._repository.get_shipment_by_id(shipment_id):
-            shipment = await self._repository.update_shipment(
-                shipment_id,
-                old_shipment,
-                data,
-                origin,
-                destination,
-                origin_coords,
-                destination_coords,
-            )
-            return ShipmentDTO.from_record(shipment) if shipment else None
-        return None
+        old_shipment = await self._repository.get_shipment_by_id(shipment_id)
+        if not old_shipment:
+            return None
+        origin, destination = await self._resolve_ends(
+            data, self._known_addresses(old_shipment)
+        )
+        shipment = await self._repository.update_shipment(
+            shipment_id,
+            old_shipment,
+            data,
+            origin.address,
+            destination.address,
+            origin.coords,
+            destination.coords,
+            origin_query=origin.query,
+            destination_query=destination.query,
+        )
+        self._tracking_cache.invalidate(shipment_id)
+        return ShipmentDTO.from_record(shipment) if shipment else None
@@ -1,12 +1,13 @@
 """Module containing user service implementation."""
 
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.core.domain.user import User, UserIn, UserUpdate
 from src.core.repositories.iuser import IUserRepository
 from src.core.security import password_hashing
 from src.core.security.token import create_access_token
+from src.infrastructure.cache.user import UserCache
 from src.infrastructure.dto.tokenDTO import TokenDTO
 from src.infrastructure.dto.userDTO import UserDTO
 from src.infrastructure.services.iuser import IUserService
@@ -16,9 +17,11 @@ class UserService(IUserService):
     """A class representing implementation of user-related services."""
 
     _repository: IUserRepository
+    _user_cache: UserCache
 
-    def __init__(self, repository: IUserRepository):
+    def __init__(self, repository: IUserRepository, user_cache: UserCache):
         self._repository = repository
+        self._user_cache = user_cache
 
     async def register_user(self, user: UserIn) -> UserDTO:
         """The method for registering a new user in repository.
@@ -35,25 +38,34 @@ class UserService(IUserService):
         existing_user = await self._repository.get_user_by_email(user.email)
         if existing_user:
             raise ValueError("User with that email already registered.")
-        user.password = password_hashing.hash_password(user.password)
+        user.password = await password_hashing.hash_password_async(user.password)
         new_user = await self._repository.register_user(user)
         if not new_user:
             raise ValueError("Failed to register the user. Please try again.")
         return UserDTO.model_validate(new_user)
 
     async def get_user_by_id(self, user_id: UUID) -> UserDTO:
-        """The method getting user by provided id from repository.
+        """The method getting user by provided id, read through the cache.
 
         Args:
             user_id (UUID): UUID of the user.
 
         Returns:
             User: The user DTO details if exists.
+
+        Raises:
+            ValueError: If the id is malformed or no user has it.
         """
+        user_id = UUID(str(user_id))
+        if cached := self._user_cache.get(user_id):
+            return cached
+        invalidations = self._user_cache.invalidations
         user = await self._repository.get_user_by_id(user_id)
         if not user:
             raise ValueError(f"No user found with the provided ID: {user_id}")
-        return UserDTO.model_validate(user)
+        dto = UserDTO.model_validate(user)
+        self._user_cache.set(dto, invalidations)
+        return dto
 
     async def get_user_by_email(self, email) -> UserDTO:
         """The method getting user by provided email from repository.
@@ -81,6 +93,7 @@ class UserService(IUserService):
         deleted_user = await self._repository.detele_user(email)
         if not deleted_user:
             raise ValueError(f"No user found with the provided email: {email}")
+        self._user_cache.invalidate(deleted_user.id)
         return deleted_user
 
     async def update_user(self, email: str, update_data: UserUpdate) -> User:
@@ -105,7 +118,7 @@ class UserService(IUserService):
         updated_user = UserIn(
             email=update_data.email if update_data.email else original_user.email,
             password=(
-                password_hashing.hash_password(update_data.password)
+                await password_hashing.hash_password_async(update_data.password)
                 if update_data.password
                 else original_user.password
             ),
@@ -114,6 +127,7 @@ class UserService(IUserService):
         user = await self._repository.update_user(email, updated_user)
         if not user:
             raise ValueError("Failed to update the user. Please try again.")
+        self._user_cache.invalidate(original_user.id)
         return user
 
     async def login_for_access_token(self, email: str, password: str) -> TokenDTO:
@@ -131,22 +145,49 @@ class UserService(IUserService):
         """
 
         user = await self._repository.get_user_by_email(email=email)
-        if not user or not password_hashing.verify_password(password, user.password):
+        if not user or not await password_hashing.verify_password_async(
+            password, user.password
+        ):
             raise ValueError("Incorrect email or password")
+        if password_hashing.needs_rehash(user.password):
+            await self._repository.update_password(
+                user.id, await password_hashing.hash_password_async(password)
+            )
         access_token = create_access_token(data={"sub": str(user.id)})
         return {"access_token": access_token, "token_type": "bearer"}
 
-    async def get_all_users(self) -> Iterable[UserDTO]:
+    async def get_all_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> Iterable[UserDTO]:
         """The method getting all users from repository.
 
+        Args:
+            after_id (UUID | None): The id of the last user of the previous page.
+            limit (int | None): The maximum number of users.
+
         Returns:
             Iterable[UserDTO]: The user objects DTO details.
         """
-        users = await self._repository.get_all_users()
-        if not users:
+        users = await self._repository.get_all_users(after_id=after_id, limit=limit)
+        if not users and after_id is None:
             raise ValueError("No users found in the repository.")
         return [UserDTO.model_validate(user) for user in users]
 
+    async def iterate_users(
+        self, after_id: UUID | None = None, limit: int | None = None
+    ) -> AsyncIterator[UserDTO]:
+        """The method iterating over users from repository.
+
+        Args:
+            after_id (UUID | None): Start after the user with this id.
+            limit (int | None): The maximum number of users.
+
+        Yields:
+            UserDTO: The user DTO details.
+        """
+        async for user in self._repository.iterate_users(after_id, limit):
+            yield UserDTO.model_validate(user)
+
     async def get_users_by_role(self, role) -> Iterable[UserDTO]:
         """The method getting user by provided role.
 
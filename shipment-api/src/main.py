@@ -7,15 +7,27 @@ from typing import AsyncGenerator
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
+from geopy.exc import GeocoderServiceError
 
 from src.api.routers.client import router as client_router
+from src.api.routers.metrics import router as metrics_router
 from src.api.routers.package import router as package_router
 from src.api.routers.seed import router as seed_router
 from src.api.routers.shipment import router as shipment_router
 from src.api.routers.staff import router as staff_router
 from src.api.routers.user import router as user_router
+from src.columns import ensure_columns
+from src.config import config
 from src.container import Container
+from src.core.security import password_hashing
 from src.db import database, init_db
+from src.indexes import ensure_indexes
+from src.infrastructure.external.email import outbox
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.jobs import archive, stats, workload
+from src.infrastructure.routing import planner
+from src.partitions import ensure_archive_partitions, ensure_partitions
+from src.views import ensure_views
 
 container = Container()
 container.wire(
@@ -27,6 +39,7 @@ container.wire(
         "src.api.routers.staff",
         "src.api.routers.client",
         "src.api.routers.package",
+        "src.api.routers.metrics",
     ]
 )
 
@@ -35,9 +48,27 @@ container.wire(
 async def lifespan(_: FastAPI) -> AsyncGenerator:
     """Lifespan function working on app startup."""
     await init_db()
+    await ensure_columns()
+    await ensure_partitions()
+    await ensure_archive_partitions()
+    await ensure_indexes()
+    await ensure_views()
     await database.connect()
+    await container.shipment_service().rebuild_workload()
+    outbox.worker.start()
+    archive.worker.start(container.shipment_service())
+    if config.SHIPMENT_STATS_MATERIALIZED:
+        stats.worker.start(container.shipment_service())
+    workload.worker.start(container.shipment_service())
     yield
+    await workload.worker.stop()
+    await stats.worker.stop()
+    await archive.worker.stop()
+    await outbox.worker.stop()
     await database.disconnect()
+    geopy.executor.shutdown(wait=False, cancel_futures=True)
+    password_hashing.executor.shutdown(wait=False, cancel_futures=True)
+    planner.executor.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(lifespan=lifespan)
@@ -55,6 +86,7 @@ app.include_router(seed_router)
 app.include_router(staff_router)
 app.include_router(client_router)
 app.include_router(package_router)
+app.include_router(metrics_router)
 
 
 @app.exception_handler(HTTPException)
@@ -63,3 +95,18 @@ async def http_exception_handle_logging(
     exception: HTTPException,
 ) -> Response:
     return await http_exception_handler(request, exception)
+
+
+@app.exception_handler(GeocoderServiceError)
+async def geocoder_error_handler(
+    request: Request,
+    exception: GeocoderServiceError,
+) -> Response:
+    return await http_exception_handler(
+        request,
+        HTTPException(
+            status_code=503,
+            detail=f"Geocoding is unavailable: {exception}",
+            headers={"Retry-After": str(round(config.GEOCODER_BREAKER_RESET))},
+        ),
+    )
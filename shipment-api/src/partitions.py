@@ -0,0 +1,154 @@
+"""Partition management module.
+
+Tables declared with `postgresql_partition_by="RANGE (created_at)"` are split
+into one partition per calendar month, named `<table>_<yyyy>_<mm>`.
+`metadata.create_all` creates only the partitioned parent, so the partitions
+of the current month and of the next `PARTITION_MONTHS_AHEAD` months are
+created here, idempotently, on every startup. A default partition catches
+rows outside of them, so writes never fail for a missing month. Rows in the
+default partition must be moved out before the partition of their month can
+be created, so the months ahead should cover the longest uptime.
+
+Shipments are archived into the partition of the month they were created
+in, which may be long past, so the archive also gets a partition for every
+month from the oldest live shipment on. Archival then never creates tables.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import Connection, Table, func, select
+
+from src.config import config
+from src.db import engine, metadata, shipment_archive_table, shipment_table
+
+
+def partitioned_tables() -> list[Table]:
+    """Get the tables declared as partitioned.
+
+    Returns:
+        list[Table]: The tables ordered by dependency.
+    """
+    return [
+        table
+        for table in metadata.sorted_tables
+        if table.dialect_options["postgresql"]["partition_by"]
+    ]
+
+
+def add_months(month: date, months: int) -> date:
+    """Get the first day of a month a number of months away.
+
+    Args:
+        month (date): A day of the starting month.
+        months (int): The number of months, negative for the past.
+
+    Returns:
+        date: The first day of the month.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: Table, month: date) -> str:
+    """Get the name of the partition of a month.
+
+    Args:
+        table (Table): The partitioned table.
+        month (date): A day of the month.
+
+    Returns:
+        str: The partition name.
+    """
+    return f"{table.name}_{month.year:04d}_{month.month:02d}"
+
+
+def create_partitions(
+    connection: Connection,
+    first: date | None = None,
+    months: int | None = None,
+    tables: Iterable[Table] | None = None,
+) -> list[str]:
+    """Create the monthly and default partitions which do not exist yet.
+
+    Args:
+        connection (Connection): A synchronous connection.
+        first (date | None): A day of the first month, the current one if None.
+        months (int | None): The number of months, by default the current one
+            and `PARTITION_MONTHS_AHEAD` more.
+        tables (Iterable[Table] | None): The partitioned tables, all if None.
+
+    Returns:
+        list[str]: The names of the ensured partitions.
+    """
+    first = first or datetime.now(timezone.utc).date()
+    months = config.PARTITION_MONTHS_AHEAD + 1 if months is None else months
+    preparer = connection.dialect.identifier_preparer
+    names = []
+    for table in partitioned_tables() if tables is None else tables:
+        parent = preparer.format_table(table)
+        schema = f"{preparer.quote_schema(table.schema)}." if table.schema else ""
+        for offset in range(months):
+            start = add_months(first, offset)
+            name = partition_name(table, start)
+            connection.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {schema}{preparer.quote(name)} "
+                f"PARTITION OF {parent} FOR VALUES "
+                f"FROM ('{start.isoformat()} 00:00+00') "
+                f"TO ('{add_months(start, 1).isoformat()} 00:00+00')"
+            )
+            names.append(name)
+        name = f"{table.name}_default"
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {schema}{preparer.quote(name)} "
+            f"PARTITION OF {parent} DEFAULT"
+        )
+        names.append(name)
+    return names
+
+
+def create_archive_partitions(connection: Connection) -> list[str]:
+    """Create the archive partitions of the months of live shipments.
+
+    Only months before the current one are created here, the later ones
+    are created by `create_partitions`.
+
+    Args:
+        connection (Connection): A synchronous connection.
+
+    Returns:
+        list[str]: The names of the ensured partitions.
+    """
+    oldest = connection.execute(select(func.min(shipment_table.c.created_at))).scalar()
+    if oldest is None:
+        return []
+    first, current = oldest.date(), datetime.now(timezone.utc).date()
+    months = (current.year - first.year) * 12 + current.month - first.month
+    if months <= 0:
+        return []
+    return create_partitions(connection, first, months, [shipment_archive_table])
+
+
+async def ensure_partitions(
+    first: date | None = None,
+    months: int | None = None,
+    tables: Iterable[Table] | None = None,
+) -> None:
+    """Create missing partitions of the application schema.
+
+    Args:
+        first (date | None): A day of the first month, the current one if None.
+        months (int | None): The number of months, by default the current one
+            and `PARTITION_MONTHS_AHEAD` more.
+        tables (Iterable[Table] | None): The partitioned tables, all if None.
+    """
+    async with engine.begin() as conn:
+        names = await conn.run_sync(create_partitions, first, months, tables)
+    print(f"Ensured {len(names)} partitions.")
+
+
+async def ensure_archive_partitions() -> None:
+    """Create missing archive partitions of the months of live shipments."""
+    async with engine.begin() as conn:
+        names = await conn.run_sync(create_archive_partitions)
+    print(f"Ensured {len(names)} archive partitions.")
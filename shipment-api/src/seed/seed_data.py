@@ -12,6 +12,9 @@ Bialystok = Location(street="", street_number="", city="Bialystok", postcode="")
 Gdansk = Location(street="", street_number="", city="Gdansk", postcode="")
 Lodz = Location(street="", street_number="", city="Lodz", postcode="")
 
+# The seeded courier starts from Warszawa.
+SEED_DEPOT_COORDS = (52.2297, 21.0122)
+
 
 USERS = [
     UserIn(email="courier@example.com", password="Courier123", role=UserRole.COURIER),
@@ -0,0 +1,114 @@
+"""Spatial grid module.
+
+The globe is divided into cells of 1/CELLS_PER_DEGREE degree. Each cell has
+an integer id, numbered row by row from the south-west, so the cells of one
+row between two longitudes form a contiguous id range. Shipments store the
+cells of their origin and destination in generated columns. A radius
+query therefore becomes a few indexed range scans, one per row of cells
+touched by the bounding box of the circle. Exact distances are computed
+only for those candidates.
+
+The grid does not wrap across the antimeridian.
+"""
+
+import math
+from typing import NamedTuple
+
+CELLS_PER_DEGREE = 10
+LATITUDE_CELLS = 180 * CELLS_PER_DEGREE
+LONGITUDE_CELLS = 360 * CELLS_PER_DEGREE
+# The mean Earth radius used by the haversine package.
+EARTH_RADIUS_KM = 6371.0088
+
+
+class BoundingBox(NamedTuple):
+    """Latitude and longitude bounds, in degrees."""
+
+    min_latitude: float
+    max_latitude: float
+    min_longitude: float
+    max_longitude: float
+
+
+def cell_sql(latitude: str, longitude: str) -> str:
+    """Get the SQL expression of the cell id of a coordinates column pair.
+
+    It performs the same floating point operations as `cell_id`, so both
+    give the same cell for the same point.
+
+    Args:
+        latitude (str): The latitude column name.
+        longitude (str): The longitude column name.
+
+    Returns:
+        str: The SQL expression.
+    """
+    return (
+        f"least(floor(({latitude} + 90) * {CELLS_PER_DEGREE}), "
+        f"{LATITUDE_CELLS - 1})::bigint * {LONGITUDE_CELLS} + "
+        f"least(floor(({longitude} + 180) * {CELLS_PER_DEGREE}), "
+        f"{LONGITUDE_CELLS - 1})::bigint"
+    )
+
+
+def _row(latitude: float) -> int:
+    return min(math.floor((latitude + 90) * CELLS_PER_DEGREE), LATITUDE_CELLS - 1)
+
+
+def _column(longitude: float) -> int:
+    return min(math.floor((longitude + 180) * CELLS_PER_DEGREE), LONGITUDE_CELLS - 1)
+
+
+def cell_id(latitude: float, longitude: float) -> int:
+    """Get the id of the cell containing a point.
+
+    Args:
+        latitude (float): The latitude of the point.
+        longitude (float): The longitude of the point.
+
+    Returns:
+        int: The cell id.
+    """
+    return _row(latitude) * LONGITUDE_CELLS + _column(longitude)
+
+
+def bounding_box(latitude: float, longitude: float, radius: float) -> BoundingBox:
+    """Get a bounding box containing a circle.
+
+    Args:
+        latitude (float): The latitude of the center.
+        longitude (float): The longitude of the center.
+        radius (float): The radius in kilometers.
+
+    Returns:
+        BoundingBox: The bounding box, clamped to valid coordinates.
+    """
+    angle = math.degrees(radius / EARTH_RADIUS_KM)
+    min_latitude = max(latitude - angle, -90.0)
+    max_latitude = min(latitude + angle, 90.0)
+    widest = math.cos(math.radians(max(abs(min_latitude), abs(max_latitude))))
+    if widest * 180 <= angle:
+        return BoundingBox(min_latitude, max_latitude, -180.0, 180.0)
+    spread = angle / widest
+    return BoundingBox(
+        min_latitude,
+        max_latitude,
+        max(longitude - spread, -180.0),
+        min(longitude + spread, 180.0),
+    )
+
+
+def cell_ranges(box: BoundingBox) -> list[tuple[int, int]]:
+    """Get the cell id ranges covering a bounding box.
+
+    Args:
+        box (BoundingBox): The bounding box.
+
+    Returns:
+        list[tuple[int, int]]: Inclusive id ranges, one per row of cells.
+    """
+    first, last = _column(box.min_longitude), _column(box.max_longitude)
+    return [
+        (row * LONGITUDE_CELLS + first, row * LONGITUDE_CELLS + last)
+        for row in range(_row(box.min_latitude), _row(box.max_latitude) + 1)
+    ]
@@ -0,0 +1,144 @@
+"""Materialized view management module.
+
+`shipment_daily_stats` holds the number of shipments and the total
+pickup-to-delivery time per day of creation, status and courier, over live
+and archived shipments. It is a few rows per courier and day, so dashboard
+statistics are aggregated from it instead of from the shipments.
+
+The view is created empty, idempotently, on every startup, and populated by
+the stats refresh job, see `src.infrastructure.jobs.stats`. Later refreshes
+are concurrent, so readers are never blocked and only changed rows are
+written. Like indexes, an existing view is not altered when its definition
+changes, it has to be dropped first.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    Date,
+    Float,
+    Select,
+    cast,
+    column,
+    func,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql
+
+from src.db import (
+    engine,
+    package_archive_table,
+    packages_table,
+    shipment_archive_table,
+    shipment_table,
+)
+
+shipment_daily_stats = table(
+    "shipment_daily_stats",
+    column("day", Date),
+    column("status", shipment_table.c.status.type),
+    column("courier_id", postgresql.UUID(as_uuid=True)),
+    column("shipments", BigInteger),
+    column("delivered", BigInteger),
+    column("delivery_seconds", Float),
+)
+
+
+def day_start(day: date) -> datetime:
+    """Get the UTC midnight starting a day.
+
+    Args:
+        day (date): The day.
+
+    Returns:
+        datetime: The start of the day.
+    """
+    return datetime.combine(day, time.min, timezone.utc)
+
+
+def daily_stats_query(since: date | None = None, until: date | None = None) -> Select:
+    """Build the aggregation of shipments per day, status and courier.
+
+    Days are UTC days of creation. Each source table is bounded by its
+    creation time, so archive partitions outside of the range are pruned.
+
+    Args:
+        since (date | None): The first day, unbounded if None.
+        until (date | None): The last day, unbounded if None.
+
+    Returns:
+        Select: The query with the `shipment_daily_stats` columns.
+    """
+    sources = []
+    for shipments, packages in (
+        (shipment_table, packages_table),
+        (shipment_archive_table, package_archive_table),
+    ):
+        source = select(
+            shipments.c.created_at,
+            shipments.c.status,
+            shipments.c.courier_id,
+            cast(
+                func.extract(
+                    "epoch",
+                    packages.c.delivery_actual_date - packages.c.pickup_actual_date,
+                ),
+                Float,
+            ).label("delivery_seconds"),
+        ).select_from(shipments.outerjoin(packages, packages.c.id == shipments.c.id))
+        if since is not None:
+            source = source.where(shipments.c.created_at >= day_start(since))
+        if until is not None:
+            source = source.where(
+                shipments.c.created_at < day_start(until + timedelta(days=1))
+            )
+        sources.append(source)
+    rows = union_all(*sources).subquery("stats_rows")
+    day = cast(func.timezone("UTC", rows.c.created_at), Date).label("day")
+    return select(
+        day,
+        rows.c.status,
+        rows.c.courier_id,
+        func.count().label("shipments"),
+        func.count(rows.c.delivery_seconds).label("delivered"),
+        func.coalesce(func.sum(rows.c.delivery_seconds), 0.0).label(
+            "delivery_seconds"
+        ),
+    ).group_by(day, rows.c.status, rows.c.courier_id)
+
+
+def create_views(connection: Connection) -> list[str]:
+    """Create the materialized views which do not exist yet, without data.
+
+    Args:
+        connection (Connection): A synchronous connection.
+
+    Returns:
+        list[str]: The names of the views.
+    """
+    preparer = connection.dialect.identifier_preparer
+    name = preparer.quote(shipment_daily_stats.name)
+    definition = daily_stats_query().compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    connection.exec_driver_sql(
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {definition} "
+        "WITH NO DATA"
+    )
+    # Concurrent refreshes need a unique index matching whole rows.
+    connection.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_shipment_daily_stats_key "
+        f"ON {name} (day, status, courier_id) NULLS NOT DISTINCT"
+    )
+    return [shipment_daily_stats.name]
+
+
+async def ensure_views() -> None:
+    """Create missing materialized views of the application schema."""
+    async with engine.begin() as conn:
+        names = await conn.run_sync(create_views)
+    print(f"Ensured {len(names)} materialized views.")
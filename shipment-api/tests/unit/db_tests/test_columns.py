@@ -0,0 +1,27 @@
+"""Unit tests for the column management module."""
+
+from sqlalchemy.dialects import postgresql
+
+import src.columns as columns_module
+from src.db import metadata, shipment_table
+
+
+def test_create_columns_adds_missing_columns(mocker):
+    connection = mocker.Mock()
+    connection.dialect = postgresql.dialect()
+    inspector = mocker.Mock()
+    inspector.has_table.side_effect = lambda name: name == shipment_table.name
+    inspector.get_columns.return_value = [
+        {"name": column.name}
+        for column in shipment_table.columns
+        if column.name != "origin_cell"
+    ]
+    mocker.patch.object(columns_module, "inspect", return_value=inspector)
+
+    added = columns_module.create_columns(connection)
+
+    assert added == ["shipments.origin_cell"]
+    ddl = connection.exec_driver_sql.call_args.args[0]
+    assert ddl.startswith("ALTER TABLE shipments ADD COLUMN origin_cell BIGINT")
+    assert "GENERATED ALWAYS AS" in ddl
+    assert inspector.has_table.call_count == len(metadata.sorted_tables)
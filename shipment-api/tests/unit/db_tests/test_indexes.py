@@ -0,0 +1,45 @@
+"""Unit tests for the index management module."""
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.db import shipment_table
+from src.indexes import create_indexes, declared_indexes
+
+
+def compile_index(name: str) -> str:
+    index = next(index for index in declared_indexes() if index.name == name)
+    return str(
+        CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect())
+    )
+
+
+def test_shipment_filters_are_indexed():
+    indexed = {
+        tuple(column.name for column in index.columns)
+        for index in shipment_table.indexes
+    }
+
+    assert ("sender_id", "id") in indexed
+    assert ("courier_id", "id") in indexed
+    assert ("recipient_id",) in indexed
+    assert ("recipient_email",) in indexed
+    assert ("status",) in indexed
+
+
+def test_courier_workload_index_is_partial():
+    ddl = compile_index("ix_shipments_courier_workload")
+
+    assert "(courier_id, status)" in ddl
+    assert "WHERE status IN ('PENDING', 'READY_FOR_PICKUP'" in ddl
+    assert "'DELIVERED'" not in ddl
+
+
+def test_create_indexes_is_idempotent(mocker):
+    connection = mocker.Mock()
+
+    names = create_indexes(connection)
+
+    assert names == [index.name for index in declared_indexes()]
+    statements = [call.args[0] for call in connection.execute.call_args_list]
+    assert all(statement.if_not_exists for statement in statements)
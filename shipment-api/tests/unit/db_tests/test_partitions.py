@@ -0,0 +1,94 @@
+"""Unit tests for the partition management module."""
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from src.db import shipment_archive_table, shipment_event_table, shipment_table
+from src.partitions import (
+    add_months,
+    create_archive_partitions,
+    create_partitions,
+    partition_name,
+    partitioned_tables,
+)
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 17), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+
+
+def test_shipment_events_are_partitioned_by_month():
+    ddl = str(
+        CreateTable(shipment_event_table).compile(dialect=postgresql.dialect())
+    )
+
+    assert shipment_event_table in partitioned_tables()
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert partition_name(shipment_event_table, date(2026, 3, 9)) == (
+        "shipment_events_2026_03"
+    )
+
+
+def test_create_partitions_is_idempotent(mocker):
+    connection = mocker.Mock()
+    connection.dialect = postgresql.dialect()
+
+    names = create_partitions(
+        connection, date(2026, 12, 5), 2, tables=[shipment_event_table]
+    )
+
+    assert names == [
+        "shipment_events_2026_12",
+        "shipment_events_2027_01",
+        "shipment_events_default",
+    ]
+    statements = [call.args[0] for call in connection.exec_driver_sql.call_args_list]
+    assert all(ddl.startswith("CREATE TABLE IF NOT EXISTS") for ddl in statements)
+    assert statements[1] == (
+        "CREATE TABLE IF NOT EXISTS shipment_events_2027_01 "
+        "PARTITION OF shipment_events FOR VALUES "
+        "FROM ('2027-01-01 00:00+00') TO ('2027-02-01 00:00+00')"
+    )
+    assert statements[2].endswith("PARTITION OF shipment_events DEFAULT")
+
+
+def test_shipment_archive_mirrors_shipments():
+    ddl = str(
+        CreateTable(shipment_archive_table).compile(dialect=postgresql.dialect())
+    )
+
+    assert shipment_archive_table in partitioned_tables()
+    assert shipment_table not in partitioned_tables()
+    assert set(shipment_table.c.keys()) < set(shipment_archive_table.c.keys())
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "GENERATED" not in ddl and "REFERENCES" not in ddl
+
+
+def test_archive_partitions_cover_live_shipments(mocker):
+    connection = mocker.Mock()
+    connection.dialect = postgresql.dialect()
+    current = add_months(datetime.now(timezone.utc).date(), 0)
+    oldest = add_months(current, -2)
+    connection.execute.return_value.scalar.return_value = datetime.combine(
+        oldest, datetime.min.time(), timezone.utc
+    )
+
+    names = create_archive_partitions(connection)
+
+    assert names == [
+        partition_name(shipment_archive_table, oldest),
+        partition_name(shipment_archive_table, add_months(oldest, 1)),
+        "shipments_archive_default",
+    ]
+
+
+def test_archive_partitions_without_shipments(mocker):
+    connection = mocker.Mock()
+    connection.execute.return_value.scalar.return_value = None
+
+    assert create_archive_partitions(connection) == []
+    connection.exec_driver_sql.assert_not_called()
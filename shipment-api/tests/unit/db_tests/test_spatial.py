@@ -0,0 +1,54 @@
+"""Unit tests for the spatial grid module."""
+
+import numpy
+import pytest
+from haversine import Unit, haversine_vector
+
+from src.spatial import (
+    LONGITUDE_CELLS,
+    bounding_box,
+    cell_id,
+    cell_ranges,
+    cell_sql,
+)
+
+
+def test_cell_id_numbers_rows_from_south_west():
+    assert cell_id(-90.0, -180.0) == 0
+    assert cell_id(-90.0, -179.95) == 0
+    assert cell_id(-89.85, -180.0) == LONGITUDE_CELLS
+    assert cell_id(90.0, 180.0) == cell_id(89.95, 179.95)
+
+
+def test_cell_sql_uses_the_same_operations():
+    sql = cell_sql("origin_latitude", "origin_longitude")
+
+    assert "floor((origin_latitude + 90) * 10)" in sql
+    assert "floor((origin_longitude + 180) * 10)" in sql
+
+
+@pytest.mark.parametrize(
+    "center,radius", [((52.2297, 21.0122), 25.0), ((69.65, 18.96), 80.0)]
+)
+def test_cells_cover_every_point_within_radius(center, radius):
+    rng = numpy.random.default_rng(0)
+    points = numpy.array(center) + rng.uniform(-3, 3, size=(20_000, 2))
+    distances = haversine_vector(points, [center], Unit.KILOMETERS, comb=True)[0]
+    inside = points[distances <= radius]
+
+    box = bounding_box(*center, radius)
+    ranges = cell_ranges(box)
+
+    assert len(inside)
+    for latitude, longitude in inside:
+        assert box.min_latitude <= latitude <= box.max_latitude
+        assert box.min_longitude <= longitude <= box.max_longitude
+        cell = cell_id(latitude, longitude)
+        assert any(first <= cell <= last for first, last in ranges)
+
+
+def test_bounding_box_near_pole_spans_all_longitudes():
+    box = bounding_box(89.9, 0.0, 50.0)
+
+    assert box.max_latitude == 90.0
+    assert (box.min_longitude, box.max_longitude) == (-180.0, 180.0)
@@ -0,0 +1,37 @@
+"""Unit tests for the materialized view management module."""
+
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from src.views import create_views, daily_stats_query
+
+
+def test_create_views_is_idempotent(mocker):
+    connection = mocker.Mock()
+    connection.dialect = postgresql.dialect()
+
+    assert create_views(connection) == ["shipment_daily_stats"]
+
+    view, index = [call.args[0] for call in connection.exec_driver_sql.call_args_list]
+    assert view.startswith("CREATE MATERIALIZED VIEW IF NOT EXISTS")
+    assert view.endswith("WITH NO DATA")
+    assert "FROM shipments_archive" in view
+    assert index.startswith("CREATE UNIQUE INDEX IF NOT EXISTS")
+    assert index.endswith("(day, status, courier_id) NULLS NOT DISTINCT")
+
+
+def test_daily_stats_bound_every_source():
+    query = daily_stats_query(date(2026, 3, 1), date(2026, 3, 31))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert sql.count(".created_at >= ") == 2
+    assert sql.count(".created_at < ") == 2
+    assert query.selected_columns.keys() == [
+        "day",
+        "status",
+        "courier_id",
+        "shipments",
+        "delivered",
+        "delivery_seconds",
+    ]
@@ -0,0 +1,176 @@
+"""Unit tests for the email outbox worker."""
+
+# pylint: disable=redefined-outer-name
+import smtplib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.infrastructure.external.email.outbox as outbox_module
+from src.infrastructure.external.email.outbox import OutboxWorker, SMTPConnection
+
+
+class SMTPSink:
+    """A stand-in for smtplib.SMTP recording sent messages."""
+
+    def __init__(self, host, port):
+        self.messages = []
+        self.fail_for = set()
+
+    def sendmail(self, from_email, to_email, message):
+        if to_email in self.fail_for:
+            raise smtplib.SMTPRecipientsRefused({to_email: (550, b"rejected")})
+        self.messages.append((from_email, to_email, message))
+
+    def quit(self):
+        pass
+
+
+def make_row(message_id, to_email, attempts=0):
+    return {
+        "id": message_id,
+        "to_email": to_email,
+        "subject": "Subject",
+        "body": "<p>Body</p>",
+        "is_html": True,
+        "attempts": attempts,
+    }
+
+
+@pytest.fixture
+def sink():
+    """
+    Fixture to provide the SMTP sink shared by all connections.
+    """
+    return SMTPSink(None, None)
+
+
+@pytest.fixture
+def worker(sink):
+    """
+    Fixture to provide an outbox worker delivering into the sink.
+    """
+    connection = SMTPConnection("localhost", 1025, factory=lambda *_: sink)
+    return OutboxWorker(
+        connection,
+        from_email="noreply@example.com",
+        batch_size=10,
+        poll_interval=0.01,
+        max_attempts=3,
+        backoff=30,
+        backoff_max=60,
+        lease=120,
+    )
+
+
+@pytest.fixture(autouse=True)
+def patch_database(mocker):
+    """
+    Patch the database used by the outbox.
+    """
+    db = mocker.patch.object(outbox_module, "database")
+    db.fetch_all = mocker.AsyncMock(return_value=[])
+    db.execute = mocker.AsyncMock(return_value=None)
+    return db
+
+
+@pytest.mark.anyio
+async def test_drain_delivers_batch(worker, sink, patch_database):
+    """
+    Test that a batch is delivered over one connection and deleted.
+    """
+    patch_database.fetch_all.return_value = [
+        make_row(1, "a@example.com"),
+        make_row(2, "b@example.com"),
+    ]
+    assert await worker.drain() == 2
+    assert [to for _, to, _ in sink.messages] == ["a@example.com", "b@example.com"]
+    assert "Subject: Subject" in sink.messages[0][2]
+    patch_database.execute.assert_awaited_once()
+    assert worker.stats() == {"sent": 2, "failed": 0}
+
+
+@pytest.mark.anyio
+async def test_drain_reschedules_failures(worker, sink, patch_database):
+    """
+    Test that a failed delivery is rescheduled and the rest of the batch sent.
+    """
+    sink.fail_for.add("a@example.com")
+    patch_database.fetch_all.return_value = [
+        make_row(1, "a@example.com", attempts=1),
+        make_row(2, "b@example.com"),
+    ]
+    await worker.drain()
+    reschedule = patch_database.execute.await_args_list[0].args[0]
+    assert reschedule.compile().params["attempts"] == 2
+    assert worker.stats() == {"sent": 1, "failed": 1}
+
+
+@pytest.mark.anyio
+async def test_drain_claims_with_lease_outside_transaction(worker, patch_database):
+    """
+    Test that a batch is leased by one statement and sent without a transaction.
+    """
+    patch_database.fetch_all.return_value = [
+        make_row(2, "b@example.com"),
+        make_row(1, "a@example.com"),
+    ]
+    started = datetime.now(timezone.utc)
+
+    rows = await worker.claim()
+
+    query = patch_database.fetch_all.await_args.args[0]
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE email_outbox")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    lease = query.compile().params["next_attempt_at"]
+    assert lease >= started + timedelta(seconds=120)
+    assert [row["id"] for row in rows] == [1, 2]
+
+    await worker.drain()
+    patch_database.transaction.assert_not_called()
+
+
+def test_backoff_is_capped(worker):
+    """
+    Test the exponential backoff delays.
+    """
+    assert [worker.backoff(attempts) for attempts in (1, 2, 3)] == [30, 60, 60]
+
+
+def test_connection_reconnects_once():
+    """
+    Test that a dropped connection is reopened before failing the message.
+    """
+    sinks = []
+
+    class DroppingSink(SMTPSink):
+        def sendmail(self, from_email, to_email, message):
+            if len(sinks) == 1:
+                raise smtplib.SMTPServerDisconnected()
+            super().sendmail(from_email, to_email, message)
+
+    def factory(host, port):
+        sinks.append(DroppingSink(host, port))
+        return sinks[-1]
+
+    connection = SMTPConnection("localhost", 1025, factory=factory)
+    connection.send("noreply@example.com", "a@example.com", "message")
+    connection.send("noreply@example.com", "b@example.com", "message")
+    assert len(sinks) == 2
+    assert len(sinks[1].messages) == 2
+
+
+@pytest.mark.anyio
+async def test_enqueue_announces_on_commit(mocker, patch_database):
+    """
+    Test that queueing a message inserts it and announces it with pg_notify,
+    without waking the worker before the transaction commits.
+    """
+    notify = mocker.patch.object(outbox_module.worker, "notify")
+    await outbox_module.enqueue("a@example.com", "Subject", "Body", False)
+    insert, announce = [call.args[0] for call in patch_database.execute.await_args_list]
+    assert str(insert).startswith("INSERT INTO email_outbox")
+    assert "pg_notify" in str(announce)
+    notify.assert_not_called()
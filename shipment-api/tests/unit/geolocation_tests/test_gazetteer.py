@@ -0,0 +1,178 @@
+"""Unit tests for the offline gazetteer geocoder."""
+
+# pylint: disable=redefined-outer-name
+import csv
+import sqlite3
+
+import pytest
+
+from src.core.domain.location import Location
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import GeocodeCache
+from src.infrastructure.external.geolocation.gazetteer import (
+    Gazetteer,
+    GazetteerGeocoder,
+    entry_key,
+)
+from src.infrastructure.services.shipment import ShipmentService
+
+COLUMNS = ["city", "street", "street_number", "postcode", "latitude", "longitude"]
+ROWS = [
+    ["Warszawa", "Trębacka", "10", "00-074", "52.2438", "21.0118"],
+    ["Warszawa", "Trębacka", "", "00-074", "52.2440", "21.0120"],
+    ["Warszawa", "Marszałkowska", "1", "00-624", "52.2203", "21.0166"],
+    ["Warszawa", "Marszałkowska", "1", "00-626", "52.2205", "21.0170"],
+    ["Kraków", "Rynek Główny", "1", "31-042", "50.0617", "19.9373"],
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    """
+    Fixture to provide a gazetteer CSV file.
+    """
+    path = tmp_path / "gazetteer.csv"
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(ROWS)
+    return path
+
+
+@pytest.fixture
+def geocoder(source):
+    """
+    Fixture to provide a geocoder backed by the CSV gazetteer.
+    """
+    return GazetteerGeocoder(Gazetteer.load(source))
+
+
+def test_entry_key_folds_polish_spelling():
+    """
+    Test that case, diacritics and the street prefix do not change the key.
+    """
+    assert entry_key("Kraków", "Rynek Główny", "1", "31-042") == entry_key(
+        "KRAKOW", "ul. rynek glowny", "1", "31042"
+    )
+
+
+def test_lookup_exact_address(geocoder):
+    """
+    Test that a location query resolves to its building.
+    """
+    result = geocoder.lookup("Trebacka, 10, warszawa, 00-074")
+    assert result.coords == (52.2438, 21.0118)
+    assert result.address == "Trębacka 10, 00-074 Warszawa"
+
+
+def test_lookup_prefers_matching_postcode(geocoder):
+    """
+    Test that the postcode picks between buildings with the same number.
+    """
+    result = geocoder.lookup("Marszałkowska, 1, Warszawa, 00-626")
+    assert result.coords == (52.2205, 21.0170)
+
+
+def test_lookup_ignores_wrong_postcode(geocoder):
+    """
+    Test that a building is found even if the postcode does not match.
+    """
+    result = geocoder.lookup("Rynek Główny, 1, Kraków, 00-000")
+    assert result.coords == (50.0617, 19.9373)
+
+
+def test_lookup_falls_back_to_street(geocoder):
+    """
+    Test that an unknown number resolves to the street entry.
+    """
+    result = geocoder.lookup("Trębacka, 99, Warszawa, 00-074")
+    assert result.coords == (52.2440, 21.0120)
+
+
+def test_lookup_misses(geocoder):
+    """
+    Test that unknown addresses and free-form queries are misses.
+    """
+    assert geocoder.lookup("Marszałkowska, 99, Warszawa, 00-624") is None
+    assert geocoder.lookup("Warszawa") is None
+    assert geocoder.stats()["misses"] == 2
+
+
+def test_load_reuses_compiled_index(source, mocker):
+    """
+    Test that the compiled index is written once and memory-mapped later.
+    """
+    Gazetteer.load(source)
+    assert (source.parent / "gazetteer.csv.idx").exists()
+    read_rows = mocker.patch(
+        "src.infrastructure.external.geolocation.gazetteer.read_rows"
+    )
+    gazetteer = Gazetteer.load(source)
+    read_rows.assert_not_called()
+    assert len(gazetteer) == len(ROWS)
+    assert len(Gazetteer.load(source.parent / "gazetteer.csv.idx")) == len(ROWS)
+
+
+def test_load_sqlite_source(tmp_path):
+    """
+    Test that a gazetteer is loaded from an SQLite table.
+    """
+    path = tmp_path / "gazetteer.sqlite"
+    connection = sqlite3.connect(path)
+    connection.execute(f"CREATE TABLE gazetteer ({', '.join(COLUMNS)})")
+    connection.executemany("INSERT INTO gazetteer VALUES (?, ?, ?, ?, ?, ?)", ROWS)
+    connection.commit()
+    connection.close()
+    geocoder = GazetteerGeocoder(Gazetteer.load(path))
+    assert geocoder.lookup("Trębacka, 10, Warszawa, 00-074").coords == (
+        52.2438,
+        21.0118,
+    )
+
+
+@pytest.mark.anyio
+async def test_geocode_falls_back_on_gazetteer_miss(geocoder, mocker):
+    """
+    Test that only gazetteer misses are geocoded remotely.
+    """
+    mocker.patch.object(geopy, "gazetteer", geocoder)
+    cache = GeocodeCache(maxsize=10, ttl=60, negative_ttl=5, persistent=False)
+    mocker.patch.object(geopy, "cache", cache)
+    remote = mocker.patch.object(geopy, "remote")
+    remote.geocode = mocker.AsyncMock(return_value=None)
+
+    assert await geopy.geocode("Trębacka, 10, Warszawa, 00-074")
+    remote.geocode.assert_not_awaited()
+    assert await geopy.geocode("Nowhere, 1, Warszawa, 00-000") is None
+    remote.geocode.assert_awaited_once_with("Nowhere, 1, Warszawa, 00-000")
+
+
+@pytest.mark.anyio
+async def test_geocode_without_fallback(geocoder, mocker):
+    """
+    Test that misses are not found when the remote geocoder is disabled.
+    """
+    mocker.patch.object(geopy, "gazetteer", geocoder)
+    cache = GeocodeCache(maxsize=10, ttl=60, negative_ttl=5, persistent=False)
+    mocker.patch.object(geopy, "cache", cache)
+    mocker.patch.object(geopy, "remote", None)
+    assert await geopy.geocode("Nowhere, 1, Warszawa, 00-000") is None
+
+
+@pytest.mark.anyio
+async def test_location_coords_from_gazetteer_only(geocoder, mocker):
+    """
+    Test that a courier location resolves from the gazetteer without fallback.
+    """
+    mocker.patch.object(geopy, "gazetteer", geocoder)
+    cache = GeocodeCache(maxsize=10, ttl=60, negative_ttl=5, persistent=False)
+    mocker.patch.object(geopy, "cache", cache)
+    mocker.patch.object(geopy, "remote", None)
+    location = Location(
+        street="Marszałkowska", street_number="1", city="Warszawa", postcode="00-624"
+    )
+
+    coords = await ShipmentService._get_location_coords(location)
+
+    assert coords == (52.2203, 21.0166)
+    assert geocoder.stats()["misses"] == 0
@@ -0,0 +1,152 @@
+"""Unit tests for the geocode cache."""
+
+# pylint: disable=redefined-outer-name
+import pytest
+
+import src.infrastructure.external.geolocation.cache as cache_module
+from src.infrastructure.cache.ttl import MISSING, TTLCache
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import (
+    GeocodeCache,
+    GeocodeResult,
+    normalize_query,
+)
+
+WARSZAWA = GeocodeResult("Warszawa, Polska", 52.2297, 21.0122)
+
+
+class StubLocation:
+    """A stand-in for geopy's Location."""
+
+    latitude = WARSZAWA.latitude
+    longitude = WARSZAWA.longitude
+
+    def __str__(self):
+        return WARSZAWA.address
+
+
+@pytest.fixture(autouse=True)
+def patch_database(mocker):
+    """
+    Patch the database used by the persistent tier.
+    """
+    db = mocker.patch.object(cache_module, "database")
+    db.fetch_one = mocker.AsyncMock(return_value=None)
+    db.execute = mocker.AsyncMock(return_value=None)
+    return db
+
+
+@pytest.fixture
+def geocode_cache():
+    """
+    Fixture to provide a GeocodeCache instance for testing.
+    """
+    return GeocodeCache(maxsize=10, ttl=60, negative_ttl=5)
+
+
+@pytest.fixture
+def upstream(mocker):
+    """
+    Patch the geopy module with a fresh cache and a stub geocoder.
+    """
+    mocker.patch.object(
+        geopy, "cache", GeocodeCache(maxsize=10, ttl=60, negative_ttl=5)
+    )
+    geocoder = mocker.patch.object(geopy, "geolocator")
+    geocoder.geocode.side_effect = lambda query: StubLocation()
+    return geocoder
+
+
+def test_normalize_query():
+    """
+    Test that separators and letter case do not change the cache key.
+    """
+    assert normalize_query(" Trębacka, 10,  Warszawa ") == "trębacka 10 warszawa"
+    assert normalize_query("TRĘBACKA 10 WARSZAWA") == "trębacka 10 warszawa"
+
+
+def test_ttl_cache_expires_and_evicts():
+    """
+    Test that TTLCache expires entries and evicts the least recently used one.
+    """
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    now[0] = 11
+    assert cache.get("a") is MISSING
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_cache_miss_then_memory_hit(geocode_cache, patch_database):
+    """
+    Test that a stored result is served from memory under the query and aliases.
+    """
+    assert await geocode_cache.get("Warszawa") is MISSING
+    await geocode_cache.set("Warszawa", WARSZAWA, WARSZAWA.address)
+    assert await geocode_cache.get("warszawa") == WARSZAWA
+    assert await geocode_cache.get("Warszawa, Polska") == WARSZAWA
+    patch_database.execute.assert_awaited_once()
+    assert geocode_cache.stats()["memory_hits"] == 2
+
+
+@pytest.mark.anyio
+async def test_negative_caching(geocode_cache):
+    """
+    Test that "not found" results are cached as None.
+    """
+    await geocode_cache.set("Nowhere", None)
+    assert await geocode_cache.get("nowhere") is None
+    assert geocode_cache.stats()["negative_hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_persistent_hit_populates_memory(geocode_cache, patch_database):
+    """
+    Test that a result loaded from the table is promoted to the memory tier.
+    """
+    patch_database.fetch_one.return_value = {
+        "address": WARSZAWA.address,
+        "latitude": WARSZAWA.latitude,
+        "longitude": WARSZAWA.longitude,
+    }
+    assert await geocode_cache.get("Warszawa") == WARSZAWA
+    assert await geocode_cache.get("Warszawa") == WARSZAWA
+    patch_database.fetch_one.assert_awaited_once()
+    assert geocode_cache.stats()["persistent_hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_persistent_tier_failure_is_a_miss(geocode_cache, patch_database):
+    """
+    Test that database errors do not break geocoding.
+    """
+    patch_database.fetch_one.side_effect = ConnectionError("down")
+    assert await geocode_cache.get("Warszawa") is MISSING
+
+
+@pytest.mark.anyio
+async def test_warm_keys_make_no_upstream_calls(upstream):
+    """
+    Test that repeated geocoding of the same address is served from the cache.
+    """
+    first = await geopy.get_coords("Warszawa")
+    second = await geopy.get_coords(" warszawa ")
+    assert first == second == WARSZAWA.coords
+    assert upstream.geocode.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_not_found_is_cached(upstream):
+    """
+    Test that an address which cannot be found is not geocoded twice.
+    """
+    upstream.geocode.side_effect = lambda query: None
+    with pytest.raises(ValueError):
+        await geopy.get_address("Nowhere")
+    assert await geopy.get_coords("Nowhere") is None
+    assert upstream.geocode.call_count == 1
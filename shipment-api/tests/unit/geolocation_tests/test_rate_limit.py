@@ -0,0 +1,202 @@
+"""Unit tests for the geocoder rate limiter and circuit breaker."""
+
+# pylint: disable=redefined-outer-name
+import asyncio
+
+import pytest
+from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from src.infrastructure.external.geolocation.ratelimit import (
+    Priority,
+    RateLimiter,
+    prioritized,
+)
+
+
+class Clock:
+    """A manually advanced timer."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Fixture to provide a manual timer.
+    """
+    return Clock()
+
+
+@pytest.mark.anyio
+async def test_limiter_serves_interactive_before_bulk():
+    """
+    Test that queued interactive calls get tokens before earlier bulk calls.
+    """
+    limiter = RateLimiter(rate=200, burst=1)
+    await limiter.acquire()
+    order = []
+
+    async def call(name, priority):
+        with prioritized(priority):
+            await limiter.acquire()
+        order.append(name)
+
+    await asyncio.gather(
+        call("bulk-1", Priority.BULK),
+        call("bulk-2", Priority.BULK),
+        call("interactive", Priority.INTERACTIVE),
+    )
+    assert order == ["interactive", "bulk-1", "bulk-2"]
+    stats = limiter.stats()
+    assert stats["acquired"] == 4
+    assert stats["queued"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait"] > 0
+
+
+@pytest.mark.anyio
+async def test_limiter_throttles_to_rate():
+    """
+    Test that calls beyond the burst are spaced by the rate.
+    """
+    limiter = RateLimiter(rate=100, burst=2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+    assert loop.time() - started >= 0.035
+
+
+@pytest.mark.anyio
+async def test_limiter_queue_timeout():
+    """
+    Test that a call waiting longer than its timeout gives up.
+    """
+    limiter = RateLimiter(rate=1, burst=1)
+    await limiter.acquire()
+    with pytest.raises(TimeoutError):
+        await limiter.acquire(timeout=0.01)
+    assert limiter.stats()["timeouts"] == 1
+
+
+@pytest.mark.anyio
+async def test_breaker_opens_and_fails_fast(clock):
+    """
+    Test that consecutive failures open the circuit and calls are rejected.
+    """
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30, timer=clock)
+
+    async def fail():
+        raise GeocoderUnavailable("down")
+
+    for _ in range(2):
+        with pytest.raises(GeocoderUnavailable):
+            await breaker.call(fail)
+    assert breaker.state == OPEN
+
+    async def succeed():
+        raise AssertionError("must not be called")
+
+    with pytest.raises(GeocoderUnavailable, match="circuit is open"):
+        await breaker.call(succeed)
+    assert breaker.stats()["rejected"] == 1
+
+
+@pytest.mark.anyio
+async def test_breaker_half_open_trial(clock):
+    """
+    Test that one trial call is let through after the reset timeout.
+    """
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30, timer=clock)
+
+    async def fail():
+        raise GeocoderUnavailable("down")
+
+    with pytest.raises(GeocoderUnavailable):
+        await breaker.call(fail)
+    clock.now = 30
+    release = asyncio.Event()
+
+    async def trial():
+        await release.wait()
+        return 1
+
+    first = asyncio.ensure_future(breaker.call(trial))
+    await asyncio.sleep(0)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(GeocoderUnavailable):
+        breaker.check()
+    release.set()
+    assert await first == 1
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.anyio
+async def test_breaker_failed_trial_reopens(clock):
+    """
+    Test that a failed trial call opens the circuit again.
+    """
+    breaker = CircuitBreaker(threshold=3, reset_timeout=30, timer=clock)
+    breaker.state = OPEN
+
+    async def fail():
+        raise GeocoderUnavailable("down")
+
+    clock.now = 30
+    with pytest.raises(GeocoderUnavailable, match="down"):
+        await breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(GeocoderUnavailable, match="circuit is open"):
+        breaker.check()
+
+
+@pytest.mark.anyio
+async def test_nominatim_geocoder_fails_fast_when_open(mocker, clock):
+    """
+    Test that an open circuit rejects lookups before they are queued.
+    """
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30, timer=clock)
+    breaker.state = OPEN
+    limiter = RateLimiter(rate=1, burst=1)
+    geolocator = mocker.patch.object(geopy, "geolocator")
+    with pytest.raises(GeocoderUnavailable):
+        await geopy.NominatimGeocoder(limiter, breaker).geocode("Warszawa")
+    geolocator.geocode.assert_not_called()
+    assert limiter.stats()["acquired"] == 0
+
+
+@pytest.mark.anyio
+async def test_nominatim_geocoder_interactive_queue_timeout(mocker):
+    """
+    Test that interactive lookups give up waiting for the rate limit.
+    """
+    mocker.patch.object(geopy.config, "GEOCODER_QUEUE_TIMEOUT", 0.01)
+    limiter = RateLimiter(rate=1, burst=1)
+    await limiter.acquire()
+    geocoder = geopy.NominatimGeocoder(limiter, CircuitBreaker(1, 30))
+    with pytest.raises(GeocoderTimedOut):
+        await geocoder.geocode("Warszawa")
+
+
+@pytest.mark.anyio
+async def test_nominatim_geocoder_bulk_queue_timeout(mocker):
+    """
+    Test that bulk lookups wait for the rate limit for a bounded time too.
+    """
+    mocker.patch.object(geopy.config, "GEOCODER_BULK_QUEUE_TIMEOUT", 0.01)
+    limiter = RateLimiter(rate=1, burst=1)
+    await limiter.acquire()
+    geocoder = geopy.NominatimGeocoder(limiter, CircuitBreaker(1, 30))
+    with prioritized(Priority.BULK), pytest.raises(GeocoderTimedOut) as error:
+        await geocoder.geocode("Warszawa")
+    assert error.value.__suppress_context__
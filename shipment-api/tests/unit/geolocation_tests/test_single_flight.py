@@ -0,0 +1,107 @@
+"""Unit tests for coalescing of concurrent geocode lookups."""
+
+# pylint: disable=redefined-outer-name
+import asyncio
+
+import pytest
+
+from src.infrastructure.external.geolocation import geopy
+from src.infrastructure.external.geolocation.cache import GeocodeCache, GeocodeResult
+from src.infrastructure.external.geolocation.ratelimit import Priority, prioritized
+from src.infrastructure.external.geolocation.singleflight import SingleFlight
+
+WARSZAWA = GeocodeResult("Warszawa, Polska", 52.2297, 21.0122)
+
+
+@pytest.fixture
+def upstream(mocker):
+    """
+    Patch the geopy module with a fresh cache, single-flight and slow stub.
+    """
+    cache = GeocodeCache(maxsize=10, ttl=60, negative_ttl=5, persistent=False)
+    mocker.patch.object(geopy, "cache", cache)
+    mocker.patch.object(geopy, "gazetteer", None)
+    mocker.patch.object(geopy, "in_flight", SingleFlight())
+
+    async def geocode(query):
+        await asyncio.sleep(0.01)
+        return WARSZAWA
+
+    remote = mocker.patch.object(geopy, "remote")
+    remote.geocode = mocker.AsyncMock(side_effect=geocode)
+    return remote
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_lookups_make_one_call(upstream):
+    """
+    Test that 500 concurrent identical lookups share one upstream call.
+    """
+    results = await asyncio.gather(
+        *(geopy.geocode("Warszawa" if i % 2 else " WARSZAWA ") for i in range(500))
+    )
+    assert results == [WARSZAWA] * 500
+    assert upstream.geocode.await_count == 1
+    assert geopy.in_flight.stats() == {"calls": 1, "coalesced": 499, "in_flight": 0}
+
+
+@pytest.mark.anyio
+async def test_distinct_lookups_are_not_coalesced(upstream):
+    """
+    Test that different queries are geocoded separately.
+    """
+    await asyncio.gather(geopy.geocode("Warszawa"), geopy.geocode("Kraków"))
+    assert upstream.geocode.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_failure_is_shared_and_forgotten(upstream):
+    """
+    Test that an upstream error reaches every caller and is not remembered.
+    """
+    upstream.geocode.side_effect = TimeoutError("upstream")
+    results = await asyncio.gather(
+        *(geopy.geocode("Warszawa") for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert upstream.geocode.await_count == 1
+
+    upstream.geocode.side_effect = None
+    upstream.geocode.return_value = WARSZAWA
+    assert await geopy.geocode("Warszawa") == WARSZAWA
+    assert upstream.geocode.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    """
+    Test that the shared call completes for others if one caller is cancelled.
+    """
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return 1
+
+    first = asyncio.ensure_future(flight.do("key", call))
+    second = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == 1
+    assert first.cancelled()
+
+
+@pytest.mark.anyio
+async def test_lookups_are_not_coalesced_across_priorities(upstream):
+    """
+    Test that an interactive lookup does not join a bulk one.
+    """
+
+    async def bulk():
+        with prioritized(Priority.BULK):
+            return await geopy.geocode("Warszawa")
+
+    await asyncio.gather(bulk(), bulk(), geopy.geocode("Warszawa"))
+    assert upstream.geocode.await_count == 2
@@ -0,0 +1,67 @@
+"""Unit tests for the courier assignment engine."""
+
+from itertools import product
+
+import numpy
+import pytest
+
+from src.infrastructure.routing.assignment import UNASSIGNED, assign, cost_matrix
+
+
+def make_points(count, seed=0):
+    """
+    Helper function to create random points around Warsaw.
+    """
+    rng = numpy.random.default_rng(seed)
+    return rng.uniform([52.0, 20.8], [52.4, 21.3], size=(count, 2))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_assign_matches_exhaustive_search(seed):
+    """
+    Test that small assignments are optimal and respect capacities.
+    """
+    shipments, depots = make_points(6, seed), make_points(3, seed + 100)
+    capacities = numpy.array([2, 2, 3])
+    costs = cost_matrix(shipments, depots)
+    optimum = min(
+        costs[numpy.arange(6), couriers].sum()
+        for couriers in product(range(3), repeat=6)
+        if (numpy.bincount(couriers, minlength=3) <= capacities).all()
+    )
+
+    result = assign(shipments, depots, capacities, time_budget=5.0)
+
+    assert (numpy.bincount(result.couriers, minlength=3) <= capacities).all()
+    assert result.total_distance == pytest.approx(optimum, abs=0.05)
+    assert result.converged
+
+
+def test_local_search_improves_greedy_assignment():
+    """
+    Test that local search never makes the greedy assignment longer.
+    """
+    shipments, depots = make_points(400, seed=1), make_points(20, seed=2)
+    capacities = numpy.full(20, 20)
+
+    greedy = assign(shipments, depots, capacities, time_budget=0.0)
+    improved = assign(shipments, depots, capacities, time_budget=5.0)
+
+    assert not greedy.converged
+    assert improved.converged
+    assert improved.moves > 0
+    assert improved.total_distance < greedy.total_distance
+    assert numpy.bincount(improved.couriers).max() <= 20
+
+
+def test_assign_leaves_shipments_over_capacity():
+    """
+    Test that shipments beyond the total capacity are left unassigned.
+    """
+    shipments, depots = make_points(10), make_points(2, seed=1)
+
+    result = assign(shipments, depots, numpy.array([3, 0]), time_budget=1.0)
+
+    assert result.couriers.count(UNASSIGNED) == 7
+    assert set(result.couriers) == {0, UNASSIGNED}
+    assert assign(shipments, depots[:0], numpy.array([]), 1.0).total_distance == 0
@@ -0,0 +1,66 @@
+"""Unit tests for the courier route planner."""
+
+import numpy
+import pytest
+
+from src.infrastructure.routing.planner import NO_PREDECESSOR, plan
+
+START = (52.2297, 21.0122)
+
+
+def make_stops(shipments, seed=0):
+    """
+    Helper function to create stops of alternating pickups and deliveries.
+    """
+    rng = numpy.random.default_rng(seed)
+    stops, predecessors = [], []
+    for index in range(shipments):
+        if index % 2 == 0:
+            predecessors.append(NO_PREDECESSOR)
+            predecessors.append(len(stops))
+            stops.extend(rng.uniform([52.0, 20.8], [52.4, 21.3], size=(2, 2)))
+        else:
+            predecessors.append(NO_PREDECESSOR)
+            stops.append(rng.uniform([52.0, 20.8], [52.4, 21.3]))
+    return numpy.array(stops), numpy.array(predecessors)
+
+
+@pytest.mark.parametrize("shipments", [1, 2, 7, 60])
+def test_plan_visits_every_stop_after_its_predecessor(shipments):
+    """
+    Test that every stop is visited once and pickups precede their deliveries.
+    """
+    stops, predecessors = make_stops(shipments)
+
+    route = plan(START, stops, predecessors, time_budget=5.0)
+
+    assert sorted(route.order) == list(range(len(stops)))
+    positions = {stop: position for position, stop in enumerate(route.order)}
+    for stop, predecessor in enumerate(predecessors):
+        if predecessor != NO_PREDECESSOR:
+            assert positions[predecessor] < positions[stop]
+    assert route.converged
+    assert route.total_distance == pytest.approx(sum(route.legs), abs=0.01 * len(stops))
+
+
+def test_two_opt_shortens_nearest_neighbour_route():
+    """
+    Test that 2-opt improvement never makes the greedy route longer.
+    """
+    stops, predecessors = make_stops(60, seed=3)
+
+    greedy = plan(START, stops, predecessors, time_budget=0.0)
+    improved = plan(START, stops, predecessors, time_budget=5.0)
+
+    assert not greedy.converged
+    assert improved.total_distance < greedy.total_distance
+
+
+def test_plan_without_stops():
+    """
+    Test that an empty route is planned when there are no stops.
+    """
+    route = plan(START, numpy.empty((0, 2)), numpy.empty(0, dtype=int), 1.0)
+
+    assert route.order == []
+    assert route.total_distance == 0.0
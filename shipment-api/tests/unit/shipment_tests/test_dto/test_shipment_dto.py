@@ -0,0 +1,139 @@
+"""Unit tests for shipment DTOs built from records and their serialization."""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.api.responses import json_response
+from src.core.domain.shipment import ShipmentStatus
+from src.infrastructure.dto.shipmentDTO import (
+    PackageDTO,
+    ShipmentDTO,
+    ShipmentWithDistanceDTO,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def make_shipment_record():
+    """
+    Helper function to create a shipment record.
+    """
+    return {
+        "id": 1,
+        "sender_id": uuid4(),
+        "recipient_id": None,
+        "courier_id": uuid4(),
+        "sender_fullname": "Jan Kowalski",
+        "recipient_fullname": None,
+        "recipient_email": "client@example.com",
+        "status": ShipmentStatus.OUT_FOR_DELIVERY,
+        "origin": "Warszawa",
+        "destination": "Kraków",
+        "origin_latitude": 52.2297,
+        "origin_longitude": 21.0122,
+        "destination_latitude": 50.0647,
+        "destination_longitude": 19.945,
+        "created_at": NOW,
+        "last_updated": NOW,
+    }
+
+
+def make_package_record():
+    """
+    Helper function to create a package record.
+    """
+    return {
+        "id": 1,
+        "weight": 1.5,
+        "length": 10.0,
+        "width": 20.0,
+        "height": 30.0,
+        "fragile": True,
+        "created_at": NOW,
+        "last_updated": NOW,
+        "pickup_scheduled_date": None,
+        "pickup_actual_date": None,
+        "delivery_scheduled_date": NOW,
+        "delivery_actual_date": None,
+        "cancelled_at": None,
+        "note": None,
+    }
+
+
+def test_shipment_from_record_matches_validation():
+    """
+    Test that the trusted path builds the same DTO as full validation.
+    """
+    record = make_shipment_record()
+    validated = ShipmentDTO(
+        **record,
+        origin_coords=(record["origin_latitude"], record["origin_longitude"]),
+        destination_coords=(
+            record["destination_latitude"],
+            record["destination_longitude"],
+        ),
+    )
+
+    shipment = ShipmentDTO.from_record(record)
+
+    assert shipment == validated
+    assert shipment.status == "out_for_delivery"
+    assert shipment.model_dump_json() == validated.model_dump_json()
+
+
+def test_shipment_with_distance_from_record_is_mutable():
+    """
+    Test that distances can be set on a DTO built from a record.
+    """
+    shipment = ShipmentWithDistanceDTO.from_record(make_shipment_record())
+    shipment.origin_distance = 1.5
+
+    assert isinstance(shipment, ShipmentWithDistanceDTO)
+    assert shipment.model_dump()["origin_distance"] == 1.5
+
+
+def test_package_from_record_matches_validation():
+    """
+    Test that the trusted path builds the same package DTO as full validation.
+    """
+    record = make_package_record()
+
+    assert PackageDTO.from_record(record) == PackageDTO(**record)
+
+
+@pytest.mark.parametrize(
+    "model, record",
+    [
+        (ShipmentDTO, make_shipment_record()),
+        (ShipmentWithDistanceDTO, make_shipment_record()),
+        (PackageDTO, make_package_record()),
+    ],
+)
+def test_trusted_dto_round_trips(model, record):
+    """
+    Test that every field of a DTO built without validation survives
+    dumping, and validating the dump gives the same DTO.
+    """
+    dto = model.from_record(record)
+
+    assert dto.model_fields_set == set(model.model_fields)
+    assert model.model_validate(dto.model_dump()) == dto
+    assert model.model_validate_json(dto.model_dump_json()) == dto
+    assert dto.model_dump_json() == model.model_validate(
+        dto.model_dump()
+    ).model_dump_json()
+
+
+def test_json_response_matches_pydantic_serialization():
+    """
+    Test that the orjson response renders DTOs as pydantic does.
+    """
+    shipments = [ShipmentDTO.from_record(make_shipment_record()) for _ in range(2)]
+
+    response = json_response(shipments)
+
+    assert response.media_type == "application/json"
+    assert response.body == TypeAdapter(list[ShipmentDTO]).dump_json(shipments)
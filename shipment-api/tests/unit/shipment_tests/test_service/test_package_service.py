@@ -0,0 +1,178 @@
+"""Unit tests for bulk ingestion in Package service."""
+
+# pylint: disable=redefined-outer-name
+from uuid import uuid4
+
+import pytest
+
+import src.infrastructure.services.package as package_service_module
+from src.api.bulk import csv_row_to_item, iterate_csv
+from src.core.domain.location import Location
+from src.core.domain.shipment import (
+    PackageIn,
+    ResolvedAddress,
+    ResolvedShipment,
+    ShipmentIn,
+)
+from src.infrastructure.services.package import PackageService
+
+COORDS = [52.2297, 21.0122]
+
+
+def make_row(recipient_email="client@example.com", coords=COORDS, weight=1.5):
+    """
+    Helper function to create a bulk ingestion row.
+    """
+    return {
+        "shipment": {
+            "recipient_email": recipient_email,
+            "origin": {"city": "Warszawa"},
+            "destination": {"city": "Kraków"},
+            "origin_coords": coords,
+            "destination_coords": coords,
+        },
+        "package": {
+            "weight": weight,
+            "length": 10,
+            "width": 10,
+            "height": 10,
+            "fragile": False,
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def patch_database(mocker):
+    """
+    Patch the database used for service transactions.
+    """
+    return mocker.patch.object(package_service_module, "database")
+
+
+@pytest.fixture
+def shipment_service(mocker):
+    """
+    Mock the shipment service resolving coordinates and loading shipments.
+    """
+    service = mocker.AsyncMock()
+
+    async def resolve_shipments(shipments):
+        return [
+            (
+                ResolvedShipment(
+                    data=shipment,
+                    origin=ResolvedAddress(
+                        query="origin", address="origin", coords=COORDS
+                    ),
+                    destination=ResolvedAddress(
+                        query="destination", address="destination", coords=COORDS
+                    ),
+                )
+                if shipment.origin_coords
+                else None
+            )
+            for shipment in shipments
+        ]
+
+    async def add_shipments(shipments, user_id):
+        return list(range(100, 100 + len(shipments)))
+
+    service.resolve_shipments.side_effect = resolve_shipments
+    service.add_shipments.side_effect = add_shipments
+    return service
+
+
+@pytest.fixture
+def package_service(mocker, shipment_service):
+    """
+    Fixture to create a PackageService instance with mocked dependencies.
+    """
+    service = PackageService(mocker.AsyncMock(), shipment_service)
+    service._email_service = mocker.AsyncMock()
+    return service
+
+
+@pytest.mark.anyio
+async def test_bulk_reports_per_row_results(package_service, shipment_service):
+    """
+    Test that valid rows are loaded and invalid ones reported in input order.
+    """
+    rows = [make_row(), make_row(weight="heavy"), make_row(coords=None), make_row()]
+    results = await package_service.add_packages_with_shipments(rows, uuid4())
+
+    assert [result.shipment_id for result in results] == [100, None, None, 101]
+    assert results[1].error.startswith("package.weight")
+    assert results[2].error == "Address not found"
+    assert len(shipment_service.add_shipments.await_args.args[0]) == 2
+    packages = package_service._repository.add_packages.await_args.args[0]
+    assert [shipment_id for shipment_id, _ in packages] == [100, 101]
+
+
+@pytest.mark.anyio
+async def test_bulk_queues_notifications_in_transaction(
+    package_service, patch_database
+):
+    """
+    Test that notifications are queued for rows with a recipient email.
+    """
+    rows = [make_row(), make_row(recipient_email="")]
+    await package_service.add_packages_with_shipments(rows, uuid4())
+
+    recipients = package_service._email_service.send_package_created_emails
+    assert list(recipients.await_args.args[0]) == [("client@example.com", 100)]
+    patch_database.transaction.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_add_package_geocodes_before_transaction(
+    package_service, shipment_service, patch_database, mocker
+):
+    """
+    Test that addresses are resolved before the transaction is opened.
+    """
+    events = []
+
+    def transaction():
+        events.append("transaction")
+        return mocker.MagicMock()
+
+    shipment_service.resolve_shipment.side_effect = lambda data: events.append(
+        "resolve"
+    )
+    patch_database.transaction.side_effect = transaction
+
+    await package_service.add_package_with_shipment(
+        PackageIn(weight=1, length=1, width=1, height=1, fragile=False),
+        ShipmentIn(origin=Location(), destination=Location()),
+        uuid4(),
+    )
+
+    assert events == ["resolve", "transaction"]
+    shipment_service.add_resolved_shipment.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_iterate_csv_across_chunks():
+    """
+    Test that CSV rows split across chunks are parsed into bulk items.
+    """
+    body = (
+        "\ufeffrecipient_email,origin_city,origin_latitude,origin_longitude,"
+        "destination_city,weight,length,width,height,fragile\n"
+        "a@example.com,Warszawa,52.2,21.0,Kraków,1.5,10,10,10,false\n"
+        "\n"
+        "b@example.com,Gdańsk,,,Poznań,2,10,10,10,true"
+    ).encode()
+
+    async def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    rows = [csv_row_to_item(row) async for row in iterate_csv(chunks())]
+
+    assert len(rows) == 2
+    assert rows[0]["shipment"]["origin"] == {"city": "Warszawa"}
+    assert rows[0]["shipment"]["origin_coords"] == ("52.2", "21.0")
+    assert rows[1]["shipment"]["origin_coords"] is None
+    assert rows[1]["shipment"]["destination"] == {"city": "Poznań"}
+    assert rows[1]["package"]["fragile"] == "true"
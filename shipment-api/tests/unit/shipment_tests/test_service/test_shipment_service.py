@@ -0,0 +1,929 @@
+"""Unit tests for Shipment service."""
+
+# pylint: disable=redefined-outer-name
+import asyncio
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from geopy.exc import GeocoderUnavailable
+
+import src.infrastructure.services.shipment as shipment_service_module
+from src.config import config
+from src.core.domain.location import Location
+from src.core.domain.shipment import CourierDepot, ShipmentIn, ShipmentStatus
+from src.db import TERMINAL_SHIPMENT_STATUSES
+from src.infrastructure.cache.tracking import TrackingCache, etag_matches
+from src.infrastructure.cache.workload import WorkloadCounters
+from src.infrastructure.external.geolocation import geopy as geopy_module
+from src.infrastructure.external.geolocation.cache import GeocodeResult
+from src.infrastructure.services.shipment import ShipmentService
+
+COURIER_COORDS = (52.2297, 21.0122)
+
+
+def make_record(shipment_id, status, origin, destination):
+    """
+    Helper function to create a shipment record.
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        "id": shipment_id,
+        "sender_id": None,
+        "recipient_id": None,
+        "courier_id": None,
+        "sender_fullname": None,
+        "recipient_fullname": None,
+        "recipient_email": None,
+        "status": status,
+        "origin": "origin",
+        "destination": "destination",
+        "origin_latitude": origin[0],
+        "origin_longitude": origin[1],
+        "destination_latitude": destination[0],
+        "destination_longitude": destination[1],
+        "created_at": now,
+        "last_updated": now,
+    }
+
+
+@pytest.fixture
+def repo_mock(mocker):
+    """
+    Mock the repository for shipment service.
+    """
+    return mocker.AsyncMock()
+
+
+@pytest.fixture
+def shipment_service(repo_mock, mocker):
+    """
+    Fixture to create a ShipmentService instance with mocked dependencies.
+    """
+    return ShipmentService(
+        repo_mock, mocker.AsyncMock(), TrackingCache(100, 60), WorkloadCounters()
+    )
+
+
+@pytest.fixture(autouse=True)
+def patch_database(mocker):
+    """
+    Patch the database used for service transactions.
+    """
+    return mocker.patch.object(shipment_service_module, "database")
+
+
+@pytest.fixture(autouse=True)
+def patch_geocoding(mocker):
+    """
+    Patch geocoding of the courier location.
+    """
+    return mocker.patch.object(
+        shipment_service_module.geopy,
+        "geocode",
+        mocker.AsyncMock(return_value=GeocodeResult("Warszawa", *COURIER_COORDS)),
+    )
+
+
+@pytest.fixture
+def courier_records():
+    """
+    Fixture with a pickup in Krakow, a delivery in Lodz and a pickup in Warszawa.
+    """
+    krakow, lodz, warszawa = (50.0647, 19.945), (51.7592, 19.456), (52.23, 21.01)
+    far_away = (54.35, 18.65)
+    return [
+        make_record(1, ShipmentStatus.READY_FOR_PICKUP, krakow, far_away),
+        make_record(2, ShipmentStatus.OUT_FOR_DELIVERY, far_away, lodz),
+        make_record(3, ShipmentStatus.RETURNED_TO_SENDER, warszawa, far_away),
+    ]
+
+
+@pytest.mark.anyio
+async def test_sort_by_distance(shipment_service, repo_mock, courier_records):
+    """
+    Test that pickups are ranked by origin and deliveries by destination distance.
+    """
+    repo_mock.get_filtered_shipments.return_value = courier_records
+    courier_id = uuid4()
+    result = await shipment_service.sort_by_distance(courier_id, Location())
+    assert [shipment.id for shipment in result] == [3, 2, 1]
+    assert result[0].origin_distance < 1
+    assert result[1].destination_distance == pytest.approx(119.4, abs=1)
+    assert result[1].origin_distance is None
+    filters = repo_mock.get_filtered_shipments.await_args.kwargs
+    assert filters["courier_id"] == courier_id
+    assert ShipmentStatus.PENDING not in filters["statuses"]
+
+
+@pytest.mark.anyio
+async def test_sort_by_distance_limit(shipment_service, repo_mock, courier_records):
+    """
+    Test that only the nearest shipments are returned when a limit is given.
+    """
+    repo_mock.get_filtered_shipments.return_value = courier_records
+    result = await shipment_service.sort_by_distance(uuid4(), Location(), limit=2)
+    assert [shipment.id for shipment in result] == [3, 2]
+
+
+@pytest.mark.anyio
+async def test_sort_by_distance_no_shipments(shipment_service, repo_mock):
+    """
+    Test that None is returned when the courier has no actionable shipments.
+    """
+    repo_mock.get_filtered_shipments.return_value = []
+    assert await shipment_service.sort_by_distance(uuid4(), Location()) is None
+
+
+@pytest.mark.anyio
+async def test_sort_by_distance_unknown_location(
+    shipment_service, repo_mock, courier_records, patch_geocoding
+):
+    """
+    Test that a courier location which cannot be geocoded raises ValueError.
+    """
+    repo_mock.get_filtered_shipments.return_value = courier_records
+    patch_geocoding.return_value = None
+    with pytest.raises(ValueError):
+        await shipment_service.sort_by_distance(uuid4(), Location())
+
+
+@pytest.mark.anyio
+async def test_get_all_shipments_unfiltered(shipment_service, repo_mock, courier_records):
+    """
+    Test that shipments are not filtered when no filter is given.
+    """
+    repo_mock.get_all_shipments.return_value = courier_records
+    result = await shipment_service.get_all_shipments()
+    assert len(result) == 3
+    repo_mock.get_filtered_shipments.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_get_all_shipments_filtered(shipment_service, repo_mock, courier_records):
+    """
+    Test that filters are pushed down to the repository.
+    """
+    repo_mock.get_filtered_shipments.return_value = courier_records[:1]
+    sender_id = uuid4()
+    result = await shipment_service.get_all_shipments(
+        sender_id=sender_id, recipient_email="client@example.com"
+    )
+    assert [shipment.id for shipment in result] == [1]
+    repo_mock.get_filtered_shipments.assert_awaited_once_with(
+        courier_id=None,
+        sender_id=sender_id,
+        recipient_email="client@example.com",
+        statuses=None,
+        after_id=None,
+        limit=None,
+        include_archived=False,
+    )
+    repo_mock.get_all_shipments.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_iterate_shipments_pages_the_cursor(
+    shipment_service, repo_mock, courier_records, mocker
+):
+    """
+    Test that streamed shipments start after the given id and respect the limit.
+    """
+
+    async def iterate(**_):
+        for record in courier_records[1:]:
+            yield record
+
+    repo_mock.iterate_shipments = mocker.Mock(side_effect=iterate)
+    result = [
+        shipment.id
+        async for shipment in shipment_service.iterate_shipments(after_id=1, limit=2)
+    ]
+    assert result == [2, 3]
+    repo_mock.iterate_shipments.assert_called_once_with(
+        courier_id=None,
+        sender_id=None,
+        recipient_email=None,
+        statuses=None,
+        include_archived=False,
+        after_id=1,
+        limit=2,
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tracking_is_cached(shipment_service, repo_mock, courier_records):
+    """
+    Test that repeated tracking lookups are served from the cache.
+    """
+    repo_mock.check_status.return_value = courier_records[0]
+    first = await shipment_service.get_tracking(1, "client@example.com")
+    second = await shipment_service.get_tracking(1, "client@example.com")
+    assert first == second
+    assert etag_matches(first.etag, second.etag)
+    repo_mock.check_status.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_get_tracking_other_email_misses(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that a cached shipment is not served for another recipient email.
+    """
+    repo_mock.check_status.return_value = courier_records[0]
+    await shipment_service.get_tracking(1, "client@example.com")
+    repo_mock.check_status.return_value = None
+    assert await shipment_service.get_tracking(1, "other@example.com") is None
+
+
+
+@pytest.mark.anyio
+async def test_get_tracking_does_not_cache_archived_lookups(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that a shipment found among archived ones is not served from the
+    cache to a lookup of live shipments.
+    """
+    repo_mock.check_status.return_value = courier_records[0]
+    archived = await shipment_service.get_tracking(
+        1, "client@example.com", include_archived=True
+    )
+    repo_mock.check_status.return_value = None
+
+    assert archived is not None
+    assert await shipment_service.get_tracking(1, "client@example.com") is None
+    assert repo_mock.check_status.await_count == 2
+
+@pytest.mark.anyio
+async def test_update_status_invalidates_tracking(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that a status change invalidates the cached tracking response.
+    """
+    repo_mock.check_status.return_value = courier_records[0]
+    repo_mock.update_status.return_value = {
+        **courier_records[0],
+        "status": ShipmentStatus.DELIVERED,
+        "previous_status": ShipmentStatus.READY_FOR_PICKUP,
+    }
+    first = await shipment_service.get_tracking(1, "client@example.com")
+    await shipment_service.update_status(1, ShipmentStatus.DELIVERED)
+    repo_mock.check_status.return_value = {
+        **courier_records[0],
+        "status": ShipmentStatus.DELIVERED,
+    }
+    second = await shipment_service.get_tracking(1, "client@example.com")
+    assert second.etag != first.etag
+    assert repo_mock.check_status.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_get_tracking_skips_stale_fill(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that a response read before a concurrent invalidation is not cached.
+    """
+
+    async def check_status(*_):
+        if repo_mock.check_status.await_count == 1:
+            await shipment_service.assign_shipment_to_courier(1, uuid4())
+        return courier_records[0]
+
+    repo_mock.check_status.side_effect = check_status
+    repo_mock.assign_shipment_to_courier.return_value = None
+    for _ in range(3):
+        await shipment_service.get_tracking(1, "client@example.com")
+    assert repo_mock.check_status.await_count == 2
+
+
+def test_etag_matches():
+    """
+    Test If-None-Match parsing.
+    """
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.anyio
+async def test_update_status_queues_notification(
+    shipment_service, repo_mock, courier_records, patch_database
+):
+    """
+    Test that a status change queues the recipient notification in its transaction.
+    """
+    repo_mock.update_status.return_value = {
+        **courier_records[0],
+        "recipient_email": "client@example.com",
+        "previous_status": ShipmentStatus.READY_FOR_PICKUP,
+    }
+    await shipment_service.update_status(1, ShipmentStatus.DELIVERED)
+    shipment_service._email_service.send_shipment_notification.assert_awaited_once_with(
+        "client@example.com", 1, ShipmentStatus.DELIVERED.value
+    )
+    patch_database.transaction.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_update_status_records_actor_and_coords(
+    shipment_service, repo_mock, courier_records, patch_database
+):
+    """
+    Test that the actor and coordinates of a status change are recorded.
+    """
+    repo_mock.update_status.return_value = {
+        **courier_records[0],
+        "previous_status": ShipmentStatus.READY_FOR_PICKUP,
+    }
+    actor_id = uuid4()
+    await shipment_service.update_status(
+        1, ShipmentStatus.PICKED_UP, actor_id, COURIER_COORDS
+    )
+    repo_mock.update_status.assert_awaited_once_with(
+        1, ShipmentStatus.PICKED_UP, actor_id, COURIER_COORDS
+    )
+
+
+@pytest.mark.anyio
+async def test_get_timeline_reads_shipment_lifetime(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that the timeline is read within the lifetime of the shipment.
+    """
+    shipment = courier_records[0]
+    repo_mock.get_shipment_by_id.return_value = shipment
+    repo_mock.get_events.return_value = [
+        {
+            "id": 1,
+            "shipment_id": 1,
+            "status": ShipmentStatus.PICKED_UP,
+            "actor_id": None,
+            "latitude": 52.0,
+            "longitude": 21.0,
+            "created_at": shipment["created_at"],
+        },
+        {
+            "id": 2,
+            "shipment_id": 1,
+            "status": ShipmentStatus.DELIVERED,
+            "actor_id": None,
+            "latitude": None,
+            "longitude": None,
+            "created_at": shipment["last_updated"],
+        },
+    ]
+
+    timeline = await shipment_service.get_timeline(1)
+
+    repo_mock.get_shipment_by_id.assert_awaited_once_with(1, include_archived=True)
+    repo_mock.get_events.assert_awaited_once_with(
+        1, shipment["created_at"], shipment["last_updated"]
+    )
+    assert [event.status for event in timeline] == ["picked_up", "delivered"]
+    assert timeline[0].coords == (52.0, 21.0)
+    assert timeline[1].coords is None
+
+
+@pytest.mark.anyio
+async def test_get_timeline_missing_shipment(shipment_service, repo_mock):
+    """
+    Test that no timeline is returned for a missing shipment.
+    """
+    repo_mock.get_shipment_by_id.return_value = None
+    assert await shipment_service.get_timeline(1) is None
+    repo_mock.get_events.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_get_shipment_by_id_includes_archived(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that archived shipments are searched only when asked for.
+    """
+    repo_mock.get_shipment_by_id.return_value = courier_records[0]
+
+    shipment = await shipment_service.get_shipment_by_id(1, include_archived=True)
+
+    repo_mock.get_shipment_by_id.assert_awaited_once_with(1, include_archived=True)
+    assert shipment.courier_id == courier_records[0]["courier_id"]
+
+    await shipment_service.get_shipment_by_id(1)
+    repo_mock.get_shipment_by_id.assert_awaited_with(1, include_archived=False)
+
+
+@pytest.mark.anyio
+async def test_archive_shipments_moves_batches(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that terminal shipments are archived in batches until none are left.
+    """
+    repo_mock.check_status.return_value = courier_records[0]
+    cached = await shipment_service.get_tracking(1, "client@example.com")
+    repo_mock.archive_shipments.side_effect = [[1, 2], [3]]
+    before = datetime.now(timezone.utc)
+
+    archived = await shipment_service.archive_shipments(before, 2)
+
+    assert archived == 3
+    assert repo_mock.archive_shipments.await_count == 2
+    repo_mock.archive_shipments.assert_awaited_with(
+        TERMINAL_SHIPMENT_STATUSES, before, 2
+    )
+    assert ShipmentStatus.RETURNED_TO_SENDER not in TERMINAL_SHIPMENT_STATUSES
+    assert await shipment_service.get_tracking(1, "client@example.com") == cached
+    assert repo_mock.check_status.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_workload_follows_writes(shipment_service, repo_mock, courier_records):
+    """
+    Test that assignments, status changes and deletions move the counters.
+    """
+    first, second = uuid4(), uuid4()
+    repo_mock.get_courier_workload.return_value = [
+        {"courier_id": first, "status": ShipmentStatus.PICKED_UP, "shipments": 2},
+    ]
+    await shipment_service.rebuild_workload()
+
+    shipment = {**courier_records[0], "courier_id": second}
+    repo_mock.assign_shipment_to_courier.return_value = {
+        **shipment,
+        "previous_courier_id": None,
+    }
+    await shipment_service.assign_shipment_to_courier(1, second)
+    repo_mock.update_status.return_value = {
+        **shipment,
+        "status": ShipmentStatus.PICKED_UP,
+        "previous_status": ShipmentStatus.READY_FOR_PICKUP,
+    }
+    await shipment_service.update_status(1, ShipmentStatus.PICKED_UP)
+    repo_mock.assign_shipment_to_courier.return_value = {
+        **shipment,
+        "courier_id": first,
+        "status": ShipmentStatus.PICKED_UP,
+        "previous_courier_id": second,
+    }
+    await shipment_service.assign_shipment_to_courier(1, first)
+
+    workload = shipment_service.get_workload()
+    assert [(item.courier_id, item.active) for item in workload] == [(first, 3)]
+    assert shipment_service.get_workload(second)[0].active == 0
+
+    repo_mock.delete_shipment.return_value = {
+        **shipment,
+        "courier_id": first,
+        "status": ShipmentStatus.PICKED_UP,
+    }
+    await shipment_service.delete_shipment(1)
+    repo_mock.update_status.return_value = {
+        **shipment,
+        "courier_id": first,
+        "status": ShipmentStatus.DELIVERED,
+        "previous_status": ShipmentStatus.PICKED_UP,
+    }
+    await shipment_service.update_status(2, ShipmentStatus.DELIVERED)
+    assert shipment_service.get_workload(first)[0].by_status == {
+        ShipmentStatus.PICKED_UP: 1
+    }
+
+
+@pytest.mark.anyio
+async def test_reconcile_workload_measures_drift(shipment_service, repo_mock):
+    """
+    Test that reconciliation replaces the counters and reports drift.
+    """
+    courier_id = uuid4()
+    repo_mock.get_courier_workload.return_value = [
+        {"courier_id": courier_id, "status": ShipmentStatus.PICKED_UP, "shipments": 1},
+    ]
+    await shipment_service.rebuild_workload()
+    assert await shipment_service.reconcile_workload() == {}
+
+    repo_mock.get_courier_workload.return_value = [
+        {"courier_id": courier_id, "status": ShipmentStatus.PICKED_UP, "shipments": 3},
+    ]
+    drift = await shipment_service.reconcile_workload()
+    assert drift == {courier_id: {ShipmentStatus.PICKED_UP: 2}}
+    assert shipment_service.get_workload()[0].active == 3
+
+
+@pytest.mark.anyio
+async def test_reconcile_workload_skips_concurrent_writes(
+    shipment_service, repo_mock, courier_records
+):
+    """
+    Test that a reconciliation racing a write of this process is skipped.
+    """
+    courier_id = uuid4()
+
+    async def get_courier_workload():
+        repo_mock.assign_shipment_to_courier.return_value = {
+            **courier_records[0],
+            "courier_id": courier_id,
+            "previous_courier_id": None,
+        }
+        await shipment_service.assign_shipment_to_courier(1, courier_id)
+        return []
+
+    repo_mock.get_courier_workload.side_effect = get_courier_workload
+    assert await shipment_service.reconcile_workload() is None
+    assert shipment_service.get_workload()[0].active == 1
+    assert shipment_service._workload.stats()["skipped"] == 1
+
+
+@pytest.mark.anyio
+async def test_assign_automatically_respects_workload(shipment_service, repo_mock):
+    """
+    Test that shipments go to the nearest courier with capacity left.
+    """
+    busy, free = uuid4(), uuid4()
+    repo_mock.get_courier_workload.return_value = [
+        {"courier_id": busy, "status": ShipmentStatus.PICKED_UP, "shipments": 1},
+    ]
+    await shipment_service.rebuild_workload()
+    repo_mock.get_unassigned_shipments.return_value = [
+        {
+            "id": shipment_id,
+            "status": ShipmentStatus.READY_FOR_PICKUP,
+            "origin_latitude": latitude,
+            "origin_longitude": None if shipment_id == 4 else 21.0,
+        }
+        for shipment_id, latitude in [(1, 52.2), (2, 52.21), (3, 50.06), (4, 52.2)]
+    ]
+    repo_mock.assign_shipments.side_effect = lambda pairs: [
+        {
+            "id": shipment_id,
+            "courier_id": courier_id,
+            "status": ShipmentStatus.READY_FOR_PICKUP,
+        }
+        for shipment_id, courier_id in pairs
+        if shipment_id != 3
+    ]
+    couriers = [
+        CourierDepot(courier_id=busy, coords=(52.2, 21.0), capacity=2),
+        CourierDepot(courier_id=free, coords=(50.06, 19.94)),
+    ]
+
+    result = await shipment_service.assign_automatically(couriers, 10)
+
+    repo_mock.get_unassigned_shipments.assert_awaited_once()
+    pairs = dict(repo_mock.assign_shipments.await_args.args[0])
+    assert list(pairs.values()).count(busy) == 1
+    assert pairs[3] == free
+    assert [item.shipment_id for item in result.assigned] == [1, 2]
+    assert result.unassigned == [3, 4]
+    workload = shipment_service.get_workload()
+    assert {item.courier_id: item.active for item in workload} == {busy: 2, free: 1}
+
+
+
+@pytest.mark.anyio
+async def test_assign_automatically_counts_pending_shipments(
+    shipment_service, repo_mock
+):
+    """
+    Test that pending shipments assigned in one round take the capacity of
+    the courier in the next one.
+    """
+    courier = uuid4()
+    repo_mock.get_courier_workload.return_value = []
+    await shipment_service.rebuild_workload()
+    repo_mock.assign_shipments.side_effect = lambda pairs: [
+        {"id": shipment_id, "courier_id": courier_id, "status": ShipmentStatus.PENDING}
+        for shipment_id, courier_id in pairs
+    ]
+    couriers = [CourierDepot(courier_id=courier, coords=(52.2, 21.0), capacity=2)]
+
+    assigned = []
+    for first in (1, 4):
+        repo_mock.get_unassigned_shipments.return_value = [
+            {
+                "id": shipment_id,
+                "status": ShipmentStatus.PENDING,
+                "origin_latitude": 52.2,
+                "origin_longitude": 21.0,
+            }
+            for shipment_id in range(first, first + 3)
+        ]
+        result = await shipment_service.assign_automatically(couriers)
+        assigned.append(len(result.assigned))
+
+    assert assigned == [2, 0]
+    assert shipment_service.get_workload(courier)[0].by_status == {"pending": 2}
+
+
+@pytest.mark.anyio
+async def test_concurrent_automatic_assignments_share_capacity(
+    shipment_service, repo_mock
+):
+    """
+    Test that concurrent runs do not hand out the same capacity twice.
+    """
+    courier = uuid4()
+    repo_mock.get_courier_workload.return_value = []
+    await shipment_service.rebuild_workload()
+    repo_mock.get_unassigned_shipments.side_effect = [
+        [
+            {
+                "id": shipment_id,
+                "status": ShipmentStatus.PENDING,
+                "origin_latitude": 52.2,
+                "origin_longitude": 21.0,
+            }
+            for shipment_id in shipment_ids
+        ]
+        for shipment_ids in ((1, 2), (3, 4))
+    ]
+    repo_mock.assign_shipments.side_effect = lambda pairs: [
+        {"id": shipment_id, "courier_id": courier_id, "status": ShipmentStatus.PENDING}
+        for shipment_id, courier_id in pairs
+    ]
+    couriers = [CourierDepot(courier_id=courier, coords=(52.2, 21.0), capacity=2)]
+
+    results = await asyncio.gather(
+        shipment_service.assign_automatically(couriers),
+        shipment_service.assign_automatically(couriers),
+    )
+
+    assert sum(len(result.assigned) for result in results) == 2
+    assert shipment_service.get_workload(courier)[0].active == 2
+
+def stats_record(dimension, shipments, **values):
+    """
+    Helper function to create a grouped statistics record.
+    """
+    record = {
+        "dimension": dimension,
+        "status": None,
+        "courier_id": None,
+        "day": None,
+        "shipments": shipments,
+        "average_delivery_seconds": None,
+    }
+    return {**record, **values}
+
+
+@pytest.mark.anyio
+async def test_get_stats_groups_records(shipment_service, repo_mock, mocker):
+    """
+    Test that grouped records are split by dimension.
+    """
+    mocker.patch.object(shipment_service_module.stats.worker, "refreshed_at", None)
+    courier_id = uuid4()
+    repo_mock.get_stats.return_value = [
+        stats_record("status", 3, status=ShipmentStatus.DELIVERED),
+        stats_record("status", 1, status=ShipmentStatus.LOST),
+        stats_record(
+            "courier", 4, courier_id=courier_id, average_delivery_seconds=3600.0
+        ),
+        stats_record("day", 1, day=date(2026, 3, 2)),
+        stats_record("day", 3, day=date(2026, 3, 1)),
+        stats_record("total", 4, average_delivery_seconds=3600.0),
+    ]
+
+    stats = await shipment_service.get_stats(since=date(2026, 3, 1))
+
+    repo_mock.get_stats.assert_awaited_once_with(
+        date(2026, 3, 1), None, materialized=False
+    )
+    assert stats.as_of is None
+    assert stats.shipments == 4
+    assert stats.by_status == {"delivered": 3, "lost": 1}
+    assert stats.by_courier[0].courier_id == courier_id
+    assert [day.day for day in stats.by_day] == [date(2026, 3, 1), date(2026, 3, 2)]
+
+
+@pytest.mark.anyio
+async def test_get_stats_reads_refreshed_view(shipment_service, repo_mock, mocker):
+    """
+    Test that statistics come from the view once it was refreshed.
+    """
+    refreshed_at = datetime.now(timezone.utc)
+    mocker.patch.object(
+        shipment_service_module.stats.worker, "refreshed_at", refreshed_at
+    )
+    repo_mock.get_stats.return_value = [stats_record("total", None)]
+
+    stats = await shipment_service.get_stats()
+    assert stats.as_of == refreshed_at
+    assert stats.shipments == 0
+    repo_mock.get_stats.assert_awaited_once_with(None, None, materialized=True)
+
+    await shipment_service.get_stats(live=True)
+    repo_mock.get_stats.assert_awaited_with(None, None, materialized=False)
+
+
+@pytest.fixture
+def patch_geocode(mocker):
+    """
+    Patch geocoding of shipment addresses.
+    """
+    return mocker.patch.object(
+        shipment_service_module.geopy,
+        "geocode",
+        mocker.AsyncMock(
+            return_value=GeocodeResult("Trębacka 10, Warszawa", *COURIER_COORDS)
+        ),
+    )
+
+
+@pytest.mark.anyio
+async def test_resolve_shipments_geocodes_distinct_addresses(
+    shipment_service, patch_geocode
+):
+    """
+    Test that each distinct address missing coordinates is geocoded once.
+    """
+    located = ShipmentIn(
+        origin=Location(), destination=Location(), origin_coords=(50.0, 20.0)
+    )
+    shipments = [located, ShipmentIn(origin=Location(), destination=Location())]
+    resolved = await shipment_service.resolve_shipments(shipments)
+
+    patch_geocode.assert_awaited_once()
+    assert resolved[0].origin.coords == (50.0, 20.0)
+    assert resolved[0].origin.address.startswith("Miejscowość: Warszawa")
+    assert resolved[1].destination.coords == COURIER_COORDS
+    assert resolved[1].destination.address == "Trębacka 10, Warszawa"
+
+
+
+@pytest.mark.anyio
+async def test_resolve_shipments_raises_unexpected_errors(
+    shipment_service, patch_geocode
+):
+    """
+    Test that a failing lookup is raised instead of reported as not found.
+    """
+    patch_geocode.side_effect = RuntimeError("Gazetteer index corrupted")
+
+    with pytest.raises(RuntimeError):
+        await shipment_service.resolve_shipments(
+            [ShipmentIn(origin=Location(), destination=Location())]
+        )
+
+@pytest.mark.anyio
+async def test_add_shipment_persists_geocoded_addresses(
+    shipment_service, repo_mock, patch_geocode
+):
+    """
+    Test that both ends are geocoded concurrently and stored with their query.
+    """
+    destination = Location(city="Kraków", street="Floriańska", street_number="2")
+    repo_mock.add_shipment.return_value = None
+
+    await shipment_service.add_shipment(
+        ShipmentIn(origin=Location(), destination=destination), uuid4()
+    )
+
+    assert patch_geocode.await_count == 2
+    args = repo_mock.add_shipment.await_args
+    assert args.args[1:5] == (
+        "Trębacka 10, Warszawa",
+        "Trębacka 10, Warszawa",
+        COURIER_COORDS,
+        COURIER_COORDS,
+    )
+    assert args.kwargs["destination_query"] == "Floriańska, 2, Kraków, 00-074"
+
+
+@pytest.mark.anyio
+async def test_add_shipment_address_not_found(
+    shipment_service, repo_mock, patch_geocode
+):
+    """
+    Test that a shipment with an unknown address is not added.
+    """
+    patch_geocode.return_value = None
+
+    with pytest.raises(ValueError, match="Address not found"):
+        await shipment_service.add_shipment(
+            ShipmentIn(origin=Location(), destination=Location()), uuid4()
+        )
+    repo_mock.add_shipment.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_add_shipment_geocoder_unavailable(
+    shipment_service, repo_mock, patch_geocode
+):
+    """
+    Test that an unavailable geocoder is not reported as an unknown address.
+    """
+    patch_geocode.side_effect = GeocoderUnavailable("Geocoder circuit is open")
+
+    with pytest.raises(GeocoderUnavailable):
+        await shipment_service.add_shipment(
+            ShipmentIn(origin=Location(), destination=Location()), uuid4()
+        )
+    repo_mock.add_shipment.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_update_shipment_reuses_unchanged_addresses(
+    shipment_service, repo_mock, patch_geocode
+):
+    """
+    Test that only the changed address is geocoded on update.
+    """
+    stored = make_record(1, ShipmentStatus.PENDING, (52.0, 21.0), (50.0, 19.9))
+    stored["origin_query"] = geopy_module.location_query(Location())
+    stored["destination_query"] = "Floriańska, 2, Kraków, 00-074"
+    repo_mock.get_shipment_by_id.return_value = stored
+    repo_mock.update_shipment.return_value = None
+    moved = Location(city="Gdańsk", street="Długa", street_number="1")
+
+    await shipment_service.update_shipment(
+        1, ShipmentIn(origin=Location(), destination=moved)
+    )
+
+    patch_geocode.assert_awaited_once_with("Długa, 1, Gdańsk, 00-074")
+    args = repo_mock.update_shipment.await_args.args
+    assert args[3:7] == (
+        "origin",
+        "Trębacka 10, Warszawa",
+        (52.0, 21.0),
+        COURIER_COORDS,
+    )
+
+
+@pytest.mark.anyio
+async def test_plan_route(shipment_service, repo_mock, courier_records):
+    """
+    Test that pickups are routed before their deliveries and shipments
+    without coordinates are reported as unrouted.
+    """
+    unknown = make_record(
+        4, ShipmentStatus.OUT_FOR_DELIVERY, (None, None), (None, None)
+    )
+    repo_mock.get_filtered_shipments.return_value = courier_records + [unknown]
+
+    route = await shipment_service.plan_route(uuid4(), Location(city="Warszawa"))
+
+    stops = [(stop.shipment_id, stop.action) for stop in route.stops]
+    assert stops[0] == (3, "pickup")
+    assert sorted(stops) == [
+        (1, "delivery"),
+        (1, "pickup"),
+        (2, "delivery"),
+        (3, "delivery"),
+        (3, "pickup"),
+    ]
+    assert stops.index((1, "pickup")) < stops.index((1, "delivery"))
+    assert route.unrouted == [4]
+    assert route.total_distance == pytest.approx(
+        sum(stop.distance for stop in route.stops), abs=0.05
+    )
+
+
+@pytest.mark.anyio
+async def test_plan_route_no_shipments(shipment_service, repo_mock):
+    """
+    Test that no route is planned for a courier without shipments.
+    """
+    repo_mock.get_filtered_shipments.return_value = []
+
+    assert await shipment_service.plan_route(uuid4(), Location()) is None
+
+
+@pytest.mark.anyio
+async def test_get_nearby_shipments(shipment_service, repo_mock, courier_records):
+    """
+    Test that box candidates are refined by exact distance and sorted.
+    """
+    repo_mock.get_unassigned_shipments_in_box.return_value = courier_records
+
+    nearby = await shipment_service.get_nearby_shipments(
+        (51.0, 20.0), radius=160.0, limit=5
+    )
+
+    assert [shipment.id for shipment in nearby] == [1, 3]
+    assert nearby[0].origin_distance < nearby[1].origin_distance <= 160.0
+    end, box, center, limit, statuses = (
+        repo_mock.get_unassigned_shipments_in_box.await_args.args
+    )
+    assert end == "origin"
+    assert box.min_latitude < 51.0 < box.max_latitude
+    assert center == (51.0, 20.0)
+    assert limit == 5
+    assert statuses is None
+
+
+@pytest.mark.anyio
+async def test_get_nearby_shipments_caps_candidates(shipment_service, repo_mock):
+    """
+    Test that candidates are capped without a limit.
+    """
+    repo_mock.get_unassigned_shipments_in_box.return_value = []
+
+    assert await shipment_service.get_nearby_shipments((51.0, 20.0), 10.0) == []
+    limit = repo_mock.get_unassigned_shipments_in_box.await_args.args[3]
+    assert limit == config.NEARBY_MAX_CANDIDATES
@@ -38,8 +38,8 @@ async def test_register_user(repository, patch_database, valid_userin, valid_use
     result = await repository.register_user(valid_userin)
     assert isinstance(result, User)
     assert result.id == valid_user.id
-    patch_database.execute.assert_awaited()
-    patch_database.fetch_one.assert_awaited()
+    patch_database.fetch_one.assert_awaited_once()
+    patch_database.execute.assert_not_awaited()
 
 
 @pytest.mark.anyio
@@ -47,11 +47,10 @@ async def test_register_user_returns_none(repository, patch_database, valid_user
     """
     Test the register_user method of the UserRepository when it returns None.
     """
-    patch_database.execute.return_value = None
     patch_database.fetch_one.return_value = None
     result = await repository.register_user(valid_userin)
     assert result is None
-    patch_database.execute.assert_awaited_once()
+    patch_database.fetch_one.assert_awaited_once()
 
 
 @pytest.mark.anyio
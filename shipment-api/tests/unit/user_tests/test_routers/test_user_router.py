@@ -1,6 +1,7 @@
 """Unit tests for User router."""
 
 # pylint: disable=redefined-outer-name
+import json
 from types import SimpleNamespace
 from uuid import uuid4
 
@@ -281,12 +282,19 @@ async def test_get_all_users_success(mock_user_service, user):
         ]
         mock_user_service.get_all_users.return_value = arr
 
-        dto = await user_router.get_all_users(
+        response = await user_router.get_all_users(
             current_user=user, service=mock_user_service
         )
 
-        assert isinstance(dto, list)
-        assert len(dto) == 2
+        users = json.loads(response.body)
+        assert isinstance(users, list)
+        assert len(users) == 2
+        assert users[1] == {
+            "id": str(arr[1].id),
+            "email": "d@e.f",
+            "role": UserRole.COURIER.value,
+            "created_at": None,
+        }
         mock_user_service.get_all_users.assert_awaited_once()
     else:
         with pytest.raises(
@@ -336,10 +344,10 @@ async def test_get_users_by_role_success(mock_user_service, user):
         ]
         mock_user_service.get_users_by_role.return_value = arr
 
-        dto = await user_router.get_users_by_role(
+        response = await user_router.get_users_by_role(
             role=UserRole.CLIENT, current_user=user, service=mock_user_service
         )
-        assert len(dto) == 1
+        assert len(json.loads(response.body)) == 1
         mock_user_service.get_users_by_role.assert_awaited_once_with(UserRole.CLIENT)
     else:
         with pytest.raises(
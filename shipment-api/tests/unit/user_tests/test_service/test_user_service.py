@@ -12,6 +12,7 @@ from src.config import config
 from src.core.domain.user import User, UserIn, UserRole, UserUpdate
 from src.core.security import consts
 from src.core.security.token import create_access_token
+from src.infrastructure.cache.user import UserCache
 from src.infrastructure.dto.userDTO import UserDTO
 from src.infrastructure.services.user import UserService
 
@@ -51,7 +52,7 @@ def user_service(repo_mock):
     """
     Fixture to create a UserService instance with a mocked repository.
     """
-    return UserService(repo_mock)
+    return UserService(repo_mock, UserCache(100, 60))
 
 
 @pytest.fixture
@@ -171,10 +172,37 @@ async def test_delete_user_found(user_service, repo_mock, sample_record):
     """
     Test the successful deletion of a user by email.
     """
-    repo_mock.detele_user.return_value = sample_record
+    deleted_user = User(**sample_record)
+    repo_mock.detele_user.return_value = deleted_user
     result = await user_service.detele_user(sample_record["email"])
     repo_mock.detele_user.assert_awaited_once_with(sample_record["email"])
-    assert result == sample_record
+    assert result == deleted_user
+
+
+@pytest.mark.anyio
+async def test_get_user_by_id_is_cached(user_service, repo_mock, sample_record):
+    """
+    Test that repeated lookups by id, also with a string id, hit the cache.
+    """
+    repo_mock.get_user_by_id.return_value = sample_record
+    first = await user_service.get_user_by_id(sample_record["id"])
+    second = await user_service.get_user_by_id(str(sample_record["id"]))
+    assert first == second
+    repo_mock.get_user_by_id.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_delete_user_invalidates_cache(user_service, repo_mock, sample_record):
+    """
+    Test that a deleted user is no longer served from the cache.
+    """
+    repo_mock.get_user_by_id.return_value = sample_record
+    await user_service.get_user_by_id(sample_record["id"])
+    repo_mock.detele_user.return_value = User(**sample_record)
+    await user_service.detele_user(sample_record["email"])
+    repo_mock.get_user_by_id.return_value = None
+    with pytest.raises(ValueError, match="No user found with the provided ID"):
+        await user_service.get_user_by_id(sample_record["id"])
 
 
 @pytest.mark.anyio
@@ -234,7 +262,7 @@ async def test_update_user_success(user_service, repo_mock, sample_record):
     """
     Test the successful update of a user.
     """
-    repo_mock.get_user_by_email.side_effect = [sample_record, None]
+    repo_mock.get_user_by_email.side_effect = [User(**sample_record), None]
     hashed = f"hashed-{sample_record['password']}"
     updated_rec = sample_record.copy()
     updated_rec["email"] = "new@e.com"
@@ -312,6 +340,34 @@ async def test_login_for_access_token_success(
     assert token["token_type"] == "bearer"
 
 
+@pytest.mark.anyio
+async def test_login_for_access_token_rehashes(
+    user_service, repo_mock, sample_record, mocker
+):
+    """
+    Test that a login rehashes a password stored with another cost factor.
+    """
+    user = User(**{**sample_record, "password": "$2b$04$" + "A" * 53})
+    repo_mock.get_user_by_email.return_value = user
+    mocker.patch.object(
+        user_service_module.password_hashing, "verify_password", lambda *_: True
+    )
+    mocker.patch.object(config, "PASSWORD_HASH_ROUNDS", 12)
+    await user_service.login_for_access_token(user.email, "Password123")
+    repo_mock.update_password.assert_awaited_once_with(user.id, "hashed-Password123")
+
+
+def test_needs_rehash(mocker):
+    """
+    Test detection of stored hashes with another cost factor.
+    """
+    mocker.patch.object(config, "PASSWORD_HASH_ROUNDS", 12)
+    needs_rehash = user_service_module.password_hashing.needs_rehash
+    assert needs_rehash("$2b$10$" + "A" * 53)
+    assert not needs_rehash("$2b$12$" + "A" * 53)
+    assert not needs_rehash("hashed-Password123")
+
+
 @pytest.mark.anyio
 async def test_login_for_access_token_user_not_found(
     user_service, repo_mock, sample_record